@@ -0,0 +1,69 @@
+"""Benchmarks the Gradient Clock gradients against the previous per-frame implementation.
+
+Run from the repository root:
+    python scripts/benchmark_clock.py
+"""
+import os
+import sys
+import timeit
+from datetime import datetime
+
+import numpy as np
+from PIL import Image
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from plugins.clock.clock import Clock
+
+RESOLUTIONS = [(800, 480), (1600, 1200)]
+RUNS = 20
+PRIMARY_COLOR = (219, 50, 70)
+SECONDARY_COLOR = (0, 0, 0)
+
+
+def legacy_gradient_image(w, h, start_angle, end_angle, start_color, end_color):
+    """The previous implementation: arctan2 over the full frame and float math per channel, once per gradient."""
+    x, y = np.ogrid[:h, :w]
+    cx, cy = h / 2, w / 2
+    start_angle = -start_angle
+    end_angle = -end_angle
+    theta = (np.arctan2(x - cx, y - cy) - start_angle) % (2 * np.pi)
+    angle_range = ((end_angle - start_angle) % (2 * np.pi))
+    if angle_range == 0:
+        angle_range = 2 * np.pi
+    anglemask = theta <= angle_range
+    theta = theta / angle_range
+    gradient = np.zeros((h, w, 4), dtype=np.uint8)
+    start_color = Clock.pad_color(start_color)
+    end_color = Clock.pad_color(end_color)
+    for c in range(4):
+        gradient[..., c] = (start_color[c] * (1 - theta) + end_color[c] * theta).astype(np.uint8)
+    gradient[~anglemask] = (0, 0, 0, 0)
+    return Image.fromarray(gradient, mode="RGBA")
+
+
+def legacy_gradients(w, h, hour_angle, minute_angle):
+    image_hour = legacy_gradient_image(w, h, hour_angle, minute_angle, SECONDARY_COLOR, PRIMARY_COLOR)
+    image_minute = legacy_gradient_image(w, h, minute_angle, hour_angle, SECONDARY_COLOR, PRIMARY_COLOR)
+    return Image.alpha_composite(image_hour, image_minute)
+
+
+def main():
+    hour_angle, minute_angle = Clock.calculate_clock_angles(datetime(2025, 1, 1, 10, 8))
+
+    print(f"{RUNS} runs, ms per frame")
+    print(f"{'resolution':<14}{'field':>10}{'gradients':>12}{'legacy':>10}{'differing px':>15}")
+    for w, h in RESOLUTIONS:
+        Clock.angle_field.cache_clear()
+        field_ms = timeit.timeit(lambda: Clock.angle_field(w, h), number=1) * 1000
+        new_ms = timeit.timeit(lambda: Clock.draw_conic_gradients(w, h, hour_angle, minute_angle, SECONDARY_COLOR, PRIMARY_COLOR), number=RUNS) / RUNS * 1000
+        legacy_ms = timeit.timeit(lambda: legacy_gradients(w, h, hour_angle, minute_angle), number=RUNS) / RUNS * 1000
+
+        new = np.asarray(Clock.draw_conic_gradients(w, h, hour_angle, minute_angle, SECONDARY_COLOR, PRIMARY_COLOR), dtype=np.int16)
+        legacy = np.asarray(legacy_gradients(w, h, hour_angle, minute_angle), dtype=np.int16)
+        differing = np.count_nonzero(np.abs(new - legacy).max(axis=2) > 1)
+        print(f"{f'{w}x{h}':<14}{field_ms:>10.1f}{new_ms:>12.1f}{legacy_ms:>10.1f}{differing:>15}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""Benchmarks the dithering methods for every panel palette, and the bi-color split against the previous implementation.
+
+Run from the repository root:
+    python scripts/benchmark_dithering.py
+"""
+import os
+import sys
+import timeit
+
+import numpy as np
+from PIL import Image
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from utils.dither_utils import DITHER_METHODS, PANEL_PALETTES, blue_noise_map, dither, palette_colors, palette_lut, plane_image
+
+RESOLUTIONS = [(800, 480), (1600, 1200)]
+RUNS = 5
+
+
+def sample_image(w, h):
+    """A hue sweep from dark to light, which exercises every ink of the color palettes."""
+    x = np.linspace(0, 1, w)[None, :]
+    y = np.linspace(0, 1, h)[:, None]
+    hue = np.stack([np.sin(2 * np.pi * (x + offset)) * 0.5 + 0.5 for offset in (0, 1 / 3, 2 / 3)], axis=-1)
+    return Image.fromarray((hue * y[..., None] * 255).astype(np.uint8))
+
+
+def legacy_split(image):
+    """The previous bi-color split: Pillow quantization and two Python lambda point passes."""
+    palette_img = Image.new('P', (1, 1))
+    palette_img.putpalette([0, 0, 0, 255, 255, 255, 255, 0, 0])
+    indexed_img = image.quantize(palette=palette_img, dither=Image.Dither.FLOYDSTEINBERG)
+    black_layer = indexed_img.point(lambda p: 0 if p == 0 else 1, mode='1')
+    red_layer = indexed_img.point(lambda p: 0 if p == 2 else 1, mode='1')
+    return black_layer, red_layer
+
+
+def split(image):
+    indices = dither(image, palette_colors(PANEL_PALETTES["bwr"]))
+    return plane_image(indices, 0), plane_image(indices, 2)
+
+
+def main():
+    blue_noise_ms = timeit.timeit(blue_noise_map, number=1) * 1000
+    lut_ms = {name: timeit.timeit(lambda: palette_lut(palette_colors(inks)), number=1) * 1000
+              for name, inks in PANEL_PALETTES.items()}
+    print(f"one-time setup: blue noise map {blue_noise_ms:.0f} ms, palette LUTs "
+          + ", ".join(f"{name} {ms:.0f} ms" for name, ms in lut_ms.items()))
+
+    for w, h in RESOLUTIONS:
+        image = sample_image(w, h)
+        print(f"\n{w}x{h}, {RUNS} runs, ms per image")
+        print(f"{'palette':<10}" + "".join(f"{method:>17}" for method in DITHER_METHODS))
+        for name, inks in PANEL_PALETTES.items():
+            palette = palette_colors(inks)
+            times = [timeit.timeit(lambda: dither(image, palette, method), number=RUNS) / RUNS * 1000
+                     for method in DITHER_METHODS]
+            print(f"{name:<10}" + "".join(f"{ms:>17.1f}" for ms in times))
+
+        new_ms = timeit.timeit(lambda: split(image), number=RUNS) / RUNS * 1000
+        legacy_ms = timeit.timeit(lambda: legacy_split(image), number=RUNS) / RUNS * 1000
+        identical = all(a.tobytes() == b.tobytes() for a, b in zip(split(image), legacy_split(image)))
+        print(f"bi-color split: {new_ms:.1f} ms, legacy {legacy_ms:.1f} ms, identical planes: {identical}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""Benchmarks Open-Meteo parsing of the weather plugin with a synthetic 16-day forecast payload.
+
+Run from the repository root:
+    python scripts/benchmark_weather.py
+"""
+import os
+import sys
+import timeit
+from datetime import datetime, timedelta
+
+import pytz
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from plugins.weather.weather import Weather
+from plugins.weather.time_index import HourlyTimeIndex
+
+FORECAST_DAYS = 16
+AQI_DAYS = 5
+TIMEZONES = ["UTC", "Europe/Berlin", "America/Los_Angeles", "Asia/Tokyo"]
+RUNS = 200
+
+
+def build_payload(days=FORECAST_DAYS):
+    start = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+    hours = [(start + timedelta(hours=i)).strftime("%Y-%m-%dT%H:%M") for i in range(24 * days)]
+    dates = [(start + timedelta(days=i)).strftime("%Y-%m-%d") for i in range(days)]
+    count = len(hours)
+    weather_data = {
+        "current_weather": {"time": hours[0], "temperature": 12.3, "windspeed": 5, "winddirection": 90, "weathercode": 2, "is_day": 1},
+        "hourly": {
+            "time": hours,
+            "temperature_2m": [10.0 + i % 7 for i in range(count)],
+            "precipitation": [0.1] * count,
+            "precipitation_probability": [20] * count,
+            "relative_humidity_2m": [60 + i % 30 for i in range(count)],
+            "surface_pressure": [1000 + i % 20 for i in range(count)],
+            "visibility": [24000 - i for i in range(count)],
+        },
+        "daily": {
+            "time": dates,
+            "weathercode": [1] * days,
+            "temperature_2m_max": [15.0] * days,
+            "temperature_2m_min": [5.0] * days,
+            "sunrise": [f"{d}T07:01" for d in dates],
+            "sunset": [f"{d}T17:01" for d in dates],
+        },
+    }
+    aqi_hours = 24 * AQI_DAYS
+    aqi_data = {
+        "hourly": {
+            "time": hours[:aqi_hours],
+            "european_aqi": [20 + i % 50 for i in range(aqi_hours)],
+            "uv_index": [i % 8 * 0.5 for i in range(aqi_hours)],
+        }
+    }
+    return weather_data, aqi_data
+
+
+def legacy_scan(times, tz):
+    """Per-field scan of the previous implementation: parse every timestamp until the current hour."""
+    current_hour = datetime.now(tz).hour
+    for time_str in times:
+        if datetime.fromisoformat(time_str).astimezone(tz).hour == current_hour:
+            return
+
+
+def main():
+    weather = Weather({"id": "weather"})
+    weather_data, aqi_data = build_payload()
+    hourly_times = weather_data["hourly"]["time"]
+
+    print(f"{len(hourly_times)} hourly rows, {RUNS} runs, ms per parse")
+    print(f"{'timezone':<22}{'index':>10}{'parse':>10}{'legacy scans':>14}")
+    for tz_name in TIMEZONES:
+        tz = pytz.timezone(tz_name)
+
+        def parse():
+            hourly_index = HourlyTimeIndex(hourly_times, tz)
+            weather.parse_open_meteo_data_points(weather_data, aqi_data, tz, "metric", "24h", hourly_index)
+            weather.parse_open_meteo_hourly(weather_data["hourly"], tz, "24h", hourly_index)
+
+        def legacy():
+            # humidity, pressure, visibility, UV, AQI and the hourly slice each scanned the series
+            for _ in range(5):
+                legacy_scan(hourly_times, tz)
+            for time_str in hourly_times[:24]:
+                datetime.fromisoformat(time_str).astimezone(tz)
+
+        index_ms = timeit.timeit(lambda: HourlyTimeIndex(hourly_times, tz), number=RUNS) / RUNS * 1000
+        parse_ms = timeit.timeit(parse, number=RUNS) / RUNS * 1000
+        legacy_ms = timeit.timeit(legacy, number=RUNS) / RUNS * 1000
+        print(f"{tz_name:<22}{index_ms:>10.3f}{parse_ms:>10.3f}{legacy_ms:>14.3f}")
+
+
+if __name__ == "__main__":
+    main()
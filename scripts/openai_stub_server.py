@@ -0,0 +1,98 @@
+"""A local stand-in for the OpenAI API, for testing the AI Text and AI Image plugins without API costs.
+
+It answers chat completions with numbered placeholder texts and image generations with generated
+test images, returned as base64 for gpt-image-1 and as a download url for the DALL-E models.
+
+Run from the repository root:
+    python scripts/openai_stub_server.py --port 8090 --delay 5
+
+and point the plugins at it in the .env file:
+    OPEN_AI_SECRET=stub
+    OPEN_AI_BASE_URL=http://localhost:8090/v1
+"""
+import argparse
+import base64
+import itertools
+import json
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from io import BytesIO
+
+from PIL import Image, ImageDraw
+
+COLORS = ["#e63946", "#f1c40f", "#2a9d8f", "#264653", "#8e44ad", "#f4a261"]
+
+counter = itertools.count(1)
+images = {}
+
+
+def render_image(size, number):
+    width, height = (int(value) for value in size.split("x"))
+    image = Image.new("RGB", (width, height), COLORS[number % len(COLORS)])
+    draw = ImageDraw.Draw(image)
+    draw.text((width // 2, height // 2), f"stub image {number}", fill="white", anchor="mm", font_size=height // 10)
+    buffer = BytesIO()
+    image.save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    delay = 0
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or "{}")
+        time.sleep(self.delay)
+        number = next(counter)
+
+        if self.path.endswith("/chat/completions"):
+            content = f"Stub response {number} to: {body['messages'][-1]['content'][:60]}"
+            self.send_json({
+                "id": f"chatcmpl-stub-{number}",
+                "object": "chat.completion",
+                "created": int(time.time()),
+                "model": body.get("model"),
+                "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+                "usage": {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0},
+            })
+        elif self.path.endswith("/images/generations"):
+            png = render_image(body.get("size", "1024x1024"), number)
+            if body.get("model") == "gpt-image-1":
+                data = {"b64_json": base64.b64encode(png).decode("ascii")}
+            else:
+                images[number] = png
+                data = {"url": f"http://{self.headers['Host']}/images/{number}.png"}
+            self.send_json({"created": int(time.time()), "data": [data]})
+        else:
+            self.send_error(404)
+
+    def do_GET(self):
+        number = self.path.rsplit("/", 1)[-1].removesuffix(".png")
+        png = images.get(int(number)) if number.isdigit() else None
+        if png is None:
+            self.send_error(404)
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "image/png")
+        self.send_header("Content-Length", str(len(png)))
+        self.end_headers()
+        self.wfile.write(png)
+
+    def send_json(self, payload):
+        data = json.dumps(payload).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=8090)
+    parser.add_argument("--delay", type=float, default=0, help="seconds to wait before answering, to mimic generation time")
+    args = parser.parse_args()
+
+    StubHandler.delay = args.delay
+    server = ThreadingHTTPServer(("", args.port), StubHandler)
+    print(f"OpenAI stub server listening on http://localhost:{args.port}/v1")
+    server.serve_forever()
@@ -1,10 +1,43 @@
 import logging
 from inky.auto import auto
 from display.abstract_display import AbstractDisplay
+from utils.dither_utils import COLORS, DEFAULT_DITHER_METHOD, dither, indexed_image, palette_colors
 
 
 logger = logging.getLogger(__name__)
 
+# saturation of the palette the Inky Impression drivers quantize with in set_image
+PALETTE_SATURATION = 0.5
+
+
+def get_inky_palette(inky_display):
+    """
+    Returns the ink colors of an Inky display and the color numbers its driver uses for them.
+
+    The pHAT and wHAT have a single optional color ink given by `colour`, the Impression
+    panels name their inks as attributes (e.g. inky_display.ORANGE). The Impression drivers
+    blend the measured colors of their inks into the palette, which is used where available
+    so the dithering matches the one of the driver. Returns None if the inks cannot be determined.
+    """
+    colour = getattr(inky_display, "colour", None)
+    if colour in ("black", "red", "yellow"):
+        inks = ("black", "white") if colour == "black" else ("black", "white", colour)
+    else:
+        inks = tuple(name for name in COLORS if hasattr(inky_display, name.upper()))
+    if "black" not in inks or "white" not in inks:
+        return None
+    color_numbers = [getattr(inky_display, name.upper()) for name in inks]
+
+    palette_blend = getattr(inky_display, "_palette_blend", None)
+    if callable(palette_blend):
+        # a flat list of RGB values, in the order of the color numbers
+        blended = palette_blend(PALETTE_SATURATION)
+        colors = tuple(tuple(int(channel) for channel in blended[3 * number:3 * number + 3]) for number in color_numbers)
+    else:
+        colors = palette_colors(inks)
+    return colors, color_numbers
+
+
 class InkyDisplay(AbstractDisplay):
 
     """
@@ -30,6 +63,10 @@ class InkyDisplay(AbstractDisplay):
         self.inky_display = auto()
         self.inky_display.set_border(self.inky_display.BLACK)
 
+        self.palette = get_inky_palette(self.inky_display)
+        if not self.palette:
+            logger.warning("Unknown Inky display colors, leaving the dithering to the driver")
+
         # store display resolution in device config
         if not self.device_config.get_config("resolution"):
             self.device_config.update_value(
@@ -57,6 +94,12 @@ class InkyDisplay(AbstractDisplay):
         if not image:
             raise ValueError(f"No image provided.")
 
+        # Dither against the inks of the panel, the driver then uses the color numbers as they are.
+        if self.palette:
+            colors, color_numbers = self.palette
+            method = self.device_config.get_config("dithering", default=DEFAULT_DITHER_METHOD)
+            image = indexed_image(dither(image, colors, method), colors, color_numbers)
+
         # Display the image on the Inky display
         self.inky_display.set_image(image)
         self.inky_display.show()
\ No newline at end of file
@@ -4,29 +4,51 @@ import logging
 import sys
 
 from display.abstract_display import AbstractDisplay
-from PIL import Image
 from pathlib import Path
 from plugins.plugin_registry import get_plugin_instance
+from utils.dither_utils import COLORS, DEFAULT_DITHER_METHOD, PANEL_PALETTES, dither, indexed_image, palette_colors, plane_image
 
 logger = logging.getLogger(__name__)
 
 
-def split_image_for_bi_color_epd(image):
+def split_image_for_bi_color_epd(image, palette, method=DEFAULT_DITHER_METHOD):
     """
-    Convert image into two 1-bit layers for bi-color (black and red) e-paper displays.
+    Convert image into two 1-bit layers for bi-color (black and red/yellow) e-paper displays.
+
+    The image is dithered against the palette of the display (see get_epd_palette), the
+    layers are packed straight from the palette indices, 0 where the pixel has the ink of the layer.
+    """
+    indices = dither(image, palette, method)
+    return plane_image(indices, 0), plane_image(indices, 2)
+
+
+def dither_single_buffer_image(image, palette, method=DEFAULT_DITHER_METHOD):
+    """
+    Dither an image for a single buffer e-paper display and return the image for its getbuffer.
+
+    Black and white images are dithered on their luminance, like the image.convert('1')
+    of the drivers, so colored areas keep their tone instead of snapping to black or white.
     """
-    black = (0, 0, 0)
-    white = (255, 255, 255)
-    red = (255, 0, 0)
+    if len(palette) == 2:
+        return plane_image(dither(image.convert("L"), palette, method), 0)
+    # color drivers match the image against their own palette, which finds the exact inks
+    return indexed_image(dither(image, palette, method), palette).convert("RGB")
 
-    palette_data = [*black, *white, *red]
-    palette_img = Image.new('P', (1, 1))
-    palette_img.putpalette(palette_data)
 
-    indexed_img = image.quantize(palette=palette_img, dither=Image.Dither.FLOYDSTEINBERG)
-    black_layer = indexed_img.point(lambda p: 0 if p == 0 else 1, mode='1')
-    red_layer = indexed_img.point(lambda p: 0 if p == 2 else 1, mode='1')
-    return black_layer, red_layer
+def get_epd_palette(epd_display, bi_color=False):
+    """
+    Returns the ink names of a Waveshare display.
+
+    Color panels name their inks as attributes of the driver (e.g. epd.RED),
+    single buffer displays without color inks are black and white. Bi-color displays
+    have a yellow second ink if their driver names it, and a red one otherwise.
+    """
+    inks = [name for name in COLORS if hasattr(epd_display, name.upper())]
+    if bi_color:
+        return PANEL_PALETTES["bwy"] if "yellow" in inks else PANEL_PALETTES["bwr"]
+    if any(name not in ("black", "white") for name in inks):
+        return tuple(inks)
+    return PANEL_PALETTES["bw"]
 
 
 class WaveshareDisplay(AbstractDisplay):
@@ -90,6 +112,7 @@ class WaveshareDisplay(AbstractDisplay):
             raise ValueError(f"Display does not support required methods: {display_type}")
 
         self.bi_color_display = len(display_args_spec.args) > 2
+        self.palette = palette_colors(get_epd_palette(self.epd_display, self.bi_color_display))
 
         # update the resolution directly from the loaded device context
         if not self.device_config.get_config("resolution"):
@@ -127,11 +150,15 @@ class WaveshareDisplay(AbstractDisplay):
         # Clear residual pixels before updating the image.
         self.epd_display.Clear()
 
+        # Dither against the inks of the panel, the drivers only have to pack the planes.
+        method = self.device_config.get_config("dithering", default=DEFAULT_DITHER_METHOD)
+
         # Display the image on the WS display.
         if not self.bi_color_display:
+            image = dither_single_buffer_image(image, self.palette, method)
             self.epd_display.display(self.epd_display.getbuffer(image))
         else:
-            black_layer, red_layer = split_image_for_bi_color_epd(image)
+            black_layer, red_layer = split_image_for_bi_color_epd(image, self.palette, method)
 
             self.epd_display.display(
                 self.epd_display.getbuffer(black_layer),
@@ -231,6 +231,11 @@ class Playlist:
         
         return self.plugins[self.current_plugin_index]
 
+    def get_upcoming_plugins(self):
+        """Returns the plugin instances in display order, starting with the current one."""
+        start = self.current_plugin_index or 0
+        return self.plugins[start:] + self.plugins[:start]
+
     def get_priority(self):
         """Determine priority of a playlist, based on the time range"""
         return self.get_time_range_minutes()
@@ -1,10 +1,12 @@
 from plugins.base_plugin.base_plugin import BasePlugin
-from openai import OpenAI
 from PIL import Image
 from io import BytesIO
 import base64
-import requests
 import logging
+from utils.http_utils import http_get
+from utils.image_utils import shrink_to_cover
+from utils.openai_utils import get_openai_client, take_generation_budget
+from utils.prefetch_queue import get_prefetch_queue
 
 logger = logging.getLogger(__name__)
 
@@ -12,6 +14,12 @@ IMAGE_MODELS = ["dall-e-3", "dall-e-2", "gpt-image-1"]
 DEFAULT_IMAGE_MODEL = "dall-e-3"
 DEFAULT_IMAGE_QUALITY = "standard"
 
+# one image is generated ahead of time per instance, so the display slot does not wait 30-60s for the API
+IMAGE_QUEUE_SIZE = 1
+IMAGE_QUEUE_MAX_AGE = 24 * 60 * 60
+# background generations per day across all instances, each one is billed even if never displayed
+PREFETCH_DAILY_LIMIT = 8
+
 class AIImage(BasePlugin):
     def generate_settings_template(self):
         template_params = super().generate_settings_template()
@@ -23,10 +31,7 @@ class AIImage(BasePlugin):
         return template_params
 
     def generate_image(self, settings, device_config):
-
-        api_key = device_config.load_env_key("OPEN_AI_SECRET")
-        if not api_key:
-            raise RuntimeError("OPEN AI API Key not configured.")
+        ai_client = get_openai_client(device_config)
 
         text_prompt = settings.get("textPrompt", "")
 
@@ -36,22 +41,32 @@ class AIImage(BasePlugin):
         image_quality = settings.get('quality', "medium" if image_model == "gpt-image-1" else "standard")
         randomize_prompt = settings.get('randomizePrompt') == 'true'
 
-        image = None
-        try:
-            ai_client = OpenAI(api_key = api_key)
-            if randomize_prompt:
-                text_prompt = AIImage.fetch_image_prompt(ai_client, text_prompt)
-
-            image = AIImage.fetch_image(
-                ai_client,
-                text_prompt,
-                model=image_model,
-                quality=image_quality,
-                orientation=device_config.get_config("orientation")
-            )
-        except Exception as e:
-            logger.error(f"Failed to make Open AI request: {str(e)}")
-            raise RuntimeError("Open AI request failure, please check logs.")
+        orientation = device_config.get_config("orientation")
+        dimensions = device_config.get_resolution()
+        if orientation == "vertical":
+            dimensions = dimensions[::-1]
+
+        def generate():
+            prompt = AIImage.fetch_image_prompt(ai_client, text_prompt) if randomize_prompt else text_prompt
+            image = AIImage.fetch_image(ai_client, prompt, model=image_model, quality=image_quality, orientation=orientation)
+            return shrink_to_cover(image, dimensions)
+
+        def generate_ahead():
+            if not take_generation_budget(self.get_plugin_id(), PREFETCH_DAILY_LIMIT):
+                return None
+            return generate()
+
+        # serve the image generated in the background after the previous refresh, if there is one
+        queue = get_prefetch_queue(self.get_plugin_id(), text_prompt, image_model, image_quality, randomize_prompt,
+                                   orientation, dimensions, size=IMAGE_QUEUE_SIZE, max_age=IMAGE_QUEUE_MAX_AGE)
+        image = queue.pop()
+        if image is None:
+            try:
+                image = generate()
+            except Exception as e:
+                logger.error(f"Failed to make Open AI request: {str(e)}")
+                raise RuntimeError("Open AI request failure, please check logs.")
+        queue.refill(generate_ahead)
         return image
 
     @staticmethod
@@ -81,7 +96,7 @@ class AIImage(BasePlugin):
         response = ai_client.images.generate(**args)
         if model in ["dall-e-3", "dall-e-2"]:
             image_url = response.data[0].url
-            response = requests.get(image_url)
+            response = http_get(image_url)
             img = Image.open(BytesIO(response.content))
         elif model == "gpt-image-1":
             image_base64 = response.data[0].b64_json
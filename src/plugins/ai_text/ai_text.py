@@ -1,17 +1,29 @@
 from plugins.base_plugin.base_plugin import BasePlugin
 from utils.app_utils import resolve_path
-from openai import OpenAI
+from utils.cache_utils import get_cache, make_key
+from utils.openai_utils import get_openai_client, take_generation_budget
 from PIL import Image, ImageDraw, ImageFont
 from utils.image_utils import resize_image
 from io import BytesIO
-from datetime import datetime
+from datetime import date, datetime
 import requests
 import logging
 import textwrap
+import threading
 import os
 
 logger = logging.getLogger(__name__)
 
+# texts generated ahead of time by (model, prompt), so the display slot does not wait for the API
+AI_TEXT_CACHE_NAME = "ai_text"
+AI_TEXT_CACHE_MAX_ENTRIES = 64
+TEXT_BACKLOG_SIZE = 2
+# background generations per day across all instances, each one is billed even if never displayed
+PREFETCH_DAILY_LIMIT = 48
+
+_refills = {}
+_refills_lock = threading.Lock()
+
 class AIText(BasePlugin):
     def generate_settings_template(self):
         template_params = super().generate_settings_template()
@@ -24,9 +36,7 @@ class AIText(BasePlugin):
         return template_params
 
     def generate_image(self, settings, device_config):
-        api_key = device_config.load_env_key("OPEN_AI_SECRET")
-        if not api_key:
-            raise RuntimeError("OPEN AI API Key not configured.")
+        ai_client = get_openai_client(device_config)
 
         title = settings.get("title")
 
@@ -39,8 +49,7 @@ class AIText(BasePlugin):
             raise RuntimeError("Text Prompt is required.")
 
         try:
-            ai_client = OpenAI(api_key = api_key)
-            prompt_response = AIText.fetch_text_prompt(ai_client, text_model, text_prompt)
+            prompt_response = self.next_text(ai_client, text_model, text_prompt)
         except Exception as e:
             logger.error(f"Failed to make Open AI request: {str(e)}")
             raise RuntimeError("Open AI request failure, please check logs.")
@@ -58,7 +67,54 @@ class AIText(BasePlugin):
         image = self.render_image(dimensions, "ai_text.html", "ai_text.css", image_template_params)
 
         return image
-    
+
+    def next_text(self, ai_client, model, text_prompt):
+        """Returns a text generated ahead of time for model and prompt, or generates one now if there is none.
+
+        Either way the backlog is refilled in the background afterwards.
+        """
+        cache = get_cache(AI_TEXT_CACHE_NAME, max_entries=AI_TEXT_CACHE_MAX_ENTRIES)
+        key = make_key(model, text_prompt)
+        with cache.lock:
+            backlog = self._current_backlog(cache, key)
+            text = backlog.pop(0)["text"] if backlog else None
+            cache.set(key, backlog)
+
+        if text is None:
+            text = AIText.fetch_text_prompt(ai_client, model, text_prompt)
+        else:
+            logger.info(f"Using pre-generated text for prompt {text_prompt}")
+
+        with _refills_lock:
+            thread = _refills.get(key)
+            if not (thread and thread.is_alive()):
+                thread = threading.Thread(target=self._refill_backlog, args=(ai_client, model, text_prompt), daemon=True)
+                _refills[key] = thread
+                thread.start()
+        return text
+
+    def _refill_backlog(self, ai_client, model, text_prompt):
+        cache = get_cache(AI_TEXT_CACHE_NAME, max_entries=AI_TEXT_CACHE_MAX_ENTRIES)
+        key = make_key(model, text_prompt)
+        while len(self._current_backlog(cache, key)) < TEXT_BACKLOG_SIZE:
+            if not take_generation_budget(self.get_plugin_id(), PREFETCH_DAILY_LIMIT):
+                return
+            try:
+                text = AIText.fetch_text_prompt(ai_client, model, text_prompt)
+            except Exception as e:
+                logger.warning(f"Failed to pre-generate text for prompt {text_prompt}: {e}")
+                return
+            with cache.lock:
+                backlog = self._current_backlog(cache, key)
+                backlog.append({"date": date.today().isoformat(), "text": text})
+                cache.set(key, backlog)
+
+    @staticmethod
+    def _current_backlog(cache, key):
+        # the prompt tells the model today's date, so texts generated on another day are dropped
+        today = date.today().isoformat()
+        return [text for text in cache.get(key, []) if text["date"] == today]
+
     @staticmethod
     def fetch_text_prompt(ai_client, model, text_prompt):
         logger.info(f"Getting random text prompt from input {text_prompt}, model: {model}")
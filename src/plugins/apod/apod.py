@@ -6,15 +6,28 @@ For the API key, set `NASA_SECRET={API_KEY}` in your .env file.
 """
 
 from plugins.base_plugin.base_plugin import BasePlugin
+from utils.cache_utils import get_cache, make_key
+from utils.image_store import get_image_store
+from utils.image_utils import shrink_to_cover
+from utils.prefetch_queue import get_prefetch_queue
 from PIL import Image
 from io import BytesIO
-import requests
 import logging
-from random import randint
-from datetime import datetime, timedelta
 
 logger = logging.getLogger(__name__)
 
+APOD_URL = "https://api.nasa.gov/planetary/apod"
+
+# metadata and downscaled images by date, a past picture of the day never changes
+APOD_CACHE_NAME = "apod"
+APOD_CACHE_MAX_ENTRIES = 1000
+# today's date is looked up again after this time, to pick up the next picture
+LATEST_KEY = "latest"
+LATEST_TTL = 60 * 60
+# random mode fetches this many random pictures with one request
+RANDOM_POOL_KEY = "random_pool"
+RANDOM_BATCH_SIZE = 10
+
 class Apod(BasePlugin):
     def generate_settings_template(self):
         template_params = super().generate_settings_template()
@@ -33,35 +46,94 @@ class Apod(BasePlugin):
         if not api_key:
             raise RuntimeError("NASA API Key not configured.")
 
-        params = {"api_key": api_key}
+        dimensions = device_config.get_resolution()
+        if device_config.get_config("orientation") == "vertical":
+            dimensions = dimensions[::-1]
 
         if settings.get("randomizeApod") == "true":
-            start = datetime(2015, 1, 1)
-            end = datetime.today()
-            delta_days = (end - start).days
-            random_date = start + timedelta(days=randint(0, delta_days))
-            params["date"] = random_date.strftime("%Y-%m-%d")
-        elif settings.get("customDate"):
-            params["date"] = settings["customDate"]
+            def fetch_random_image():
+                return self.get_image(api_key, self.next_random_date(api_key), dimensions)
 
-        response = requests.get("https://api.nasa.gov/planetary/apod", params=params)
+            # serve the image prepared in the background after the previous refresh, if there is one
+            queue = get_prefetch_queue(self.get_plugin_id(), "random", dimensions)
+            image = queue.pop()
+            if image is None:
+                image = fetch_random_image()
+            queue.refill(fetch_random_image)
+            return image
 
-        if response.status_code != 200:
-            logger.error(f"NASA API error: {response.text}")
-            raise RuntimeError("Failed to retrieve NASA APOD.")
+        return self.get_image(api_key, settings.get("customDate") or None, dimensions)
 
-        data = response.json()
+    def get_image(self, api_key, apod_date, dimensions):
+        """Returns the APOD of the date (today if None), downscaled to cover dimensions and stored for repeat displays."""
+        data = self.get_metadata(api_key, apod_date)
 
         if data.get("media_type") != "image":
             raise RuntimeError("APOD is not an image today.")
 
+        store = get_image_store(APOD_CACHE_NAME)
+        key = make_key(data["date"], *dimensions)
+        image = store.get(key)
+        if image is not None:
+            return image
+
         image_url = data.get("hdurl") or data.get("url")
 
         try:
-            img_data = requests.get(image_url)
+            img_data = self.session.get(image_url)
             image = Image.open(BytesIO(img_data.content))
+            image = shrink_to_cover(image, dimensions)
         except Exception as e:
             logger.error(f"Failed to load APOD image: {str(e)}")
             raise RuntimeError("Failed to load APOD image.")
 
-        return image
\ No newline at end of file
+        store.put(key, image)
+        return image
+
+    def get_metadata(self, api_key, apod_date=None):
+        """Returns the APOD metadata of the date, cached by date as past pictures never change."""
+        cache = get_cache(APOD_CACHE_NAME, max_entries=APOD_CACHE_MAX_ENTRIES)
+        if apod_date is None:
+            apod_date = cache.get(LATEST_KEY)
+            if apod_date is None:
+                data = self.request_apod(api_key)
+                cache.set(data["date"], data)
+                cache.set(LATEST_KEY, data["date"], LATEST_TTL)
+                return data
+
+        data = cache.get(apod_date)
+        if data is None:
+            data = self.request_apod(api_key, date=apod_date)
+            cache.set(apod_date, data)
+        return data
+
+    def next_random_date(self, api_key):
+        """Returns a random APOD date from a pool filled with one batched request (the API's count parameter)."""
+        cache = get_cache(APOD_CACHE_NAME, max_entries=APOD_CACHE_MAX_ENTRIES)
+        with cache.lock:
+            pool = cache.get(RANDOM_POOL_KEY) or []
+            if not pool:
+                batch = self.request_apod(api_key, count=RANDOM_BATCH_SIZE)
+                pictures = {data["date"]: data for data in batch if data.get("media_type") == "image"}
+                if not pictures:
+                    raise RuntimeError("No random APOD images found.")
+                cache.set_many(pictures)
+                pool = list(pictures)
+            apod_date = pool.pop()
+            cache.set(RANDOM_POOL_KEY, pool)
+        return apod_date
+
+    def request_apod(self, api_key, **params):
+        response = self.session.get(APOD_URL, params={"api_key": api_key, **params})
+
+        if response.status_code != 200:
+            logger.error(f"NASA API error: {response.text}")
+            raise RuntimeError("Failed to retrieve NASA APOD.")
+
+        data = response.json()
+        if isinstance(data, list):
+            return [self.slim_metadata(item) for item in data]
+        return self.slim_metadata(data)
+
+    def slim_metadata(self, data):
+        return {key: data.get(key) for key in ("date", "title", "media_type", "url", "hdurl")}
@@ -2,6 +2,7 @@ import logging
 import os
 from utils.app_utils import resolve_path, get_fonts
 from utils.image_utils import take_screenshot_html
+from utils.http_utils import get_http_session
 from jinja2 import Environment, FileSystemLoader, select_autoescape
 from pathlib import Path
 import asyncio
@@ -38,6 +39,9 @@ class BasePlugin:
     def __init__(self, config, **dependencies):
         self.config = config
 
+        # shared HTTP session with keep-alive pools, default timeouts and retries
+        self.session = get_http_session()
+
         self.render_dir = self.get_plugin_dir("render")
         if os.path.exists(self.render_dir):
             # instantiate jinja2 env with base plugin and current plugin render directories
@@ -61,6 +65,20 @@ class BasePlugin:
         """
         pass  # Default implementation does nothing
 
+    def prefetch(self, upcoming, device_config):
+        """Optional hook that plugins can override to batch requests for several instances.
+
+        Called before a playlist refresh renders one of this plugin's instances. Plugins can fetch the
+        data of all listed instances at once and cache it, so the following generate_image calls are
+        served locally.
+
+        Args:
+            upcoming: List of (settings, seconds_until_display) tuples for this plugin's instances in the
+                active playlist that are due for a refresh, starting with the instance about to be rendered.
+            device_config: An instance of the Config class.
+        """
+        pass  # Default implementation does nothing
+
     def get_plugin_id(self):
         return self.config.get("id")
 
@@ -2,17 +2,37 @@ import os
 from utils.app_utils import resolve_path, get_font
 from plugins.base_plugin.base_plugin import BasePlugin
 from plugins.calendar.constants import LOCALE_MAP, FONT_SIZES
+from plugins.calendar.ics_scanner import filter_ics
+from plugins.calendar.calendar_renderer import CalendarRenderer, supports_native_rendering
 from PIL import Image, ImageColor, ImageDraw, ImageFont
+from utils.http_cache import cached_get
+from utils.cache_utils import get_cache, make_key
+from concurrent.futures import ThreadPoolExecutor
+import hashlib
+import threading
 import icalendar
 import recurring_ical_events
 from io import BytesIO
 import logging
-import requests
 from datetime import datetime, timedelta
 import pytz
 
 logger = logging.getLogger(__name__)
 
+MAX_CONCURRENT_FETCHES = 4
+
+# expanded occurrences per (calendar version, timezone, view range), kept across restarts
+OCCURRENCE_CACHE_NAME = "calendar_occurrences"
+OCCURRENCE_CACHE_TTL = 7 * 24 * 60 * 60
+OCCURRENCE_CACHE_MAX_ENTRIES = 64
+
+# calendars are parsed for the view range plus this margin, so the parsed calendar survives day changes
+SCAN_WINDOW_MARGIN = timedelta(days=31)
+
+# latest parsed icalendar.Calendar per url, as (version, scan start, scan end, calendar)
+_parsed_calendars = {}
+_parsed_calendars_lock = threading.Lock()
+
 class Calendar(BasePlugin):
     def generate_settings_template(self):
         template_params = super().generate_settings_template()
@@ -51,6 +71,12 @@ class Calendar(BasePlugin):
         if not events:
             logger.warn("No events found for ics url")
 
+        font_scale = FONT_SIZES.get(settings.get("fontSize", "normal"))
+        if supports_native_rendering(view, settings):
+            # month, week and list views are drawn with Pillow, only the time grids need FullCalendar
+            renderer = CalendarRenderer(dimensions, settings, current_dt, time_format, font_scale)
+            return renderer.render(view, events)
+
         if view == 'timeGridWeek' and settings.get("displayPreviousDays") != "true":
             view = 'timeGrid'
 
@@ -61,7 +87,7 @@ class Calendar(BasePlugin):
             "timezone": timezone,
             "plugin_settings": settings,
             "time_format": time_format,
-            "font_scale": FONT_SIZES.get(settings.get("fontSize", "normal"))
+            "font_scale": font_scale
         }
 
         image = self.render_image(dimensions, "calendar.html", "calendar.css", template_params)
@@ -73,27 +99,68 @@ class Calendar(BasePlugin):
     def fetch_ics_events(self, calendar_urls, colors, tz, start_range, end_range):
         parsed_events = []
 
-        for calendar_url, color in zip(calendar_urls, colors):
-            cal = self.fetch_calendar(calendar_url)
-            events = recurring_ical_events.of(cal).between(start_range, end_range)
-            contrast_color = self.get_contrast_color(color)
+        # calendars are independent, so fetch and expand them concurrently while keeping their order
+        with ThreadPoolExecutor(max_workers=min(len(calendar_urls), MAX_CONCURRENT_FETCHES)) as executor:
+            calendar_events = executor.map(
+                lambda calendar_url: self.fetch_calendar_events(calendar_url, tz, start_range, end_range), calendar_urls)
+
+            for events, color in zip(calendar_events, colors):
+                contrast_color = self.get_contrast_color(color)
+                for event in events:
+                    parsed_events.append({**event, "backgroundColor": color, "textColor": contrast_color})
+
+        return parsed_events
+
+    def fetch_calendar_events(self, calendar_url, tz, start_range, end_range):
+        """Returns the occurrences of a calendar within the range, memoized per calendar version and range.
 
-            for event in events:
+        The version is a hash of the ICS body, which is revalidated through the HTTP cache (ETag/Last-Modified),
+        so an unchanged calendar is neither parsed nor expanded again.
+        """
+        version, ics_text = self.fetch_calendar_source(calendar_url)
+        key = make_key(version, tz.zone, start_range.isoformat(), end_range.isoformat())
+        cache = get_cache(OCCURRENCE_CACHE_NAME, default_ttl=OCCURRENCE_CACHE_TTL, max_entries=OCCURRENCE_CACHE_MAX_ENTRIES)
+
+        def expand():
+            cal = self.parse_calendar(calendar_url, version, ics_text, start_range, end_range)
+            events = []
+            for event in recurring_ical_events.of(cal).between(start_range, end_range):
                 start, end, all_day = self.parse_data_points(event, tz)
                 parsed_event = {
                     "title": str(event.get("summary")),
                     "start": start,
-                    "backgroundColor": color,
-                    "textColor": contrast_color,
                     "allDay": all_day
                 }
                 if end:
                     parsed_event['end'] = end
+                events.append(parsed_event)
+            return events
 
-                parsed_events.append(parsed_event)
+        return cache.get_or_fetch(key, expand)
+
+    def parse_calendar(self, calendar_url, version, ics_text, start_range, end_range):
+        """Returns the calendar parsed for a scan window around the range.
+
+        Only events that can occur in the scan window are parsed (see filter_ics), so huge calendars cost
+        memory and CPU proportional to the window. The parsed calendar is reused while its version is
+        unchanged and the range stays within the scan window.
+        """
+        with _parsed_calendars_lock:
+            cached = _parsed_calendars.get(calendar_url)
+        if cached:
+            cached_version, scan_start, scan_end, cal = cached
+            if cached_version == version and scan_start <= start_range and end_range <= scan_end:
+                return cal
+
+        scan_start, scan_end = start_range - SCAN_WINDOW_MARGIN, end_range + SCAN_WINDOW_MARGIN
+        try:
+            cal = icalendar.Calendar.from_ical(filter_ics(ics_text, scan_start, scan_end))
+        except Exception as e:
+            raise RuntimeError(f"Failed to parse iCalendar url: {str(e)}")
+        with _parsed_calendars_lock:
+            _parsed_calendars[calendar_url] = (version, scan_start, scan_end, cal)
+        return cal
 
-        return parsed_events
-    
     def get_view_range(self, view, current_dt, settings):
         start = datetime(current_dt.year, current_dt.month, current_dt.day)
         if view == "timeGridDay":
@@ -107,8 +174,9 @@ class Calendar(BasePlugin):
                 start = datetime(start.year, start.month, start.day)
             end = start + timedelta(days=7)
         elif view == "dayGrid":
-            start = current_dt - timedelta(weeks=1)
-            end = current_dt + timedelta(weeks=int(settings.get("displayWeeks") or 4))
+            # whole days, so the range (and the occurrence cache key) only changes once a day
+            start = start - timedelta(weeks=1)
+            end = start + timedelta(weeks=1 + int(settings.get("displayWeeks") or 4), days=1)
         elif view == "dayGridMonth":
             start = datetime(current_dt.year, current_dt.month, 1) - timedelta(weeks=1)
             end = datetime(current_dt.year, current_dt.month, 1) + timedelta(weeks=6)
@@ -137,13 +205,14 @@ class Calendar(BasePlugin):
             end = (dtstart + duration).isoformat()
         return start, end, all_day
 
-    def fetch_calendar(self, calendar_url):
+    def fetch_calendar_source(self, calendar_url):
+        """Fetches the ICS body through the HTTP cache and returns (version, text)."""
         try:
-            response = requests.get(calendar_url)
+            response = cached_get(calendar_url)
             response.raise_for_status()
-            return icalendar.Calendar.from_ical(response.text)
         except Exception as e:
             raise RuntimeError(f"Failed to fetch iCalendar url: {str(e)}")
+        return hashlib.sha256(response.content).hexdigest(), response.text
 
     def get_contrast_color(self, color):
         """
@@ -0,0 +1,431 @@
+import logging
+from collections import namedtuple
+from datetime import date, datetime, timedelta
+
+from PIL import Image, ImageColor, ImageDraw
+
+from utils.app_utils import get_font
+
+logger = logging.getLogger(__name__)
+
+NATIVE_VIEWS = ("dayGrid", "dayGridMonth", "listMonth")
+
+FONT_FAMILY = "Jost"
+# font sizes of calendar.html in em, relative to the default font size of the browser
+BASE_FONT_SIZE = 16
+TITLE_FONT_SIZE = 1.75
+TABLE_FONT_SIZE = 1
+SMALL_FONT_SIZE = 0.85
+LINE_HEIGHT = 1.5
+# default margin of plugin.html in px, and its padding as a fraction of the width
+DEFAULT_MARGIN = 5
+PADDING = 0.015
+# FullCalendar fades the days outside of the month and shades the day headers of the list
+OTHER_MONTH_OPACITY = 0.3
+LIST_DAY_SHADE = 0.15
+TODAY_BORDER_WIDTH = 2
+
+LABELS = {
+    "en": {
+        "months": ["January", "February", "March", "April", "May", "June", "July",
+                   "August", "September", "October", "November", "December"],
+        "months_short": ["Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"],
+        "weekdays": ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"],
+        "weekdays_short": ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"],
+        "month_title": "{month} {year}",
+        "short_date": "{month_short} {day}",
+        "range_title": "{start} – {end}, {year}",
+        "long_date": "{month} {day}, {year}",
+        "all_day": "all-day",
+        "more": "+{count} more",
+        "no_events": "No events to display",
+    },
+    "de": {
+        "months": ["Januar", "Februar", "März", "April", "Mai", "Juni", "Juli",
+                   "August", "September", "Oktober", "November", "Dezember"],
+        "months_short": ["Jan.", "Feb.", "März", "Apr.", "Mai", "Juni", "Juli", "Aug.", "Sept.", "Okt.", "Nov.", "Dez."],
+        "weekdays": ["Montag", "Dienstag", "Mittwoch", "Donnerstag", "Freitag", "Samstag", "Sonntag"],
+        "weekdays_short": ["Mo.", "Di.", "Mi.", "Do.", "Fr.", "Sa.", "So."],
+        "month_title": "{month} {year}",
+        "short_date": "{day}. {month_short}",
+        "range_title": "{start} – {end} {year}",
+        "long_date": "{day}. {month} {year}",
+        "all_day": "Ganztägig",
+        "more": "+{count} weitere",
+        "no_events": "Keine Ereignisse anzuzeigen",
+    },
+}
+
+# an event with its dates resolved, end_date is exclusive
+Event = namedtuple("Event", "title start end all_day start_date end_date background_color text_color")
+
+
+def get_labels(language):
+    """Returns the labels for a FullCalendar locale code like 'de-at', or None if there are none."""
+    return LABELS.get((language or "en").split("-")[0].lower())
+
+
+def supports_native_rendering(view, settings):
+    """Whether the view can be drawn by CalendarRenderer with these settings.
+
+    Pillow has no locale data, so only the languages in LABELS are drawn natively. Background
+    images and frames are left to the browser as well.
+    """
+    return (view in NATIVE_VIEWS
+            and get_labels(settings.get("language")) is not None
+            and settings.get("backgroundOption") != "image"
+            and settings.get("selectedFrame") in (None, "", "None"))
+
+
+def truncate_text(text, font, max_width):
+    """Returns the longest prefix of text that fits into max_width, like overflow: hidden."""
+    if font.getlength(text) <= max_width:
+        return text
+    low, high = 0, len(text)
+    while low < high:
+        middle = (low + high + 1) // 2
+        if font.getlength(text[:middle]) <= max_width:
+            low = middle
+        else:
+            high = middle - 1
+    return text[:low].rstrip()
+
+
+def blend(color, background, opacity):
+    return tuple(round(c * opacity + b * (1 - opacity)) for c, b in zip(color, background))
+
+
+class CalendarRenderer:
+    """Draws the month, week and list views of the calendar with Pillow.
+
+    The layout follows the FullCalendar template (calendar.html and calendar.css): all-day and
+    multi-day events are drawn as bars spanning their days, timed events as a dot with the time
+    and title, and the events that do not fit into a day are summed up as "+N more".
+    """
+
+    def __init__(self, dimensions, settings, now, time_format="12h", font_scale=1):
+        self.width, self.height = dimensions
+        self.settings = settings
+        self.now = now
+        self.today = now.date()
+        self.time_format = time_format
+        self.labels = get_labels(settings.get("language")) or LABELS["en"]
+
+        self.background_color = ImageColor.getrgb(settings.get("backgroundColor") or "#ffffff")
+        self.text_color = ImageColor.getrgb(settings.get("textColor") or "#000000")
+
+        font_size = BASE_FONT_SIZE * (font_scale or 1)
+        self.title_font = get_font(FONT_FAMILY, TITLE_FONT_SIZE * font_size, "bold")
+        self.header_font = get_font(FONT_FAMILY, TABLE_FONT_SIZE * font_size, "bold")
+        self.table_font = get_font(FONT_FAMILY, TABLE_FONT_SIZE * font_size)
+        self.small_font = get_font(FONT_FAMILY, SMALL_FONT_SIZE * font_size)
+        self.small_bold_font = get_font(FONT_FAMILY, SMALL_FONT_SIZE * font_size, "bold")
+        self.padding = max(round(font_size / 4), 2)
+
+        # weekStartDay counts from Sunday like JavaScript, date.weekday() from Monday
+        self.week_start = (int(settings.get("weekStartDay") or 0) - 1) % 7
+        self.display_weekends = settings.get("displayWeekends") == "true"
+        self.display_event_time = settings.get("displayEventTime") == "true"
+        self.display_title = settings.get("displayTitle") == "true"
+
+    def render(self, view, events):
+        image = Image.new("RGB", (self.width, self.height), self.background_color)
+        draw = ImageDraw.Draw(image)
+        events = sorted(self.parse_events(events), key=self.event_order)
+
+        left, top, right, bottom = self.content_box()
+        if view == "listMonth":
+            top = self.draw_title(draw, (left, top, right), self.month_title(self.today))
+            self.draw_list(draw, (left, top, right, bottom), events)
+        else:
+            days = self.grid_days(view)
+            if view == "dayGridMonth":
+                title = self.month_title(self.today)
+            else:
+                title = self.range_title(days[0][0], days[-1][-1])
+            top = self.draw_title(draw, (left, top, right), title)
+            self.draw_day_grid(draw, (left, top, right, bottom), days, view == "dayGridMonth")
+            self.draw_day_grid_events(draw, (left, top, right, bottom), days, events)
+        return image
+
+    def content_box(self):
+        """Returns the area inside the margins and padding of plugin.html."""
+        def margin(side):
+            return int(self.settings.get(f"{side}Margin") or self.settings.get("margin") or DEFAULT_MARGIN)
+
+        padding = round(self.width * PADDING)
+        return (margin("left") + padding, margin("top") + padding,
+                self.width - margin("right") - padding, self.height - margin("bottom") - padding)
+
+    def parse_events(self, events):
+        """Resolves the ISO dates of the events from fetch_ics_events."""
+        tz = self.now.tzinfo
+        for event in events:
+            all_day = event.get("allDay", False)
+            if all_day:
+                start = date.fromisoformat(event["start"][:10])
+                end = date.fromisoformat(event["end"][:10]) if event.get("end") else None
+                start_date = start
+                end_date = end if end and end > start else start + timedelta(days=1)
+            else:
+                start = datetime.fromisoformat(event["start"])
+                end = datetime.fromisoformat(event["end"]) if event.get("end") else None
+                if start.tzinfo and tz:
+                    start = start.astimezone(tz)
+                if end and end.tzinfo and tz:
+                    end = end.astimezone(tz)
+                start_date = start.date()
+                # an event ending at midnight does not reach into the next day
+                last = end - timedelta(microseconds=1) if end and end > start else start
+                end_date = last.date() + timedelta(days=1)
+            yield Event(event.get("title", ""), start, end, all_day, start_date, end_date,
+                        ImageColor.getrgb(event.get("backgroundColor") or "#000000"),
+                        ImageColor.getrgb(event.get("textColor") or "#ffffff"))
+
+    @staticmethod
+    def event_order(event):
+        # like FullCalendar: by start day, longer events first, all-day before timed events
+        start_time = event.start if not event.all_day else None
+        return (event.start_date, -(event.end_date - event.start_date).days, not event.all_day,
+                start_time.replace(tzinfo=None) if start_time else datetime.min, event.title)
+
+    def is_block_event(self, event):
+        return event.all_day or event.end_date - event.start_date > timedelta(days=1)
+
+    def format_time(self, value):
+        if self.time_format == "12h":
+            hour = value.hour % 12 or 12
+            minutes = f":{value.minute:02d}" if value.minute else ""
+            return f"{hour}{minutes}{'am' if value.hour < 12 else 'pm'}"
+        return f"{value.hour:02d}:{value.minute:02d}"
+
+    def month_title(self, day):
+        return self.labels["month_title"].format(month=self.labels["months"][day.month - 1], year=day.year)
+
+    def range_title(self, first, last):
+        def short_date(day):
+            return self.labels["short_date"].format(month_short=self.labels["months_short"][day.month - 1], day=day.day)
+        return self.labels["range_title"].format(start=short_date(first), end=short_date(last), year=last.year)
+
+    def draw_title(self, draw, box, title):
+        """Draws the centered title if enabled and returns the top of the remaining area."""
+        left, top, right = box
+        if not self.display_title:
+            return top
+        line_height = round(self.title_font.size * 1.2)
+        draw.text(((left + right) / 2, top + line_height / 2), title, anchor="mm", fill=self.text_color, font=self.title_font)
+        return top + line_height + self.padding
+
+    def week_start_of(self, day):
+        return day - timedelta(days=(day.weekday() - self.week_start) % 7)
+
+    def grid_days(self, view):
+        """Returns the displayed days as a list of weeks."""
+        if view == "dayGridMonth":
+            month_start = self.today.replace(day=1)
+            next_month = (month_start + timedelta(days=32)).replace(day=1)
+            start = self.week_start_of(month_start)
+            weeks = -(-(next_month - start).days // 7)
+        else:
+            start = self.week_start_of(self.today)
+            weeks = int(self.settings.get("displayWeeks") or 4)
+
+        days = []
+        for week in range(weeks):
+            week_days = [start + timedelta(days=7 * week + offset) for offset in range(7)]
+            if not self.display_weekends:
+                week_days = [day for day in week_days if day.weekday() < 5]
+            days.append(week_days)
+        return days
+
+    def grid_geometry(self, box, days):
+        left, top, right, bottom = box
+        header_height = round(self.header_font.size * LINE_HEIGHT)
+        column_width = (right - left) / len(days[0])
+        row_height = (bottom - top - header_height) / len(days)
+        return header_height, column_width, row_height
+
+    def draw_day_grid(self, draw, box, days, fade_other_months):
+        """Draws the weekday header, the grid lines and the day numbers."""
+        left, top, right, bottom = box
+        header_height, column_width, row_height = self.grid_geometry(box, days)
+        faded_color = blend(self.text_color, self.background_color, OTHER_MONTH_OPACITY)
+
+        for column, day in enumerate(days[0]):
+            x = left + column * column_width
+            label = self.labels["weekdays_short"][day.weekday()]
+            draw.text((x + column_width / 2, top + header_height / 2), label, anchor="mm", fill=self.text_color, font=self.header_font)
+            if column:
+                draw.line((x, top + header_height, x, bottom), fill=self.text_color)
+        for row in range(1, len(days)):
+            y = top + header_height + row * row_height
+            draw.line((left, y, right, y), fill=self.text_color)
+        draw.rectangle((left, top + header_height, right, bottom), outline=self.text_color)
+
+        for row, week in enumerate(days):
+            y = top + header_height + row * row_height
+            for column, day in enumerate(week):
+                x = left + column * column_width
+                color = faded_color if fade_other_months and day.month != self.today.month else self.text_color
+                draw.text((x + column_width - self.padding, y + self.padding), str(day.day), anchor="ra", fill=color, font=self.table_font)
+                if day == self.today:
+                    # rows of many weeks on small displays can be less than a pixel high
+                    x0, y0 = round(x), round(y)
+                    x1, y1 = max(round(x + column_width) - 1, x0), max(round(y + row_height) - 1, y0)
+                    draw.rectangle((x0, y0, x1, y1), outline=self.text_color, width=TODAY_BORDER_WIDTH)
+
+    def place_segments(self, week, events):
+        """Places the events of a week into levels, the lowest free level first.
+
+        Returns (first column, last column, level, event) per segment.
+        """
+        segments, occupied = [], []
+        for event in events:
+            columns = [column for column, day in enumerate(week) if event.start_date <= day < event.end_date]
+            if not columns:
+                continue
+            span = set(range(columns[0], columns[-1] + 1))
+            level = next((level for level, used in enumerate(occupied) if used.isdisjoint(span)), len(occupied))
+            if level == len(occupied):
+                occupied.append(set())
+            occupied[level].update(span)
+            segments.append((columns[0], columns[-1], level, event))
+        return segments
+
+    def visible_segments(self, segments, columns, capacity):
+        """Splits the segments of a week into the drawn ones and the hidden count per column.
+
+        A column with more segments than levels shows one level less to make room for "+N more".
+        A segment is only drawn if its level is visible in every column it spans.
+        """
+        counts = [sum(first <= column <= last for first, last, _, _ in segments) for column in range(columns)]
+        visible = [capacity if count <= capacity else max(capacity - 1, 0) for count in counts]
+        while True:
+            drawn = [segment for segment in segments if segment[2] < min(visible[segment[0]:segment[1] + 1])]
+            hidden = [count - sum(first <= column <= last for first, last, _, _ in drawn) for column, count in enumerate(counts)]
+            crowded = [column for column in range(columns) if hidden[column] and visible[column] >= capacity > 0]
+            if not crowded:
+                return drawn, hidden, visible
+            for column in crowded:
+                visible[column] = capacity - 1
+
+    def draw_day_grid_events(self, draw, box, days, events):
+        left, top, right, bottom = box
+        header_height, column_width, row_height = self.grid_geometry(box, days)
+        number_height = round(self.table_font.size * LINE_HEIGHT) + self.padding
+        line_height = round(self.small_font.size * LINE_HEIGHT)
+        capacity = max(int((row_height - number_height - self.padding) // line_height), 0)
+        if not capacity:
+            # not even "+N more" fits below the day numbers
+            return
+
+        for row, week in enumerate(days):
+            row_top = top + header_height + row * row_height + number_height
+            segments = self.place_segments(week, events)
+            drawn, hidden, visible = self.visible_segments(segments, len(week), capacity)
+
+            for first, last, level, event in drawn:
+                x0 = left + first * column_width + self.padding
+                x1 = left + (last + 1) * column_width - self.padding
+                y = row_top + level * line_height
+                if self.is_block_event(event):
+                    self.draw_event_bar(draw, (x0, y, x1, y + line_height - 1), event)
+                else:
+                    self.draw_event_item(draw, (x0, y, x1, y + line_height - 1), event)
+
+            for column, count in enumerate(hidden):
+                if count:
+                    x = left + column * column_width + self.padding
+                    y = row_top + visible[column] * line_height + line_height / 2
+                    label = truncate_text(self.labels["more"].format(count=count), self.small_font, column_width - 2 * self.padding)
+                    draw.text((x, y), label, anchor="lm", fill=self.text_color, font=self.small_font)
+
+    def draw_event_bar(self, draw, box, event):
+        x0, y0, x1, y1 = box
+        draw.rounded_rectangle(box, radius=3, fill=event.background_color)
+        text = event.title
+        if self.display_event_time and not event.all_day:
+            text = f"{self.format_time(event.start)} {text}"
+        text = truncate_text(text, self.small_font, x1 - x0 - 2 * self.padding)
+        draw.text((x0 + self.padding, (y0 + y1) / 2), text, anchor="lm", fill=event.text_color, font=self.small_font)
+
+    def draw_event_item(self, draw, box, event):
+        x0, y0, x1, y1 = box
+        y = (y0 + y1) / 2
+        radius = max(self.small_font.size / 4, 2)
+        draw.ellipse((x0 + self.padding, y - radius, x0 + self.padding + 2 * radius, y + radius), fill=event.background_color)
+        x = x0 + 2 * self.padding + 2 * radius
+        if self.display_event_time:
+            time = f"{self.format_time(event.start)} "
+            draw.text((x, y), time, anchor="lm", fill=self.text_color, font=self.small_font)
+            x += self.small_font.getlength(time)
+        title = truncate_text(event.title, self.small_bold_font, x1 - x)
+        draw.text((x, y), title, anchor="lm", fill=self.text_color, font=self.small_bold_font)
+
+    def list_rows(self, events):
+        """Returns the rows of the list view: ("day", day) headers followed by ("event", day, event) rows."""
+        month_start = self.today.replace(day=1)
+        next_month = (month_start + timedelta(days=32)).replace(day=1)
+        rows = []
+        day = month_start
+        while day < next_month:
+            day_events = [event for event in events if event.start_date <= day < event.end_date]
+            if day_events:
+                rows.append(("day", day))
+                rows.extend(("event", day, event) for event in day_events)
+            day += timedelta(days=1)
+        return rows
+
+    def list_time_label(self, day, event):
+        if event.all_day or event.start_date < day < event.end_date - timedelta(days=1):
+            return self.labels["all_day"]
+        if event.start_date < day:
+            return f"- {self.format_time(event.end)}" if event.end else self.labels["all_day"]
+        if event.end and event.end_date - event.start_date == timedelta(days=1):
+            return f"{self.format_time(event.start)} - {self.format_time(event.end)}"
+        return self.format_time(event.start)
+
+    def draw_list(self, draw, box, events):
+        left, top, right, bottom = box
+        row_height = round(self.table_font.size * LINE_HEIGHT) + self.padding
+        shade = blend(self.text_color, self.background_color, LIST_DAY_SHADE)
+        rows = self.list_rows(events)
+
+        if not rows:
+            draw.rectangle(box, fill=shade, outline=self.text_color)
+            draw.text(((left + right) / 2, (top + bottom) / 2), self.labels["no_events"], anchor="mm", fill=self.text_color, font=self.table_font)
+            return
+
+        capacity = max(int((bottom - top) // row_height), 1)
+        if len(rows) > capacity:
+            shown = rows[:capacity - 1]
+            if shown and shown[-1][0] == "day":
+                shown.pop()
+            hidden = sum(row[0] == "event" for row in rows[len(shown):])
+            rows = shown + [("more", hidden)]
+
+        time_width = max((self.table_font.getlength(self.list_time_label(row[1], row[2])) for row in rows if row[0] == "event"), default=0)
+        radius = max(self.table_font.size / 4, 2)
+        y = top
+        for row in rows:
+            center = y + row_height / 2
+            if row[0] == "day":
+                day = row[1]
+                draw.rectangle((left, y, right, y + row_height), fill=shade)
+                draw.text((left + 2 * self.padding, center), self.labels["weekdays"][day.weekday()], anchor="lm", fill=self.text_color, font=self.header_font)
+                long_date = self.labels["long_date"].format(month=self.labels["months"][day.month - 1], day=day.day, year=day.year)
+                draw.text((right - 2 * self.padding, center), long_date, anchor="rm", fill=self.text_color, font=self.header_font)
+            elif row[0] == "event":
+                day, event = row[1], row[2]
+                x = left + 2 * self.padding
+                draw.text((x, center), self.list_time_label(day, event), anchor="lm", fill=self.text_color, font=self.table_font)
+                x += time_width + 3 * self.padding
+                draw.ellipse((x, center - radius, x + 2 * radius, center + radius), fill=event.background_color)
+                x += 2 * radius + 3 * self.padding
+                title = truncate_text(event.title, self.table_font, right - self.padding - x)
+                draw.text((x, center), title, anchor="lm", fill=self.text_color, font=self.table_font)
+            else:
+                draw.text((left + 2 * self.padding, center), self.labels["more"].format(count=row[1]), anchor="lm", fill=self.text_color, font=self.table_font)
+            draw.line((left, y + row_height, right, y + row_height), fill=self.text_color)
+            y += row_height
+        draw.rectangle((left, top, right, y), outline=self.text_color)
@@ -0,0 +1,141 @@
+import io
+import logging
+from datetime import datetime, timedelta
+
+from icalendar import vDuration
+
+logger = logging.getLogger(__name__)
+
+# floating and TZID times are compared without their timezone, this margin covers any UTC offset
+TIMEZONE_MARGIN = timedelta(days=1)
+
+RECURRENCE_PROPERTIES = {"RRULE", "RDATE"}
+TIME_PROPERTIES = {"DTSTART", "DTEND", "DURATION", "RECURRENCE-ID"}
+
+
+def filter_ics(ics_text, start_range, end_range):
+    """Returns the ICS text reduced to the events that can produce occurrences within the range.
+
+    The calendar is scanned line by line without building an object tree. Everything outside of VEVENT
+    components (calendar properties, VTIMEZONE, ...) is kept, as are recurring masters (RRULE/RDATE)
+    and every event whose DTSTART/DTEND could overlap the range. Modified occurrences (RECURRENCE-ID) are
+    kept if either their original or their new time overlaps the range, so they still replace their
+    master's occurrence. Events that cannot be parsed cheaply are kept, so the result is never missing
+    events that a full parse would return.
+
+    Args:
+        ics_text: The ICS document, either a str or an iterable of lines.
+        start_range: Start of the requested range.
+        end_range: End of the requested range.
+
+    Returns:
+        The reduced ICS text, to be parsed with icalendar.Calendar.from_ical.
+    """
+    window_start = _naive(start_range) - TIMEZONE_MARGIN
+    window_end = _naive(end_range) + TIMEZONE_MARGIN
+
+    lines = io.StringIO(ics_text) if isinstance(ics_text, str) else ics_text
+    output = []
+    event = None
+    depth = 0
+    total_events = kept_events = 0
+
+    for raw, logical in _unfold(lines):
+        if event is None:
+            if logical.upper() == "BEGIN:VEVENT":
+                event = {"lines": [raw]}
+                depth = 0
+            else:
+                output.append(raw)
+            continue
+
+        name, value = _split_property(logical)
+        event["lines"].append(raw)
+        if name == "BEGIN":
+            depth += 1
+        elif name == "END" and depth:
+            depth -= 1
+        elif name == "END":
+            total_events += 1
+            if _is_candidate(event, window_start, window_end):
+                kept_events += 1
+                output.extend(event["lines"])
+            event = None
+        elif depth == 0 and (name in TIME_PROPERTIES or name in RECURRENCE_PROPERTIES):
+            event[name] = value
+
+    logger.debug(f"Scanned ICS events | total: {total_events} | kept: {kept_events}")
+    return "".join(output)
+
+
+def _is_candidate(event, window_start, window_end):
+    if any(prop in event for prop in RECURRENCE_PROPERTIES):
+        return True
+
+    try:
+        start = _parse_date(event["DTSTART"])
+        if "DTEND" in event:
+            end = _parse_date(event["DTEND"])
+        elif "DURATION" in event:
+            end = start + vDuration.from_ical(event["DURATION"])
+        else:
+            end = start
+        in_range = start <= window_end and end >= window_start
+
+        if not in_range and "RECURRENCE-ID" in event:
+            original = _parse_date(event["RECURRENCE-ID"])
+            in_range = window_start <= original <= window_end
+        return in_range
+    except (KeyError, ValueError, TypeError):
+        return True
+
+
+def _parse_date(value):
+    # DATE (YYYYMMDD) or DATE-TIME (YYYYMMDDTHHMMSS[Z]), sliced directly as strptime dominates the scan
+    value = value.strip()
+    date = datetime(int(value[0:4]), int(value[4:6]), int(value[6:8]))
+    if value[8:9] == "T":
+        return date.replace(hour=int(value[9:11]), minute=int(value[11:13]), second=int(value[13:15]))
+    return date
+
+
+def _naive(dt):
+    if not isinstance(dt, datetime):
+        return datetime(dt.year, dt.month, dt.day)
+    return dt.replace(tzinfo=None)
+
+
+def _split_property(line):
+    """Splits a content line into its upper case property name and value, ignoring quoted parameters."""
+    separator = line.find(":")
+    if separator >= 0 and '"' not in line[:separator]:
+        return line[:separator].split(";", 1)[0].upper(), line[separator + 1:].rstrip("\r\n")
+
+    in_quotes = False
+    name_end = None
+    for index, char in enumerate(line):
+        if char == '"':
+            in_quotes = not in_quotes
+        elif not in_quotes:
+            if char == ";" and name_end is None:
+                name_end = index
+            elif char == ":":
+                return line[:name_end if name_end is not None else index].upper(), line[index + 1:].rstrip("\r\n")
+    return line.strip().upper(), ""
+
+
+def _unfold(lines):
+    """Yields (raw, logical) content lines, joining folded continuation lines."""
+    raw_parts = []
+    logical_parts = []
+    for line in lines:
+        if line[:1] in (" ", "\t") and raw_parts:
+            raw_parts.append(line)
+            logical_parts.append(line[1:].rstrip("\r\n"))
+            continue
+        if raw_parts:
+            yield "".join(raw_parts), "".join(logical_parts)
+        raw_parts = [line]
+        logical_parts = [line.rstrip("\r\n")]
+    if raw_parts:
+        yield "".join(raw_parts), "".join(logical_parts)
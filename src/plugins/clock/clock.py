@@ -7,6 +7,7 @@ import logging
 import numpy as np
 import math
 from datetime import datetime
+from functools import lru_cache
 import pytz
 
 logger = logging.getLogger(__name__)
@@ -41,6 +42,26 @@ CLOCK_FACES = [
 DEFAULT_TIMEZONE = "US/Eastern"
 DEFAULT_CLOCK_FACE = "Gradient Clock"
 
+# static layers (background, face, unlit letters or digits) are kept per face, dimensions and colors
+STATIC_LAYER_CACHE_SIZE = 4
+
+WORD_CLOCK_GRID = [
+    ['I','T','L','I','S','A','S','A','M','P','M'],
+    ['A','C','Q','U','A','R','T','E','R','D','C'],
+    ['T','W','E','N','T','Y','F','I','V','E','X'],
+    ['H','A','L','F','S','T','E','N','F','T','O'],
+    ['P','A','S','T','E','R','U','N','I','N','E'],
+    ['O','N','E','S','I','X','T','H','R','E','E'],
+    ['F','O','U','R','F','I','V','E','T','W','O'],
+    ['E','I','G','H','T','E','L','E','V','E','N'],
+    ['S','E','V','E','N','T','W','E','L','V','E'],
+    ['T','E','N','S','E','O','C','L','O','C','K'],
+]
+
+# angles of the gradient clock are quantized to a power of two steps per turn (under 0.4px at a 1000px radius),
+# so adding two angles wraps around the circle with a bit mask
+ANGLE_STEPS = 1 << 14
+
 class Clock(BasePlugin):
     def generate_settings_template(self):
         template_params = super().generate_settings_template()
@@ -81,7 +102,7 @@ class Clock(BasePlugin):
         w,h = dimensions
         time_str = Clock.format_time(time.hour, time.minute, zero_pad = True)
 
-        image = Image.new("RGBA", dimensions, secondary_color+(255,))
+        image = Clock.draw_digital_clock_base(tuple(dimensions), primary_color, secondary_color)
         text = Image.new("RGBA", dimensions, (0, 0, 0, 0))
 
         font_size = w * 0.36
@@ -89,28 +110,33 @@ class Clock(BasePlugin):
         text_draw = ImageDraw.Draw(text)
 
         # time text
-        text_draw.text((w/2, h/2), "00:00", font=fnt, anchor="mm", fill=primary_color +(30,))
         text_draw.text((w/2, h/2), time_str, font=fnt, anchor="mm", fill=primary_color +(255,))
 
         combined = Image.alpha_composite(image, text)    
 
         return combined
-        
+
+    @staticmethod
+    @lru_cache(maxsize=STATIC_LAYER_CACHE_SIZE)
+    def draw_digital_clock_base(dimensions, primary_color, secondary_color):
+        """Background with the faint "00:00" behind the digits, drawn once per dimensions and colors."""
+        w,h = dimensions
+        image = Image.new("RGBA", dimensions, secondary_color+(255,))
+        text = Image.new("RGBA", dimensions, (0, 0, 0, 0))
+
+        fnt = get_font("DS-Digital", w * 0.36)
+        ImageDraw.Draw(text).text((w/2, h/2), "00:00", font=fnt, anchor="mm", fill=primary_color +(30,))
+
+        return Image.alpha_composite(image, text)
+
     def draw_conic_clock(self, dimensions, time, primary_color=(219, 50, 70, 255), secondary_color=(0, 0, 0, 255) ):
         width, height = dimensions
         hour_angle, minute_angle = Clock.calculate_clock_angles(time)
 
-        # Draw the hour hand gradient
-        image_hour = Clock.draw_gradient_image(
+        # Draw the hour and minute hand gradients
+        final_image = Clock.draw_conic_gradients(
             width, height, hour_angle, minute_angle, secondary_color, primary_color
         )
-        # Draw the minute hand gradient
-        image_minute = Clock.draw_gradient_image(
-            width, height, minute_angle, hour_angle, secondary_color, primary_color
-        )
-
-        # Combine the images using alpha blending
-        final_image = Image.alpha_composite(image_hour, image_minute)
 
         dim = min(width, height)
         minute_length = dim * 0.35
@@ -129,6 +155,29 @@ class Clock(BasePlugin):
         return final_image
 
     def draw_divided_clock(self, dimensions, time, primary_color=(32,183,174), secondary_color=(255,255,255)):
+        w,h = dimensions
+        bg = Clock.draw_divided_clock_base(tuple(dimensions), primary_color, secondary_color)
+
+        # used to calculate percentages of sizes
+        dim = min(w,h)
+
+        canvas = Image.new("RGBA", dimensions, (0, 0, 0, 0))
+
+        hour_angle, minute_angle = Clock.calculate_clock_angles(time)
+        hand_width = max(int(dim * 0.009), 1)
+        Clock.draw_clock_hand(canvas, int(dim*0.3), minute_angle, secondary_color, hand_width=hand_width, border_color=secondary_color, round_corners=False)
+        Clock.draw_clock_hand(canvas, int(dim*0.2), hour_angle, secondary_color, hand_width=hand_width, border_color=secondary_color, round_corners=False)
+
+        Clock.drew_clock_center(canvas, max(int(dim*0.014), 1), primary_color, secondary_color, width=max(int(dim* 0.007), 1))
+
+        combined = Image.alpha_composite(bg, canvas)    
+
+        return combined
+
+    @staticmethod
+    @lru_cache(maxsize=STATIC_LAYER_CACHE_SIZE)
+    def draw_divided_clock_base(dimensions, primary_color, secondary_color):
+        """Divided background, face shadow, outline and hour marks, drawn once per dimensions and colors."""
         w,h = dimensions
         bg = Image.new("RGBA", dimensions, primary_color+(255,))
         bg_draw = ImageDraw.Draw(bg)
@@ -151,68 +200,71 @@ class Clock(BasePlugin):
         # clock outline
         image_draw.circle((w/2,h/2), face_size, fill=primary_color, outline=secondary_color, width=int(dim * 0.03125))
         
-        Clock.draw_hour_marks(image_draw._image, face_size - int(w*0.04375))
+        Clock.draw_hour_marks(canvas, face_size - int(w*0.04375))
 
-        hour_angle, minute_angle = Clock.calculate_clock_angles(time)
-        hand_width = max(int(dim * 0.009), 1)
-        Clock.draw_clock_hand(image_draw._image, int(dim*0.3), minute_angle, secondary_color, hand_width=hand_width, border_color=secondary_color, round_corners=False)
-        Clock.draw_clock_hand(image_draw._image, int(dim*0.2), hour_angle, secondary_color, hand_width=hand_width, border_color=secondary_color, round_corners=False)
+        return Image.alpha_composite(bg, canvas)
 
-        Clock.drew_clock_center(image_draw._image, max(int(dim*0.014), 1), primary_color, secondary_color, width=max(int(dim* 0.007), 1))
+    def draw_word_clock(self, dimensions, time, primary_color=(0,0,0), secondary_color=(255,255,255)):
+        bg = Clock.draw_word_clock_base(tuple(dimensions), primary_color, secondary_color)
 
-        combined = Image.alpha_composite(bg, canvas)    
+        fnt, positions = Clock.word_clock_layout(dimensions)
 
-        return combined
+        canvas = Image.new("RGBA", dimensions, (0, 0, 0, 0))
+        image_draw = ImageDraw.Draw(canvas)
 
-    def draw_word_clock(self, dimensions, time, primary_color=(0,0,0), secondary_color=(255,255,255)):
-        w,h = dimensions
+        letter_positions = Clock.translate_word_grid_positions(time.hour % 12, time.minute)
+
+        # the lit letters with their shadow, on top of the unlit grid
+        for y, x in sorted(set(map(tuple, letter_positions))):
+            x_pos, y_pos = positions[y][x]
+            letter = WORD_CLOCK_GRID[y][x]
+            image_draw.text((x_pos+2, y_pos+2), letter, anchor="mm", fill=secondary_color+(80,), font=fnt)
+            image_draw.text((x_pos, y_pos), letter, anchor="mm", fill=secondary_color+(255,), font=fnt)
 
+        combined = Image.alpha_composite(bg, canvas)
+        return combined
+
+    @staticmethod
+    @lru_cache(maxsize=STATIC_LAYER_CACHE_SIZE)
+    def draw_word_clock_base(dimensions, primary_color, secondary_color):
+        """Background with the full unlit letter grid, drawn once per dimensions and colors."""
         bg = Image.new("RGBA", dimensions, primary_color+(255,))
 
+        fnt, positions = Clock.word_clock_layout(dimensions)
+
+        canvas = Image.new("RGBA", dimensions, (0, 0, 0, 0))
+        image_draw = ImageDraw.Draw(canvas)
+
+        for y, row in enumerate(WORD_CLOCK_GRID):
+            for x, letter in enumerate(row):
+                image_draw.text(positions[y][x], letter, anchor="mm", fill=secondary_color+(50,), font=fnt)
+
+        return Image.alpha_composite(bg, canvas)
+
+    @staticmethod
+    def word_clock_layout(dimensions):
+        """Returns the font and the (x, y) center of every letter of the word clock grid."""
+        w,h = dimensions
         dim = min(w,h)
 
         font_size = dim*0.05
         fnt = get_font("Napoli", font_size)
 
-        canvas = Image.new("RGBA", dimensions, (0, 0, 0, 0))
-        image_draw = ImageDraw.Draw(canvas)
-
         border = [40, 40]
         if w > h:
             border[0] += (w-h)/2
         elif h > w:
             border[1] += (h-w)/2
 
-        letter_positions = Clock.translate_word_grid_positions(time.hour % 12, time.minute)
-
-        letter_grid = [
-            ['I','T','L','I','S','A','S','A','M','P','M'],
-            ['A','C','Q','U','A','R','T','E','R','D','C'],
-            ['T','W','E','N','T','Y','F','I','V','E','X'],
-            ['H','A','L','F','S','T','E','N','F','T','O'],
-            ['P','A','S','T','E','R','U','N','I','N','E'],
-            ['O','N','E','S','I','X','T','H','R','E','E'],
-            ['F','O','U','R','F','I','V','E','T','W','O'],
-            ['E','I','G','H','T','E','L','E','V','E','N'],
-            ['S','E','V','E','N','T','W','E','L','V','E'],
-            ['T','E','N','S','E','O','C','L','O','C','K'],
-        ]
-
         canvas_size = min(w,h) - min(border)*2
-        for y, row in enumerate(letter_grid):
-            for x, letter in enumerate(row):
-                x_pos = x*(canvas_size/(len(row)-1)) + border[0] 
-                y_pos = y*(canvas_size/(len(letter_grid)-1)) + border[1]
-
-                fill=secondary_color+(50,)
-                if [y,x] in letter_positions:
-                    fill=secondary_color+(255,)
-                    image_draw.text((x_pos+2, y_pos+2), letter, anchor="mm", fill=secondary_color+(80,), font=fnt)
-                
-                image_draw.text((x_pos, y_pos), letter, anchor="mm", fill=fill, font=fnt)
-
-        combined = Image.alpha_composite(bg, canvas)
-        return combined
+        positions = [
+            [
+                (x*(canvas_size/(len(row)-1)) + border[0], y*(canvas_size/(len(WORD_CLOCK_GRID)-1)) + border[1])
+                for x in range(len(row))
+            ]
+            for y, row in enumerate(WORD_CLOCK_GRID)
+        ]
+        return fnt, positions
 
     @staticmethod
     def format_time(hour, minute, zero_pad=False):
@@ -225,38 +277,58 @@ class Clock(BasePlugin):
         return f"{hour_str}:{minute_str}"
 
     @staticmethod
-    def draw_gradient_image(w, h, start_angle, end_angle, start_color, end_color):
+    def draw_conic_gradients(w, h, hour_angle, minute_angle, start_color, end_color):
         """
-        Draw a gradient that starts at start_angle and ends at end_angle, using RGBA colors.
+        Draw the gradient from the hour to the minute angle with the gradient from the minute to the hour angle on top.
         Angles are interpreted for a clock face (0 at 12 o'clock, increasing clockwise).
+
+        Both gradients only depend on a pixel's angle, so they are rendered and alpha composited into a lookup
+        table with one RGBA entry per angle step, which is then applied to the cached angle field of the resolution
+        in a single vectorized indexing pass.
         """
-        x,y = np.ogrid[:h,:w]
-        cx,cy = h/2, w/2
+        theta = np.arange(ANGLE_STEPS) * (2 * np.pi / ANGLE_STEPS)
+        start_color = Clock.pad_color(start_color)
+        end_color = Clock.pad_color(end_color)
 
-        start_angle = -start_angle
-        end_angle = -end_angle
+        # the table is indexed by the angle from the start of the hour gradient, shifted for the minute gradient
+        hour_lut = Clock.gradient_lut(theta, hour_angle - minute_angle, start_color, end_color)
+        minute_lut = Clock.gradient_lut((theta + minute_angle - hour_angle) % (2 * np.pi), minute_angle - hour_angle, start_color, end_color)
+        lut = Image.alpha_composite(Image.fromarray(hour_lut[np.newaxis], mode="RGBA"), Image.fromarray(minute_lut[np.newaxis], mode="RGBA"))
+        # gathering whole RGBA pixels as uint32 is several times faster than gathering four uint8 channels
+        lut = np.ascontiguousarray(np.asarray(lut)[0]).view(np.uint32).ravel()
 
-        theta = (np.arctan2(x-cx,y-cy) - start_angle)  % (2*np.pi)
+        offset = np.uint16(round(hour_angle % (2 * np.pi) * ANGLE_STEPS / (2 * np.pi)) % ANGLE_STEPS)
+        angles = Clock.angle_field(w, h) + offset
+        angles &= ANGLE_STEPS - 1
+        pixels = lut[angles]
+        return Image.fromarray(pixels.view(np.uint8).reshape(h, w, 4), mode="RGBA")
 
-        angle_range = ((end_angle-start_angle) % (2 * np.pi))
+    @staticmethod
+    def gradient_lut(theta, angle_range, start_color, end_color):
+        """Colors of a gradient spanning angle_range for angles theta from its start, transparent outside of it."""
+        angle_range = angle_range % (2 * np.pi)
         if angle_range == 0:
             angle_range = 2*np.pi  # Special case: full circle gradient
 
         anglemask = theta <= angle_range
-        theta = theta / angle_range  # Normalize to [0, 1] within range
+        t = (theta / angle_range)[:, np.newaxis]  # Normalize to [0, 1] within range
 
         # Interpolate colors between start and end within the mask
-        gradient = np.zeros((h, w, 4), dtype=np.uint8)
-        start_color = Clock.pad_color(start_color)
-        end_color = Clock.pad_color(end_color)
-        for c in range(4):  # Iterate through RGBA channels
-            gradient[..., c] = (
-                start_color[c] * (1 - theta) + end_color[c] * (theta)
-            ).astype(np.uint8)
-        
-        # Fill with the specified solid color
-        gradient[~anglemask] = (0, 0, 0, 0)
-        return Image.fromarray(gradient, mode="RGBA")
+        lut = (np.array(start_color) * (1 - t) + np.array(end_color) * t).astype(np.uint8)
+        lut[~anglemask] = (0, 0, 0, 0)
+        return lut
+
+    @staticmethod
+    @lru_cache(maxsize=4)
+    def angle_field(w, h):
+        """Clockwise angle of every pixel around the image center, in ANGLE_STEPS steps. Computed once per resolution."""
+        x,y = np.ogrid[:h,:w]
+        cx,cy = h/2, w/2
+
+        theta = np.arctan2(x-cx,y-cy) % (2*np.pi)
+        field = (np.round(theta * (ANGLE_STEPS / (2 * np.pi))).astype(np.int64) % ANGLE_STEPS).astype(np.uint16)
+        field.flags.writeable = False
+        return field
 
     @staticmethod
     def pad_color(color):
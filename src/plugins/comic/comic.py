@@ -1,10 +1,19 @@
 from plugins.base_plugin.base_plugin import BasePlugin
 from PIL import Image, ImageDraw, ImageFont
-
-import requests
+from io import BytesIO
 
 from .comic_parser import COMICS, get_panel
 from utils.app_utils import get_font
+from utils.cache_utils import make_key
+from utils.http_cache import cached_get
+from utils.image_store import get_image_store
+from utils.text_utils import wrap_text
+
+# a published panel never changes, so its image is served from the HTTP cache without revalidation
+PANEL_MIN_TTL = 30 * 24 * 60 * 60
+# composed images by panel, resolution and caption settings
+COMPOSED_STORE_NAME = "comic"
+COMPOSED_STORE_MAX_IMAGES = 50
 
 class Comic(BasePlugin):
     def generate_settings_template(self):
@@ -27,13 +36,22 @@ class Comic(BasePlugin):
             dimensions = dimensions[::-1]
         width, height = dimensions
 
-        return self._compose_image(comic_panel, is_caption, caption_font_size, width, height)
+        store = get_image_store(COMPOSED_STORE_NAME, max_images=COMPOSED_STORE_MAX_IMAGES)
+        key = make_key(comic_panel["image_url"], comic_panel["title"], comic_panel["caption"],
+                       is_caption, caption_font_size, width, height)
+        image = store.get(key)
+        if image is None:
+            image = self._compose_image(comic_panel, is_caption, caption_font_size, width, height)
+            store.put(key, image)
+        return image
 
     def _compose_image(self, comic_panel, is_caption, caption_font_size, width, height):
-        response = requests.get(comic_panel["image_url"], stream=True)
+        response = cached_get(comic_panel["image_url"], min_ttl=PANEL_MIN_TTL)
         response.raise_for_status()
 
-        with Image.open(response.raw) as img:
+        with Image.open(BytesIO(response.content)) as img:
+            # let JPEG panels decode at a reduced scale that still covers the display
+            img.draft("RGB", (width, height))
             background = Image.new("RGB", (width, height), "white")
             font = get_font("Jost", font_size=int(caption_font_size))
             draw = ImageDraw.Draw(background)
@@ -66,13 +84,5 @@ class Comic(BasePlugin):
             return background
 
     def _wrap_text(self, text, font, width):
-        lines = []
-        words = text.split()[::-1]
-
-        while words:
-            line = words.pop()
-            while words and font.getbbox(line + ' ' + words[-1])[2] < width:
-                line += ' ' + words.pop()
-            lines.append(line)
-
+        lines = wrap_text(text, font, width)
         return len(lines), '\n'.join(lines)
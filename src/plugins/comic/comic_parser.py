@@ -1,7 +1,16 @@
 import feedparser
+import hashlib
 import html
 import re
 
+from utils.cache_utils import get_cache
+from utils.http_cache import cached_get
+
+# feeds are revalidated with a conditional GET at most this often
+FEED_MIN_TTL = 15 * 60
+# parsed panels by comic, reused while the feed body is unchanged
+PANEL_CACHE_NAME = "comic_panels"
+
 
 COMICS = {
     "XKCD": {
@@ -64,7 +73,22 @@ COMICS = {
 
 
 def get_panel(comic_name):
-    feed = feedparser.parse(COMICS[comic_name]["feed"])
+    """Returns the latest panel of the comic, parsing the feed only when its content changed."""
+    response = cached_get(COMICS[comic_name]["feed"], min_ttl=FEED_MIN_TTL)
+    response.raise_for_status()
+
+    cache = get_cache(PANEL_CACHE_NAME, max_entries=len(COMICS))
+    digest = hashlib.sha256(response.content).hexdigest()
+    cached = cache.get(comic_name)
+    if cached and cached["digest"] == digest:
+        return cached["panel"]
+
+    panel = parse_panel(comic_name, feedparser.parse(response.content))
+    cache.set(comic_name, {"digest": digest, "panel": panel})
+    return panel
+
+
+def parse_panel(comic_name, feed):
     try:
         element = COMICS[comic_name]["element"](feed)
     except IndexError:
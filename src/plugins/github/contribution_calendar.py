@@ -0,0 +1,65 @@
+import numpy as np
+
+
+class ContributionCalendar:
+    """A GitHub contribution calendar converted once into flat NumPy arrays.
+
+    The GraphQL response nests days in weeks. Walking the nested dicts once gives arrays of counts,
+    dates and week positions, from which color levels, month labels and streaks are derived with
+    vectorized operations instead of per-day Python loops.
+
+    Attributes:
+        counts (numpy.ndarray): Contribution count of every day, in calendar order.
+        dates (numpy.ndarray): datetime64[D] date of every day.
+        offsets (numpy.ndarray): Days since the first date of the calendar.
+        week_lengths (numpy.ndarray): Number of days in every week, the first and last week can be partial.
+    """
+
+    def __init__(self, calendar):
+        weeks = [week["contributionDays"] for week in calendar["weeks"]]
+        self.week_lengths = np.fromiter((len(days) for days in weeks), dtype=np.int64, count=len(weeks))
+        days = [day for days in weeks for day in days]
+
+        self.counts = np.fromiter((day["contributionCount"] for day in days), dtype=np.int64, count=len(days))
+        self.dates = np.array([day["date"] for day in days], dtype="datetime64[D]")
+        self.offsets = (self.dates - self.dates[0]).astype(np.int64) if len(days) else np.zeros(0, dtype=np.int64)
+        self.week_starts = np.concatenate(([0], np.cumsum(self.week_lengths)[:-1])) if len(weeks) else self.week_lengths
+
+    def __len__(self):
+        return len(self.counts)
+
+    def color_levels(self, level_count):
+        """Returns the color index of every day: 0 for no contributions, else scaled by the busiest day to 1..level_count-1."""
+        max_count = self.counts.max(initial=0)
+        if max_count == 0:
+            return np.zeros(len(self), dtype=np.int64)
+        levels = self.counts * (level_count - 1) // max_count
+        return np.where(self.counts > 0, np.maximum(levels, 1), 0)
+
+    def month_starts(self):
+        """Returns the indices of the weeks whose first day falls in a different month than the previous week."""
+        if not len(self.week_starts):
+            return np.zeros(0, dtype=np.int64)
+        months = self.dates[self.week_starts].astype("datetime64[M]")
+        return np.flatnonzero(months[1:] != months[:-1]) + 1
+
+    def streaks(self, today):
+        """Returns the (current, longest) streak of consecutive days with contributions.
+
+        The current streak is the run of active days that includes today or yesterday.
+        """
+        order = np.argsort(self.dates, kind="stable")
+        active = self.counts[order] > 0
+        dates = self.dates[order]
+
+        edges = np.diff(np.concatenate(([0], active.astype(np.int8), [0])))
+        run_starts = np.flatnonzero(edges == 1)
+        run_ends = np.flatnonzero(edges == -1)
+        if not run_starts.size:
+            return 0, 0
+        lengths = run_ends - run_starts
+
+        today = np.datetime64(today, "D")
+        current_runs = np.flatnonzero((dates[run_starts] <= today) & (dates[run_ends - 1] >= today - 1))
+        current = int(lengths[current_runs[-1]]) if current_runs.size else 0
+        return current, int(lengths.max())
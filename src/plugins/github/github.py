@@ -2,6 +2,7 @@ from ..base_plugin.base_plugin import BasePlugin
 from .github_contributions import contributions_generate_image
 from .github_sponsors import sponsors_generate_image
 from .github_stars import stars_generate_image
+from .github_api import fetch_github_data, is_cached
 import logging
 
 logger = logging.getLogger(__name__)
@@ -33,4 +34,41 @@ class GitHub(BasePlugin):
                 raise ValueError(f"Unknown GitHub type: {github_type}")
         except Exception as e:
             logger.error(f"GitHub image generation failed: {str(e)}")
-            raise
\ No newline at end of file
+            raise
+
+    def prefetch(self, upcoming, device_config):
+        """Fetches the GitHub data of all upcoming instances with one aliased GraphQL request.
+
+        Queries whose cached result stays current until the instance is displayed are skipped.
+        """
+        api_key = device_config.load_env_key("GITHUB_SECRET")
+        if not api_key:
+            return
+
+        queries = []
+        for settings, seconds_until_display in upcoming:
+            query = self.github_query(settings)
+            if query and not is_cached(*query, seconds_ahead=seconds_until_display):
+                queries.append(query)
+        if not queries:
+            return
+
+        try:
+            _, errors = fetch_github_data(queries, api_key)
+        except Exception as e:
+            logger.warning(f"Batched GitHub request failed, instances will be fetched individually: {e}")
+            return
+        for (kind, target), messages in errors.items():
+            logger.warning(f"GitHub {kind} query for {target} failed: {messages}")
+
+    def github_query(self, settings):
+        """Returns the (kind, target) GitHub query of an instance, or None if its settings are incomplete."""
+        github_type = settings.get('githubType', 'contributions')
+        username = settings.get('githubUsername')
+        if not username:
+            return None
+        if github_type in ('contributions', 'sponsors'):
+            return github_type, username
+        if github_type == 'stars' and settings.get('githubRepository'):
+            return github_type, f"{username}/{settings.get('githubRepository')}"
+        return None
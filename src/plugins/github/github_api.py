@@ -0,0 +1,197 @@
+import logging
+import time
+
+from utils.cache_utils import get_cache, make_key
+from utils.http_utils import http_post
+
+logger = logging.getLogger(__name__)
+
+GITHUB_GRAPHQL_URL = "https://api.github.com/graphql"
+
+# results by (query kind, user or repository), shared by all github instances
+GITHUB_CACHE_NAME = "github"
+GITHUB_CACHE_MAX_ENTRIES = 256
+# seconds a cached result is served without asking GitHub again
+QUERY_TTLS = {
+    "contributions": 60 * 60,
+    "sponsors": 60 * 60,
+    "stars": 15 * 60,
+}
+# below this many remaining rate limit points, cached results are served even when outdated
+RATE_LIMIT_KEY = "rate_limit"
+RATE_LIMIT_RESERVE = 100
+# larger batches are split to stay well below GitHub's query complexity limits
+MAX_QUERIES_PER_REQUEST = 20
+
+USER_QUERY = "user(login: $login{index})"
+REPOSITORY_QUERY = "repository(owner: $owner{index}, name: $name{index})"
+
+QUERY_FIELDS = {
+    "contributions": """
+        contributionsCollection {
+          contributionCalendar {
+            totalContributions
+            weeks {
+              contributionDays {
+                contributionCount
+                date
+              }
+            }
+          }
+        }""",
+    "sponsors": """
+        sponsorshipsAsMaintainer(first: 100) {
+          totalCount
+          nodes {
+            createdAt
+            sponsorEntity {
+              ... on User {
+                login
+                name
+              }
+              ... on Organization {
+                login
+                name
+              }
+            }
+            tier {
+              name
+              monthlyPriceInCents
+            }
+          }
+        }
+        estimatedNextSponsorsPayoutInCents""",
+    "stars": """
+        stargazerCount""",
+}
+
+
+def get_github_data(kind, target, api_key):
+    """Returns the GitHub data of one query, a user login for contributions and sponsors or "owner/name" for stars.
+
+    Results are cached per (kind, target) for QUERY_TTLS[kind] seconds. When the rate limit budget is
+    nearly used up or GitHub rejects the request, the last cached result is served instead.
+    """
+    entry = get_cache(GITHUB_CACHE_NAME, max_entries=GITHUB_CACHE_MAX_ENTRIES).get(cache_key(kind, target))
+    if entry and (is_fresh(entry, kind) or is_rate_limited()):
+        return entry["data"]
+
+    try:
+        results, errors = fetch_github_data([(kind, target)], api_key)
+    except Exception as e:
+        if entry:
+            logger.warning(f"GitHub request failed, serving cached {kind} data for {target}: {e}")
+            return entry["data"]
+        raise
+
+    if (kind, target) in errors:
+        raise RuntimeError(f"GitHub API returned errors: {errors[(kind, target)]}")
+    return results[(kind, target)]
+
+
+def fetch_github_data(queries, api_key):
+    """Fetches a list of (kind, target) queries with as few aliased GraphQL requests as possible and caches the results.
+
+    Returns:
+        A tuple of the results and the error messages, both keyed by (kind, target).
+    """
+    queries = list(dict.fromkeys(queries))
+    results, errors = {}, {}
+    for start in range(0, len(queries), MAX_QUERIES_PER_REQUEST):
+        batch = queries[start:start + MAX_QUERIES_PER_REQUEST]
+        batch_results, batch_errors = _fetch_batch(batch, api_key)
+        results.update(batch_results)
+        errors.update(batch_errors)
+
+    now = time.time()
+    get_cache(GITHUB_CACHE_NAME, max_entries=GITHUB_CACHE_MAX_ENTRIES).set_many({
+        cache_key(kind, target): {"data": data, "fetched": now} for (kind, target), data in results.items()
+    })
+    return results, errors
+
+
+def is_cached(kind, target, seconds_ahead=0):
+    """Returns whether a result is cached that is still current in seconds_ahead seconds."""
+    entry = get_cache(GITHUB_CACHE_NAME, max_entries=GITHUB_CACHE_MAX_ENTRIES).get(cache_key(kind, target))
+    return entry is not None and is_fresh(entry, kind, seconds_ahead)
+
+
+def is_fresh(entry, kind, seconds_ahead=0):
+    return time.time() + seconds_ahead - entry["fetched"] < QUERY_TTLS[kind]
+
+
+def is_rate_limited():
+    """Returns whether the remaining GitHub rate limit budget is below RATE_LIMIT_RESERVE."""
+    rate_limit = get_cache(GITHUB_CACHE_NAME, max_entries=GITHUB_CACHE_MAX_ENTRIES).get(RATE_LIMIT_KEY)
+    return rate_limit is not None and rate_limit["remaining"] < RATE_LIMIT_RESERVE
+
+
+def cache_key(kind, target):
+    # logins and repository names are case insensitive on GitHub
+    return make_key(kind, target.lower())
+
+
+def build_query(queries):
+    """Builds one GraphQL document with an aliased field (q0, q1, ...) and its variables for every query."""
+    declarations, fields, variables = [], [], {}
+    for index, (kind, target) in enumerate(queries):
+        if kind == "stars":
+            owner, name = target.split("/", 1)
+            declarations += [f"$owner{index}: String!", f"$name{index}: String!"]
+            variables[f"owner{index}"] = owner
+            variables[f"name{index}"] = name
+            field = REPOSITORY_QUERY.format(index=index)
+        else:
+            declarations.append(f"$login{index}: String!")
+            variables[f"login{index}"] = target
+            field = USER_QUERY.format(index=index)
+        fields.append(f"  q{index}: {field} {{{QUERY_FIELDS[kind]}\n  }}")
+
+    query = f"query({', '.join(declarations)}) {{\n" + "\n".join(fields) + "\n}"
+    return query, variables
+
+
+def _fetch_batch(queries, api_key):
+    query, variables = build_query(queries)
+    headers = {"Authorization": f"Bearer {api_key}"}
+    resp = http_post(GITHUB_GRAPHQL_URL, json={"query": query, "variables": variables}, headers=headers)
+    _update_rate_limit(resp.headers)
+    resp.raise_for_status()
+    payload = resp.json()
+
+    data = payload.get("data")
+    if data is None:
+        raise RuntimeError(f"GitHub API returned errors: {payload.get('errors')}")
+
+    # errors of individual aliases (e.g. an unknown user) are reported with the alias as first path element
+    alias_errors = {}
+    for error in payload.get("errors") or []:
+        alias = (error.get("path") or [None])[0]
+        alias_errors.setdefault(alias, []).append(error.get("message"))
+
+    results, errors = {}, {}
+    for index, query in enumerate(queries):
+        alias = f"q{index}"
+        if data.get(alias) is None:
+            errors[query] = alias_errors.get(alias) or ["Not found"]
+        else:
+            results[query] = data[alias]
+
+    logger.info(f"Fetched {len(results)} GitHub queries in one request.")
+    return results, errors
+
+
+def _update_rate_limit(headers):
+    remaining = headers.get("X-RateLimit-Remaining")
+    reset = headers.get("X-RateLimit-Reset")
+    if remaining is None or reset is None:
+        return
+    try:
+        remaining, reset = int(remaining), int(reset)
+    except ValueError:
+        return
+
+    ttl = max(reset - time.time(), 1)
+    get_cache(GITHUB_CACHE_NAME, max_entries=GITHUB_CACHE_MAX_ENTRIES).set(RATE_LIMIT_KEY, {"remaining": remaining, "reset": reset}, ttl)
+    if remaining < RATE_LIMIT_RESERVE:
+        logger.warning(f"GitHub rate limit nearly exhausted, serving cached data until reset | remaining: {remaining}")
@@ -1,27 +1,10 @@
-import requests
 import logging
-from datetime import datetime, date, timedelta
+from datetime import date
+from .contribution_calendar import ContributionCalendar
+from .github_api import get_github_data
 
 logger = logging.getLogger(__name__)
 
-GRAPHQL_QUERY = """
-query($username: String!) {
-  user(login: $username) {
-    contributionsCollection {
-      contributionCalendar {
-        totalContributions
-        weeks {
-          contributionDays {
-            contributionCount
-            date
-          }
-        }
-      }
-    }
-  }
-}
-"""
-
 def contributions_generate_image(plugin_instance, settings, device_config):
     dimensions = device_config.get_resolution()
     if device_config.get_config("orientation") == "vertical":
@@ -36,9 +19,9 @@ def contributions_generate_image(plugin_instance, settings, device_config):
     if not github_username:
         raise RuntimeError("GitHub username is required.")
 
-    data = fetch_contributions(github_username, api_key)
-    grid, month_positions = parse_contributions(data, colors)
-    metrics = calculate_metrics(data)
+    calendar = ContributionCalendar(fetch_contributions(github_username, api_key))
+    grid, month_positions = parse_contributions(calendar, colors)
+    metrics = calculate_metrics(calendar)
 
     template_params = {
         "username": github_username,
@@ -60,69 +43,33 @@ def contributions_generate_image(plugin_instance, settings, device_config):
 # -------------------------
 
 def fetch_contributions(username, api_key):
-    url = "https://api.github.com/graphql"
-    headers = {"Authorization": f"Bearer {api_key}"}
-    variables = {"username": username}
-    resp = requests.post(url, json={"query": GRAPHQL_QUERY, "variables": variables}, headers=headers)
-    resp.raise_for_status()
-    return resp.json()
-
-def parse_contributions(data, colors):
-    weeks = data["data"]["user"]["contributionsCollection"]["contributionCalendar"]["weeks"]
-
-    grid = [[day for day in week["contributionDays"]] for week in weeks]
-    max_contrib = max(day["contributionCount"] for week in grid for day in week)
-
-    def get_color(count):
-        if max_contrib == 0 or count == 0:
-            return colors[0]
-        level = int((count / max_contrib) * (len(colors) - 1))
-        return colors[max(1, level)]
+    data = get_github_data("contributions", username, api_key)
+    return data["contributionsCollection"]["contributionCalendar"]
 
-    for week in grid:
-        for day in week:
-            day["color"] = get_color(day["contributionCount"])
+def parse_contributions(calendar, colors):
+    day_colors = [colors[level] for level in calendar.color_levels(len(colors)).tolist()]
+    counts = calendar.counts.tolist()
+    dates = calendar.dates.astype(str).tolist()
 
-    month_positions = []
-    seen_months = set()
-    for i, week in enumerate(weeks):
-        first_day = week["contributionDays"][0]["date"]
-        dt = datetime.strptime(first_day, "%Y-%m-%d")
-        month_year = f"{dt.strftime('%b')}-{dt.year}"
-        if month_year not in seen_months:
-            month_positions.append({"name": dt.strftime("%b"), "index": i})
-            seen_months.add(month_year)
+    grid = [
+        [{"contributionCount": counts[i], "date": dates[i], "color": day_colors[i]} for i in range(start, start + length)]
+        for start, length in zip(calendar.week_starts.tolist(), calendar.week_lengths.tolist())
+    ]
 
-    if month_positions:
-        month_positions.pop(0)
+    # the label of the first, usually partial, month is left out
+    week_dates = calendar.dates[calendar.week_starts].tolist()
+    month_positions = [
+        {"name": week_dates[index].strftime("%b"), "index": index}
+        for index in calendar.month_starts().tolist()
+    ]
 
     return grid, month_positions
 
-def calculate_metrics(data):
-    weeks = data["data"]["user"]["contributionsCollection"]["contributionCalendar"]["weeks"]
-    days = [day for week in weeks for day in week["contributionDays"]]
-    days = sorted(days, key=lambda d: d["date"])
-
-    total = sum(day["contributionCount"] for day in days)
-    streak, longest_streak, current_streak = 0, 0, 0
-    today = date.today()
-    yesterday = today - timedelta(days=1)
-    in_current_streak = False
-
-    for day in days:
-        day_date = date.fromisoformat(day["date"])
-        if day["contributionCount"] > 0:
-            streak += 1
-            longest_streak = max(longest_streak, streak)
-            if day_date in (today, yesterday) or in_current_streak:
-                current_streak = streak
-                in_current_streak = True
-        else:
-            streak = 0
-            in_current_streak = False
+def calculate_metrics(calendar):
+    current_streak, longest_streak = calendar.streaks(date.today())
 
     return [
-        {"title": "Contributions", "value": total},
+        {"title": "Contributions", "value": int(calendar.counts.sum())},
         {"title": "Current Streak", "value": current_streak},
         {"title": "Longest Streak", "value": longest_streak},
     ]
@@ -1,36 +1,8 @@
-import requests
 import logging
+from .github_api import get_github_data
 
 logger = logging.getLogger(__name__)
 
-GRAPHQL_QUERY = """
-query($username: String!) {
-  user(login: $username) {
-    sponsorshipsAsMaintainer(first: 100) {
-      totalCount
-      nodes {
-        createdAt
-        sponsorEntity {
-          ... on User {
-            login
-            name
-          }
-          ... on Organization {
-            login
-            name
-          }
-        }
-        tier {
-          name
-          monthlyPriceInCents
-        }
-      }
-    }
-    estimatedNextSponsorsPayoutInCents
-  }
-}
-"""
-
 def sponsors_generate_image(plugin_instance, settings, device_config):
     dimensions = device_config.get_resolution()
     if device_config.get_config("orientation") == "vertical":
@@ -65,21 +37,11 @@ def sponsors_generate_image(plugin_instance, settings, device_config):
 # -------------------------
 
 def fetch_sponsorships(username, api_key):
-    url = "https://api.github.com/graphql"
-    headers = {"Authorization": f"Bearer {api_key}"}
-    variables = {"username": username}
-
-    resp = requests.post(url, json={"query": GRAPHQL_QUERY, "variables": variables}, headers=headers)
-    resp.raise_for_status()
-    data = resp.json()
-
-    if "errors" in data:
-        raise RuntimeError(f"GitHub API returned errors: {data['errors']}")
-
+    data = get_github_data("sponsors", username, api_key)
     logger.debug(f"Fetched sponsor data for {username}: {data}")
     return data
 
 def calculate_monthly_total(data) -> int:
-    sponsorships = data['data']['user']['sponsorshipsAsMaintainer']['nodes']
+    sponsorships = data['sponsorshipsAsMaintainer']['nodes']
     total_per_month = sum(s['tier']['monthlyPriceInCents'] / 100 for s in sponsorships)
     return int(total_per_month)
@@ -1,5 +1,6 @@
 import logging
-import requests
+from utils.http_cache import cached_get
+from .github_api import QUERY_TTLS, get_github_data
 
 logger = logging.getLogger(__name__)
 
@@ -11,14 +12,17 @@ def stars_generate_image(plugin_instance, settings, device_config):
     if device_config.get_config("orientation") == "vertical":
         dimensions = dimensions[::-1]
 
-    github_repository = username + "/" + repository
-    if not github_repository:
+    # optional, without a key the star count comes from the unauthenticated REST API
+    api_key = device_config.load_env_key("GITHUB_SECRET")
+
+    if not username or not repository:
         raise RuntimeError("GitHub repository is required.")
+    github_repository = username + "/" + repository
 
     try:
-        stars = fetch_stars(github_repository)
+        stars = fetch_stars(github_repository, api_key)
     except Exception as e:
-        logger.error(f"GitHub graphql request failed: {str(e)}")
+        logger.error(f"GitHub request failed: {str(e)}")
         raise RuntimeError(f"GitHub request failure, please check logs")
 
     template_params = {
@@ -34,16 +38,12 @@ def stars_generate_image(plugin_instance, settings, device_config):
         template_params
     )
 
-def fetch_stars(github_repository):
-    global data
-    url = f"https://api.github.com/repos/{github_repository}"
-    headers = {"Accept": "application/json"}
-
-    response = requests.get(url, headers=headers)
-    if response.status_code == 200:
-        data = response.json()
-    else:
-        logger.error(f"GitHub Stars Plugin: Error: {response.status_code} - {response.text}")
-
-    return data['stargazers_count']
+def fetch_stars(github_repository, api_key=None):
+    if api_key:
+        return get_github_data("stars", github_repository, api_key)["stargazerCount"]
 
+    url = f"https://api.github.com/repos/{github_repository}"
+    response = cached_get(url, headers={"Accept": "application/json"}, min_ttl=QUERY_TTLS["stars"])
+    if response.status_code != 200:
+        raise RuntimeError(f"GitHub Stars Plugin: Error: {response.status_code} - {response.text}")
+    return response.json()["stargazers_count"]
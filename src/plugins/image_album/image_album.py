@@ -1,17 +1,33 @@
+import hashlib
 import logging
-from random import choice, random
+import time
+from random import Random, choice, randrange
 
-import requests
 from PIL import Image, ImageColor, ImageOps
 from io import BytesIO
 
 from PIL.ImageFile import ImageFile
 from plugins.base_plugin.base_plugin import BasePlugin
 
-from utils.image_utils import pad_image_blur
+from utils.image_utils import pad_image_blur, shrink_to_cover
+from utils.http_utils import get_http_session
+from utils.cache_utils import get_cache, make_key
+from utils.prefetch_queue import get_prefetch_queue
 
 logger = logging.getLogger(__name__)
 
+IMMICH_CACHE_NAME = "immich"
+# the no-repeat cursors change on every refresh, so they get a small cache file of their own
+IMMICH_CYCLE_CACHE_NAME = "immich_cycles"
+ALBUM_ID_TTL = 24 * 60 * 60
+# after this time the album is checked for changes, the asset list is only fetched again if it changed
+ASSET_LIST_TTL = 60 * 60
+# long edge of Immich's generated renditions, larger displays fall back to the original
+IMMICH_SIZES = [(250, "thumbnail"), (1440, "preview")]
+
+# shuffled asset ids of the current no-repeat cycle per album, as (digest, seed, order)
+_cycle_orders = {}
+
 
 class ImmichProvider:
     def __init__(self, base_url: str, key: str, orientation: str):
@@ -19,17 +35,34 @@ class ImmichProvider:
         self.key = key
         self.orientation = orientation
         self.headers = {"x-api-key": self.key}
+        self.session = get_http_session()
+        self.cache = get_cache(IMMICH_CACHE_NAME)
+        self.cycles = get_cache(IMMICH_CYCLE_CACHE_NAME)
 
     def get_album_id(self, album: str) -> str:
-        r = requests.get(f"{self.base_url}/api/albums", headers=self.headers)
+        key = make_key(self.base_url, "album", album)
+        album_id = self.cache.get(key)
+        if album_id:
+            return album_id
+
+        r = self.session.get(f"{self.base_url}/api/albums", headers=self.headers)
         r.raise_for_status()
         albums = r.json()
-        album = [a for a in albums if a["albumName"] == album][0]
+        matches = [a for a in albums if a["albumName"] == album]
 
-        if album is None:
+        if not matches:
             raise RuntimeError(f"Album {album} not found.")
 
-        return album["id"]
+        album_id = matches[0]["id"]
+        self.cache.set(key, album_id, ALBUM_ID_TTL)
+        return album_id
+
+    def get_album_version(self, album_id: str) -> dict:
+        """Returns the album's asset count and last update, which change whenever assets are added or removed."""
+        r = self.session.get(f"{self.base_url}/api/albums/{album_id}", params={"withoutAssets": "true"}, headers=self.headers)
+        r.raise_for_status()
+        album = r.json()
+        return {"assetCount": album.get("assetCount"), "updatedAt": album.get("updatedAt")}
 
     def get_asset_ids(self, album_id: str) -> list[str]:
         all_items = []
@@ -39,10 +72,11 @@ class ImmichProvider:
         while page_items:
             body = {
                 "albumIds": [album_id],
+                "type": "IMAGE",
                 "size": 1000,
                 "page": page
             }
-            r2 = requests.post(f"{self.base_url}/api/search/metadata", json=body, headers=self.headers)
+            r2 = self.session.post(f"{self.base_url}/api/search/metadata", json=body, headers=self.headers)
             r2.raise_for_status()
             assets_data = r2.json()
 
@@ -52,24 +86,90 @@ class ImmichProvider:
 
         return [asset["id"] for asset in all_items]
 
-    def get_image(self, album: str) -> ImageFile | None:
+    def get_cached_asset_ids(self, album_id: str) -> tuple[list[str], str]:
+        """Returns the album's asset ids from the cache, listing them again only if the album changed.
+
+        The ids come with a digest of the list, which identifies the no-repeat cycle through them.
+        """
+        key = make_key(self.base_url, "assets", album_id)
+        cached = self.cache.get(key)
+        if cached and "digest" in cached and time.time() - cached["checked"] < ASSET_LIST_TTL:
+            return cached["ids"], cached["digest"]
+
+        version = self.get_album_version(album_id)
+        if cached and cached["version"] == version:
+            logger.info(f"Album {album_id} unchanged, reusing {len(cached['ids'])} cached asset ids")
+            ids = cached["ids"]
+        else:
+            logger.info(f"Getting ids from album id {album_id}")
+            ids = self.get_asset_ids(album_id)
+        digest = hashlib.sha256("|".join(ids).encode("utf-8")).hexdigest()
+        self.cache.set(key, {"version": version, "ids": ids, "digest": digest, "checked": time.time()})
+        return ids, digest
+
+    def choose_asset_id(self, album_id: str, asset_ids: list[str], digest: str, no_repeat: bool) -> str:
+        """Picks a random asset, or the next one of a shuffled cycle through the album if no_repeat is set.
+
+        The cycle is stored as a shuffle seed and a position in the separate cycle cache, so a pick
+        rewrites only the small cursor file instead of the cached asset lists. The shuffled order is
+        kept in memory for the cycle. A cycle starts over when the album's assets change.
+        """
+        if not no_repeat:
+            return choice(asset_ids)
+
+        key = make_key(self.base_url, album_id)
+        cycle = self.cycles.get(key)
+        if not cycle or cycle["digest"] != digest or cycle["position"] >= len(asset_ids):
+            cycle = {"seed": randrange(2 ** 32), "position": 0, "digest": digest}
+
+        cached_order = _cycle_orders.get(key)
+        if cached_order and cached_order[:2] == (digest, cycle["seed"]):
+            order = cached_order[2]
+        else:
+            order = list(asset_ids)
+            Random(cycle["seed"]).shuffle(order)
+            _cycle_orders[key] = (digest, cycle["seed"], order)
+
+        self.cycles.set(key, {**cycle, "position": cycle["position"] + 1})
+        return order[cycle["position"]]
+
+    def download_asset(self, asset_id: str, dimensions=None) -> ImageFile:
+        """Downloads the smallest rendition of the asset that still covers the given dimensions."""
+        size = None
+        if dimensions:
+            size = next((name for max_edge, name in IMMICH_SIZES if max(dimensions) <= max_edge), None)
+
+        if size:
+            url = f"{self.base_url}/api/assets/{asset_id}/thumbnail"
+            params = {"size": size}
+        else:
+            url = f"{self.base_url}/api/assets/{asset_id}/original"
+            params = None
+
+        logger.info(f"Downloading image {asset_id} | size: {size or 'original'}")
+        r = self.session.get(url, params=params, headers=self.headers)
+        r.raise_for_status()
+        img = Image.open(BytesIO(r.content))
+        img = ImageOps.exif_transpose(img)
+        return img
+
+    def get_image(self, album: str, dimensions=None, no_repeat: bool = False) -> ImageFile | None:
         try:
             logger.info(f"Getting id for album {album}")
             album_id = self.get_album_id(album)
-            logger.info(f"Getting ids from album id {album_id}")
-            asset_ids = self.get_asset_ids(album_id)
+            asset_ids, digest = self.get_cached_asset_ids(album_id)
         except Exception as e:
+            # the album may have been deleted or renamed, resolve its id again on the next refresh
+            self.cache.delete(make_key(self.base_url, "album", album))
             logger.error(f"Error grabbing image from {self.base_url}: {e}")
             return None
 
-        asset_id = choice(asset_ids)
+        if not asset_ids:
+            logger.error(f"Album {album} contains no images")
+            return None
 
-        logger.info(f"Downloading image {asset_id}")
-        r = requests.get(f"{self.base_url}/api/assets/{asset_id}/original", headers=self.headers)
-        r.raise_for_status()
-        img = Image.open(BytesIO(r.content))
-        img = ImageOps.exif_transpose(img)
-        return img
+        asset_id = self.choose_asset_id(album_id, asset_ids, digest, no_repeat)
+        return self.download_asset(asset_id, dimensions)
 
 
 class ImageAlbum(BasePlugin):
@@ -84,6 +184,9 @@ class ImageAlbum(BasePlugin):
 
     def generate_image(self, settings, device_config):
         orientation = device_config.get_config("orientation")
+        dimensions = device_config.get_resolution()
+        if orientation == "vertical":
+            dimensions = dimensions[::-1]
         img = None
 
         match settings.get("albumProvider"):
@@ -101,19 +204,25 @@ class ImageAlbum(BasePlugin):
                     raise RuntimeError("Album is required.")
 
                 provider = ImmichProvider(url, key, orientation)
-                img = provider.get_image(album)
+                no_repeat = settings.get('noRepeat') == "true"
+
+                def fetch_image():
+                    image = provider.get_image(album, dimensions, no_repeat=no_repeat)
+                    return shrink_to_cover(image, dimensions) if image else None
+
+                # serve the image prepared in the background after the previous refresh, if there is one
+                queue = get_prefetch_queue(self.get_plugin_id(), url, album, no_repeat, dimensions)
+                img = queue.pop()
+                if img is None:
+                    img = fetch_image()
                 if not img:
                     raise RuntimeError("Failed to load image, please check logs.")
+                queue.refill(fetch_image)
 
         if img is None:
             raise RuntimeError("Failed to load image, please check logs.")
 
         if settings.get('padImage') == "true":
-            dimensions = device_config.get_resolution()
-
-            if orientation == "vertical":
-                dimensions = dimensions[::-1]
-
             if settings.get('backgroundOption') == "blur":
                 return pad_image_blur(img, dimensions)
             else:
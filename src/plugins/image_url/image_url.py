@@ -1,15 +1,15 @@
 from plugins.base_plugin.base_plugin import BasePlugin
 from PIL import Image
 from io import BytesIO
-import requests
 import logging
+from utils.http_cache import cached_get
 
 logger = logging.getLogger(__name__)
 
 def grab_image(image_url, dimensions, timeout_ms=40000):
     """Grab an image from a URL and resize it to the specified dimensions."""
     try:
-        response = requests.get(image_url, timeout=timeout_ms / 1000)
+        response = cached_get(image_url, timeout=timeout_ms / 1000)
         response.raise_for_status()
         img = Image.open(BytesIO(response.content))
         img = img.resize(dimensions, Image.LANCZOS)
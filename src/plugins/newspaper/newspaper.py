@@ -1,6 +1,8 @@
 from plugins.base_plugin.base_plugin import BasePlugin
 from datetime import datetime, timedelta
 from utils.image_utils import get_image
+from utils.cache_utils import get_cache, make_key
+from concurrent.futures import ThreadPoolExecutor
 from PIL import Image
 import logging
 from plugins.newspaper.constants import NEWSPAPERS
@@ -8,6 +10,15 @@ from plugins.newspaper.constants import NEWSPAPERS
 logger = logging.getLogger(__name__)
 
 FREEDOM_FORUM_URL = "https://cdn.freedomforum.org/dfp/jpg{}/lg/{}.jpg"
+# front pages are only published once per day, so skip revalidation for a few hours
+FRONT_PAGE_CACHE_TTL = 6 * 60 * 60
+
+PROBE_TIMEOUT = (5, 10)
+# the front page found for a day is kept per (slug, date)
+NEWSPAPER_CACHE_NAME = "newspaper"
+# a hit other than the next day's page is probed again after this time
+RECHECK_TTL = 60 * 60
+
 class Newspaper(BasePlugin):
     def generate_image(self, settings, device_config):
         newspaper_slug = settings.get('newspaperSlug')
@@ -16,19 +27,8 @@ class Newspaper(BasePlugin):
             raise RuntimeError("Newspaper input not provided.")
         newspaper_slug = newspaper_slug.upper()
 
-        # Get today's date
-        today = datetime.today()
-
-        # check the next day, then today, then prior day
-        days = [today + timedelta(days=diff) for diff in [1,0,-1,-2]]
-
-        image = None
-        for date in days:
-            image_url = FREEDOM_FORUM_URL.format(date.day, newspaper_slug)
-            image = get_image(image_url)
-            if image:
-                logging.info(f"Found {newspaper_slug} front cover for {date.strftime('%Y-%m-%d')}")
-                break
+        image_url = self.find_front_page(newspaper_slug, datetime.today())
+        image = get_image(image_url, min_ttl=FRONT_PAGE_CACHE_TTL) if image_url else None
 
         if image:
             # expand height if newspaper is wider than resolution
@@ -53,6 +53,54 @@ class Newspaper(BasePlugin):
     
         return image
     
+    def find_front_page(self, newspaper_slug, today):
+        """Returns the URL of the newest published front page, or None.
+
+        The candidate dates (next day, today, prior days) are probed concurrently with HEAD requests and the
+        first hit by priority is taken. The result is cached for the day, a hit other than the next day's page
+        is probed again after RECHECK_TTL in case a newer page gets published.
+        """
+        cache = get_cache(NEWSPAPER_CACHE_NAME)
+        key = make_key(newspaper_slug, today.date().isoformat())
+        image_url = cache.get(key)
+        if image_url:
+            return image_url
+
+        # check the next day, then today, then prior day
+        days = [today + timedelta(days=diff) for diff in [1,0,-1,-2]]
+        urls = [FREEDOM_FORUM_URL.format(date.day, newspaper_slug) for date in days]
+
+        executor = ThreadPoolExecutor(max_workers=len(urls))
+        try:
+            futures = [executor.submit(self.probe, url) for url in urls]
+            for priority, (date, url, future) in enumerate(zip(days, urls, futures)):
+                if future.result():
+                    logger.info(f"Found {newspaper_slug} front cover for {date.strftime('%Y-%m-%d')}")
+                    if priority == 0:
+                        end_of_day = datetime.combine(today.date() + timedelta(days=1), datetime.min.time())
+                        ttl = (end_of_day - today).total_seconds()
+                    else:
+                        ttl = RECHECK_TTL
+                    cache.set(key, url, ttl)
+                    return url
+        finally:
+            # lower priority probes are not needed once a hit was found
+            executor.shutdown(wait=False, cancel_futures=True)
+        return None
+
+    def probe(self, url):
+        """Returns whether the url exists, without downloading it."""
+        try:
+            response = self.session.head(url, timeout=PROBE_TIMEOUT, allow_redirects=True)
+            if response.status_code == 405:
+                # HEAD not allowed, request a single byte instead
+                response = self.session.get(url, headers={"Range": "bytes=0-0"}, timeout=PROBE_TIMEOUT, stream=True)
+                response.close()
+            return response.status_code in (200, 206)
+        except Exception as e:
+            logger.warning(f"Failed to probe {url}: {e}")
+            return False
+
     def generate_settings_template(self):
         template_params = super().generate_settings_template()
         template_params['newspapers'] = sorted(NEWSPAPERS, key=lambda n: n['name'])
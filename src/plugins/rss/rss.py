@@ -1,13 +1,24 @@
 from plugins.base_plugin.base_plugin import BasePlugin
 from PIL import Image
 from io import BytesIO
+from concurrent.futures import ThreadPoolExecutor
+import calendar
 import feedparser
-import requests
+import hashlib
 import logging
 import html
+from utils.cache_utils import get_cache
+from utils.http_cache import cached_get
 
 logger = logging.getLogger(__name__)
 
+# only this many items are rendered, so entries beyond it are not processed
+MAX_ITEMS = 10
+MAX_CONCURRENT_FETCHES = 4
+# processed items by feed url, reused while the feed body is unchanged
+RSS_CACHE_NAME = "rss"
+RSS_CACHE_MAX_ENTRIES = 64
+
 FONT_SIZES = {
     "x-small": 0.7,
     "small": 0.9,
@@ -24,11 +35,11 @@ class Rss(BasePlugin):
 
     def generate_image(self, settings, device_config):
         title = settings.get("title")
-        feed_url = settings.get("feedUrl")
-        if not feed_url:
+        feed_urls = [url for url in settings.get("feedUrls[]") or [settings.get("feedUrl")] if url]
+        if not feed_urls:
             raise RuntimeError("RSS Feed Url is required.")
-        
-        items = self.parse_rss_feed(feed_url)
+
+        items = self.fetch_feeds(feed_urls)
 
         dimensions = device_config.get_resolution()
         if device_config.get_config("orientation") == "vertical":
@@ -37,7 +48,7 @@ class Rss(BasePlugin):
         template_params = {
             "title": title,
             "include_images": settings.get("includeImages") == "true",
-            "items": items[:10],
+            "items": items[:MAX_ITEMS],
             "font_scale": FONT_SIZES.get(settings.get('fontSize', 'normal'), 1),
             "plugin_settings": settings
         }
@@ -45,31 +56,73 @@ class Rss(BasePlugin):
         image = self.render_image(dimensions, "rss.html", "rss.css", template_params)
         return image
     
+    def fetch_feeds(self, urls):
+        """Fetches the feeds concurrently and returns their items merged newest first, without duplicates."""
+        urls = list(dict.fromkeys(urls))
+        with ThreadPoolExecutor(max_workers=min(len(urls), MAX_CONCURRENT_FETCHES)) as executor:
+            futures = [executor.submit(self.parse_rss_feed, url) for url in urls]
+
+        feeds, errors = [], []
+        for url, future in zip(urls, futures):
+            try:
+                feeds.append(future.result())
+            except Exception as e:
+                logger.error(f"Failed to fetch RSS feed {url}: {e}")
+                errors.append(e)
+        if not feeds:
+            raise RuntimeError(f"Failed to fetch RSS feed: {errors[0]}")
+
+        items = [item for feed in feeds for item in feed]
+        # undated items keep their feed order after the dated ones
+        items.sort(key=lambda item: -(item["timestamp"] or 0))
+
+        # the same article can be listed in several feeds under different GUIDs, so links are tracked as well
+        seen_ids, seen_links, merged = set(), set(), []
+        for item in items:
+            if item["id"] in seen_ids or (item["link"] and item["link"] in seen_links):
+                continue
+            seen_ids.add(item["id"])
+            if item["link"]:
+                seen_links.add(item["link"])
+            merged.append(item)
+        return merged
+
     def parse_rss_feed(self, url, timeout=10):
-        resp = requests.get(url, timeout=timeout, headers={"User-Agent": "Mozilla/5.0"})
+        """Returns the first MAX_ITEMS items of the feed, parsing it only when its content changed."""
+        resp = cached_get(url, timeout=timeout, headers={"User-Agent": "Mozilla/5.0"})
         resp.raise_for_status()
-        
+
+        cache = get_cache(RSS_CACHE_NAME, max_entries=RSS_CACHE_MAX_ENTRIES)
+        digest = hashlib.sha256(resp.content).hexdigest()
+        cached = cache.get(url)
+        if cached and cached["digest"] == digest:
+            return cached["items"]
+
         # Parse the feed content
         feed = feedparser.parse(resp.content)
-        items = []
-
-        for entry in feed.entries:
-            item = {
-                "title": html.unescape(entry.get("title", "")),
-                "description": html.unescape(entry.get("description", "")),
-                "published": entry.get("published", ""),
-                "link": entry.get("link", ""),
-                "image": None
-            }
-
-            # Try to extract image from common RSS fields
-            if "media_content" in entry and len(entry.media_content) > 0:
-                item["image"] = entry.media_content[0].get("url")
-            elif "media_thumbnail" in entry and len(entry.media_thumbnail) > 0:
-                item["image"] = entry.media_thumbnail[0].get("url")
-            elif "enclosures" in entry and len(entry.enclosures) > 0:
-                item["image"] = entry.enclosures[0].get("url")
-
-            items.append(item)
-
-        return items
\ No newline at end of file
+        items = [self.parse_entry(entry) for entry in feed.entries[:MAX_ITEMS]]
+
+        cache.set(url, {"digest": digest, "items": items})
+        return items
+
+    def parse_entry(self, entry):
+        published = entry.get("published_parsed") or entry.get("updated_parsed")
+        item = {
+            "id": entry.get("id") or entry.get("link") or entry.get("title", ""),
+            "title": html.unescape(entry.get("title", "")),
+            "description": html.unescape(entry.get("description", "")),
+            "published": entry.get("published", ""),
+            "timestamp": calendar.timegm(published) if published else None,
+            "link": entry.get("link", ""),
+            "image": None
+        }
+
+        # Try to extract image from common RSS fields
+        if "media_content" in entry and len(entry.media_content) > 0:
+            item["image"] = entry.media_content[0].get("url")
+        elif "media_thumbnail" in entry and len(entry.media_thumbnail) > 0:
+            item["image"] = entry.media_thumbnail[0].get("url")
+        elif "enclosures" in entry and len(entry.enclosures) > 0:
+            item["image"] = entry.enclosures[0].get("url")
+
+        return item
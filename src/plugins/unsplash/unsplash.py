@@ -4,16 +4,29 @@ from io import BytesIO
 import requests
 import logging
 import random
+import time
+from utils.http_utils import http_get
+from utils.cache_utils import get_cache, make_key
+from utils.prefetch_queue import get_prefetch_queue
 
 logger = logging.getLogger(__name__)
 
+UNSPLASH_CACHE_NAME = "unsplash"
+UNSPLASH_CACHE_MAX_ENTRIES = 32
+# the API returns at most 30 photos per request, the demo rate limit is 50 requests per hour
+POOL_SIZE = 30
+POOL_TTL = 60 * 60
+
 def grab_image(image_url, dimensions, timeout_ms=40000):
-    """Grab an image from a URL and resize it to the specified dimensions."""
+    """Grab an image from an Unsplash raw URL, rendered by Unsplash at the specified dimensions."""
+    # Unsplash's dynamic image API crops and scales raw images on their side, so only the displayed pixels are transferred
+    params = {"w": dimensions[0], "h": dimensions[1], "fit": "crop", "fm": "jpg", "q": 85}
     try:
-        response = requests.get(image_url, timeout=timeout_ms / 1000)
+        response = http_get(image_url, params=params, timeout=timeout_ms / 1000)
         response.raise_for_status()
         img = Image.open(BytesIO(response.content))
-        img = img.resize(dimensions, Image.LANCZOS)
+        if img.size != tuple(dimensions):
+            img = img.resize(dimensions, Image.LANCZOS)
         return img
     except Exception as e:
         logger.error(f"Error grabbing image from {image_url}: {e}")
@@ -34,15 +47,10 @@ class Unsplash(BasePlugin):
         params = {
             'client_id': access_key,
             'content_filter': content_filter,
-            'per_page': 100,
         }
 
         if search_query:
-            url = f"https://api.unsplash.com/search/photos"
             params['query'] = search_query
-        else:
-            url = f"https://api.unsplash.com/photos/random"
-
         if collections:
             params['collections'] = collections
         if color:
@@ -50,34 +58,81 @@ class Unsplash(BasePlugin):
         if orientation:
             params['orientation'] = orientation
 
+        dimensions = device_config.get_resolution()
+        if device_config.get_config("orientation") == "vertical":
+            dimensions = dimensions[::-1]
+
+        # serve the image prepared in the background after the previous refresh, if there is one
+        queue = get_prefetch_queue(self.get_plugin_id(), search_query, collections, content_filter, color, orientation, dimensions)
+        image = queue.pop()
+        if image is None:
+            image = self.fetch_image(params, dimensions)
+        queue.refill(lambda: self.fetch_image(params, dimensions))
+
+        return image
+
+    def fetch_image(self, params, dimensions):
+        image_url = self.next_image_url(params)
+        logger.info(f"Grabbing image from: {image_url}")
+
+        image = grab_image(image_url, dimensions, timeout_ms=40000)
+
+        if not image:
+            raise RuntimeError("Failed to load image, please check logs.")
+
+        return image
+
+    def next_image_url(self, params):
+        """Returns the raw URL of the next photo, taken from the pool of previously fetched API results.
+
+        Search results and random photos are fetched in pages of POOL_SIZE and shown one by one, so the API
+        is called at most once per pool instead of on every refresh. A pool is refetched once it is used up
+        or older than POOL_TTL, continuing with the next search results page.
+        """
+        cache = get_cache(UNSPLASH_CACHE_NAME, max_entries=UNSPLASH_CACHE_MAX_ENTRIES)
+        key = make_key(*(f"{k}={v}" for k, v in sorted(params.items()) if k != 'client_id'))
+        # the background prefetch may take a photo at the same time, so take it under the cache lock
+        with cache.lock:
+            pool = cache.get(key) or {"urls": [], "page": 0, "total_pages": 1}
+
+            # the pool is stored again after every photo taken, so its age is kept in the pool itself
+            if not pool["urls"] or time.time() - pool.get("fetched", 0) > POOL_TTL:
+                pool = self.fetch_pool(params, pool)
+
+            image_url = pool["urls"].pop(random.randrange(len(pool["urls"])))
+            cache.set(key, pool)
+        return image_url
+
+    def fetch_pool(self, params, previous_pool):
+        params = {**params, 'per_page': POOL_SIZE}
+        pool = {"urls": [], "page": 0, "total_pages": 1, "fetched": time.time()}
+        if params.get('query'):
+            url = f"https://api.unsplash.com/search/photos"
+            # continue with the next page of results, wrapping around at the end
+            pool["page"] = previous_pool["page"] % previous_pool["total_pages"] + 1
+            params['page'] = pool["page"]
+        else:
+            url = f"https://api.unsplash.com/photos/random"
+            params['count'] = POOL_SIZE
+
         try:
-            response = requests.get(url, params=params)
+            response = self.session.get(url, params=params)
             response.raise_for_status()
             data = response.json()
-            if search_query:
+            if params.get('query'):
                 results = data.get("results")
                 if not results:
                     raise RuntimeError("No images found for the given search query.")
-                image_url = random.choice(results)["urls"]["full"]
+                pool["total_pages"] = max(1, data.get("total_pages") or 1)
             else:
-                image_url = data["urls"]["full"]
+                results = data
+            pool["urls"] = [result["urls"]["raw"] for result in results]
         except requests.exceptions.RequestException as e:
             logger.error(f"Error fetching image from Unsplash API: {e}")
             raise RuntimeError("Failed to fetch image from Unsplash API, please check logs.")
-        except (KeyError, IndexError) as e:
+        except (KeyError, IndexError, TypeError) as e:
             logger.error(f"Error parsing Unsplash API response: {e}")
             raise RuntimeError("Failed to parse Unsplash API response, please check logs.")
 
-
-        dimensions = device_config.get_resolution()
-        if device_config.get_config("orientation") == "vertical":
-            dimensions = dimensions[::-1]
-
-        logger.info(f"Grabbing image from: {image_url}")
-
-        image = grab_image(image_url, dimensions, timeout_ms=40000)
-
-        if not image:
-            raise RuntimeError("Failed to load image, please check logs.")
-
-        return image
+        logger.info(f"Fetched {len(pool['urls'])} Unsplash photos into the pool")
+        return pool
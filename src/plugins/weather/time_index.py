@@ -0,0 +1,114 @@
+import logging
+from datetime import datetime
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+OFFSET_SAMPLE_ROWS = 72
+
+
+class HourlyTimeIndex:
+    """Hourly Open-Meteo timestamps parsed once into wall-clock times of the target timezone.
+
+    Open-Meteo returns naive ISO timestamps. They are converted the same way as
+    `datetime.fromisoformat(time_str).astimezone(tz)`, but the whole series is parsed in a single
+    vectorized pass, so data point lookups and the hourly slice become array lookups.
+
+    Attributes:
+        local_times (numpy.ndarray): datetime64[m] wall-clock times in tz, NaT for unparsable entries.
+        hours (numpy.ndarray): Hour of day for every row, -1 for unparsable entries.
+        dates (numpy.ndarray): datetime64[D] date for every row.
+    """
+
+    def __init__(self, times, tz):
+        naive_times = self._parse(times)
+        self.local_times = self._to_timezone(times, naive_times, tz)
+
+        valid = ~np.isnat(self.local_times)
+        self.dates = self.local_times.astype("datetime64[D]")
+        hours = (self.local_times.astype("datetime64[h]") - self.dates).astype(np.int64)
+        self.hours = np.where(valid, hours, -1)
+
+        # first row for every hour of the day, matching the previous linear scans
+        unique_hours, first_rows = np.unique(self.hours, return_index=True)
+        self.hour_rows = {int(h): int(r) for h, r in zip(unique_hours, first_rows) if h >= 0}
+
+    def __len__(self):
+        return len(self.local_times)
+
+    def row_for_hour(self, hour):
+        """Returns the first row whose local hour equals hour, or None."""
+        return self.hour_rows.get(hour)
+
+    def start_row(self, current_dt):
+        """Returns the first row of current_dt's date at or after its hour, or 0 if there is none."""
+        today = np.datetime64(current_dt.date(), "D")
+        rows = np.flatnonzero((self.dates == today) & (self.hours >= current_dt.hour))
+        return int(rows[0]) if rows.size else 0
+
+    def datetime_at(self, row):
+        """Returns the naive wall-clock datetime of row in the target timezone."""
+        return self.local_times[row].astype("datetime64[us]").item()
+
+    def datetimes(self, start, end):
+        """Returns the naive wall-clock datetimes of rows start to end (exclusive)."""
+        return self.local_times[start:end].astype("datetime64[us]").tolist()
+
+    @staticmethod
+    def _parse(times):
+        try:
+            return np.array(times, dtype="datetime64[m]")
+        except ValueError:
+            parsed = []
+            for time_str in times:
+                try:
+                    parsed.append(np.datetime64(time_str, "m"))
+                except ValueError:
+                    logger.warning(f"Could not parse time string {time_str} in hourly data.")
+                    parsed.append(np.datetime64("NaT", "m"))
+            return np.array(parsed, dtype="datetime64[m]")
+
+    @staticmethod
+    def _to_timezone(times, naive_times, tz):
+        """Applies the naive (system local) -> tz conversion as one vectorized offset addition."""
+        valid_rows = np.flatnonzero(~np.isnat(naive_times))
+        if not valid_rows.size:
+            return naive_times
+
+        def offset(row):
+            naive = datetime.fromisoformat(times[row])
+            return np.timedelta64(naive.astimezone(tz).replace(tzinfo=None) - naive, "m")
+
+        def system_offset(row):
+            return datetime.fromisoformat(times[row]).astimezone().utcoffset()
+
+        # DST changes are at least a week apart, so sample the offset every three days and bisect
+        # for the change row inside windows where it differs
+        samples = valid_rows[::OFFSET_SAMPLE_ROWS].tolist()
+        if samples[-1] != valid_rows[-1]:
+            samples.append(int(valid_rows[-1]))
+        sample_offsets = [offset(row) for row in samples]
+        system_offsets = [system_offset(row) for row in samples]
+
+        offsets = np.zeros(len(times), dtype="timedelta64[m]")
+        offsets[samples[0]:] = np.repeat(np.array(sample_offsets, dtype="timedelta64[m]"), np.diff(samples + [len(times)]))
+        for i in range(len(samples) - 1):
+            start, end = samples[i], samples[i + 1]
+            if system_offsets[i] != system_offsets[i + 1]:
+                # the hour skipped by a DST change of the system timezone gets an offset of its own,
+                # so this window is converted row by row
+                for row in range(start + 1, end):
+                    if not np.isnat(naive_times[row]):
+                        offsets[row] = offset(row)
+            elif sample_offsets[i] != sample_offsets[i + 1]:
+                low, high = start + 1, end
+                while low < high:
+                    mid = (low + high) // 2
+                    if np.isnat(naive_times[mid]) or offset(mid) == sample_offsets[i]:
+                        low = mid + 1
+                    else:
+                        high = mid
+                offsets[low:end] = sample_offsets[i + 1]
+
+        return naive_times + offsets
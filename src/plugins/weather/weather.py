@@ -1,13 +1,16 @@
 from plugins.base_plugin.base_plugin import BasePlugin
+from plugins.weather.time_index import HourlyTimeIndex
+from utils.cache_utils import get_cache, make_key
 from PIL import Image
 import os
-import requests
 import logging
 from datetime import datetime, timedelta, timezone, date
 from astral import moon
 import pytz
 from io import BytesIO
+from concurrent.futures import ThreadPoolExecutor
 import math
+import time
 
 logger = logging.getLogger(__name__)
 
@@ -72,6 +75,23 @@ OPEN_METEO_UNIT_PARAMS = {
     "imperial": "temperature_unit=fahrenheit&wind_speed_unit=mph&precipitation_unit=inch"
 }
 
+# forecast days requested from Open-Meteo, one more than displayed so the last forecast day is complete
+OPEN_METEO_FORECAST_DAYS = 8
+# maximum number of locations per batched Open-Meteo request
+OPEN_METEO_BATCH_SIZE = 50
+# prefetched data is kept until its instance is displayed, instances further ahead fetch their own current weather
+OPEN_METEO_PREFETCH_MAX_SECONDS = 2 * 60 * 60
+
+# provider responses are shared between all weather instances and kept across restarts
+WEATHER_CACHE_NAME = "weather"
+WEATHER_CACHE_MAX_ENTRIES = 128
+DEFAULT_CACHE_MINUTES = 10
+
+# place names for a fixed location practically never change, so reverse geocoding results are kept for a month
+GEOCODING_CACHE_NAME = "weather_geocoding"
+GEOCODING_CACHE_TTL = 30 * 24 * 60 * 60
+GEOCODING_PRECISION = 3
+
 class Weather(BasePlugin):
     def generate_settings_template(self):
         template_params = super().generate_settings_template()
@@ -95,6 +115,7 @@ class Weather(BasePlugin):
 
         weather_provider = settings.get('weatherProvider', 'OpenWeatherMap')
         title = settings.get('customTitle', '')
+        cache_ttl = self.get_cache_ttl(settings)
 
         timezone = device_config.get_config("timezone", default="America/New_York")
         time_format = device_config.get_config("time_format", default="12h")
@@ -105,10 +126,22 @@ class Weather(BasePlugin):
                 api_key = device_config.load_env_key("OPEN_WEATHER_MAP_SECRET")
                 if not api_key:
                     raise RuntimeError("OpenWeatherMap-API-Key ist nicht konfiguriert.")
-                weather_data = self.get_weather_data(api_key, units, lat, long)
-                aqi_data = self.get_air_quality(api_key, lat, long)
-                if settings.get('titleSelection', 'location') == 'location':
-                    title = self.get_location(api_key, lat, long)
+                # weather, air quality and geocoding are independent, so issue them concurrently
+                with ThreadPoolExecutor(max_workers=3) as executor:
+                    weather_future = executor.submit(
+                        self.fetch_cached, (weather_provider, "onecall", lat, long, units), cache_ttl,
+                        lambda: self.get_weather_data(api_key, units, lat, long))
+                    aqi_future = executor.submit(
+                        self.fetch_cached, (weather_provider, "air_pollution", lat, long), cache_ttl,
+                        lambda: self.get_air_quality(api_key, lat, long))
+                    location_future = None
+                    if settings.get('titleSelection', 'location') == 'location':
+                        location_future = executor.submit(self.get_location, api_key, lat, long)
+
+                    weather_data = weather_future.result()
+                    aqi_data = aqi_future.result()
+                    if location_future:
+                        title = location_future.result()
                 if settings.get('weatherTimeZone', 'locationTimeZone') == 'locationTimeZone':
                     logger.info("Verwende Standort-Zeitzone für OpenWeatherMap-Daten.")
                     wtz = self.parse_timezone(weather_data)
@@ -117,9 +150,16 @@ class Weather(BasePlugin):
                     logger.info("Verwende konfigurierte Zeitzone für OpenWeatherMap-Daten.")
                     template_params = self.parse_weather_data(weather_data, aqi_data, tz, units, time_format, lat)
             elif weather_provider == "OpenMeteo":
-                forecast_days = 7
-                weather_data = self.get_open_meteo_data(lat, long, units, forecast_days + 1)
-                aqi_data = self.get_open_meteo_air_quality(lat, long)
+                with ThreadPoolExecutor(max_workers=2) as executor:
+                    weather_future = executor.submit(
+                        self.fetch_cached, self.open_meteo_forecast_key(lat, long, units), cache_ttl,
+                        lambda: self.get_open_meteo_data(lat, long, units, OPEN_METEO_FORECAST_DAYS))
+                    aqi_future = executor.submit(
+                        self.fetch_cached, self.open_meteo_air_quality_key(lat, long), cache_ttl,
+                        lambda: self.get_open_meteo_air_quality(lat, long))
+
+                    weather_data = weather_future.result()
+                    aqi_data = aqi_future.result()
                 template_params = self.parse_open_meteo_data(weather_data, aqi_data, tz, units, time_format, lat)
             else:
                 raise RuntimeError(f"Unbekannter Wetteranbieter: {weather_provider}")
@@ -192,10 +232,14 @@ class Weather(BasePlugin):
             "time_format": time_format
         }
 
+        # the hourly series is shared by the data points and the hourly forecast, so parse it once
+        hourly_data = weather_data.get('hourly', {})
+        hourly_index = HourlyTimeIndex(hourly_data.get('time', []), tz)
+
         data['forecast'] = self.parse_open_meteo_forecast(weather_data.get('daily', {}), tz, is_day, lat)
-        data['data_points'] = self.parse_open_meteo_data_points(weather_data, aqi_data, tz, units, time_format)
+        data['data_points'] = self.parse_open_meteo_data_points(weather_data, aqi_data, tz, units, time_format, hourly_index)
         
-        data['hourly_forecast'] = self.parse_open_meteo_hourly(weather_data.get('hourly', {}), tz, time_format)
+        data['hourly_forecast'] = self.parse_open_meteo_hourly(hourly_data, tz, time_format, hourly_index)
         return data
 
     def map_weather_code_to_icon(self, weather_code, is_day):
@@ -396,38 +440,23 @@ class Weather(BasePlugin):
             hourly.append(hour_forecast)
         return hourly
 
-    def parse_open_meteo_hourly(self, hourly_data, tz, time_format):
-        hourly = []
+    def parse_open_meteo_hourly(self, hourly_data, tz, time_format, hourly_index=None):
         times = hourly_data.get('time', [])
+        if hourly_index is None:
+            hourly_index = HourlyTimeIndex(times, tz)
         temperatures = hourly_data.get('temperature_2m', [])
         precipitation_probabilities = hourly_data.get('precipitation_probability', [])
         rain = hourly_data.get('precipitation', [])
-        current_time_in_tz = datetime.now(tz)
-        start_index = 0
-        for i, time_str in enumerate(times):
-            try:
-                dt_hourly = datetime.fromisoformat(time_str).astimezone(tz)
-                if dt_hourly.date() == current_time_in_tz.date() and dt_hourly.hour >= current_time_in_tz.hour:
-                    start_index = i
-                    break
-                if dt_hourly.date() > current_time_in_tz.date():
-                    break
-            except ValueError:
-                logger.warning(f"Could not parse time string {time_str} in hourly data.")
-                continue
 
-        sliced_times = times[start_index:]
-        sliced_temperatures = temperatures[start_index:]
-        sliced_precipitation_probabilities = precipitation_probabilities[start_index:]
-        sliced_rain = rain[start_index:]
-
-        for i in range(min(24, len(sliced_times))):
-            dt = datetime.fromisoformat(sliced_times[i]).astimezone(tz)
+        start_index = hourly_index.start_row(datetime.now(tz))
+        end_index = min(start_index + 24, len(times))
+        hourly = []
+        for i, dt in zip(range(start_index, end_index), hourly_index.datetimes(start_index, end_index)):
             hour_forecast = {
                 "time": self.format_time(dt, time_format, True),
-                "temperature": int(sliced_temperatures[i]) if i < len(sliced_temperatures) else 0,
-                "precipitation": (sliced_precipitation_probabilities[i] / 100) if i < len(sliced_precipitation_probabilities) else 0,
-                "rain": (sliced_rain[i]) if i < len(sliced_rain) else 0
+                "temperature": int(temperatures[i]) if i < len(temperatures) else 0,
+                "precipitation": (precipitation_probabilities[i] / 100) if i < len(precipitation_probabilities) else 0,
+                "rain": (rain[i]) if i < len(rain) else 0
             }
             hourly.append(hour_forecast)
         return hourly
@@ -509,15 +538,33 @@ class Weather(BasePlugin):
 
         return data_points
 
-    def parse_open_meteo_data_points(self, weather_data, aqi_data, tz, units, time_format):
+    def parse_open_meteo_data_points(self, weather_data, aqi_data, tz, units, time_format, hourly_index=None):
         """Parses current data points from Open-Meteo API response."""
         data_points = []
         daily_data = weather_data.get('daily', {})
         current_data = weather_data.get('current_weather', {})
         hourly_data = weather_data.get('hourly', {})
+        aqi_hourly_data = aqi_data.get('hourly', {})
 
         current_time = datetime.now(tz)
 
+        # parse each hourly series once and look up the row for the current hour
+        if hourly_index is None:
+            hourly_index = HourlyTimeIndex(hourly_data.get('time', []), tz)
+        aqi_times = aqi_hourly_data.get('time', [])
+        if aqi_times == hourly_data.get('time', [])[:len(aqi_times)]:
+            # both APIs usually share the same hourly grid, so the rows line up
+            aqi_index = hourly_index
+        else:
+            aqi_index = HourlyTimeIndex(aqi_times, tz)
+        hourly_row = hourly_index.row_for_hour(current_time.hour)
+        aqi_row = aqi_index.row_for_hour(current_time.hour)
+
+        def current_value(values, row):
+            if row is None or row >= len(values) or values[row] is None:
+                return None
+            return values[row]
+
         # Sonnenaufgang
         sunrise_times = daily_data.get('sunrise', [])
         if sunrise_times:
@@ -555,74 +602,35 @@ class Weather(BasePlugin):
         })
 
         # Luftfeuchtigkeit
-        current_humidity = "k. A."
-        humidity_hourly_times = hourly_data.get('time', [])
-        humidity_values = hourly_data.get('relative_humidity_2m', [])
-        for i, time_str in enumerate(humidity_hourly_times):
-            try:
-                if datetime.fromisoformat(time_str).astimezone(tz).hour == current_time.hour:
-                    current_humidity = int(humidity_values[i])
-                    break
-            except ValueError:
-                logger.warning(f"Could not parse time string {time_str} for humidity.")
-                continue
+        humidity = current_value(hourly_data.get('relative_humidity_2m', []), hourly_row)
         data_points.append({
-            "label": "Luftfeuchtigkeit", "measurement": current_humidity, "unit": '%',
+            "label": "Luftfeuchtigkeit", "measurement": int(humidity) if humidity is not None else "k. A.", "unit": '%',
             "icon": self.get_plugin_dir('icons/humidity.png')
         })
 
         # Luftdruck
-        current_pressure = "k. A."
-        pressure_hourly_times = hourly_data.get('time', [])
-        pressure_values = hourly_data.get('surface_pressure', [])
-        for i, time_str in enumerate(pressure_hourly_times):
-            try:
-                if datetime.fromisoformat(time_str).astimezone(tz).hour == current_time.hour:
-                    current_pressure = int(pressure_values[i])
-                    break
-            except ValueError:
-                logger.warning(f"Could not parse time string {time_str} for pressure.")
-                continue
+        pressure = current_value(hourly_data.get('surface_pressure', []), hourly_row)
         data_points.append({
-            "label": "Luftdruck", "measurement": current_pressure, "unit": 'hPa',
+            "label": "Luftdruck", "measurement": int(pressure) if pressure is not None else "k. A.", "unit": 'hPa',
             "icon": self.get_plugin_dir('icons/pressure.png')
         })
 
         # UV-Index
-        uv_index_hourly_times = aqi_data.get('hourly', {}).get('time', [])
-        uv_index_values = aqi_data.get('hourly', {}).get('uv_index', [])
-        current_uv_index = "k. A."
-        for i, time_str in enumerate(uv_index_hourly_times):
-            try:
-                if datetime.fromisoformat(time_str).astimezone(tz).hour == current_time.hour:
-                    current_uv_index = uv_index_values[i]
-                    break
-            except ValueError:
-                logger.warning(f"Could not parse time string {time_str} for UV Index.")
-                continue
+        uv_index = current_value(aqi_hourly_data.get('uv_index', []), aqi_row)
         data_points.append({
-            "label": "UV-Index", "measurement": current_uv_index, "unit": '',
+            "label": "UV-Index", "measurement": uv_index if uv_index is not None else "k. A.", "unit": '',
             "icon": self.get_plugin_dir('icons/uvi.png')
         })
 
         # Sichtweite
         current_visibility = "k. A."
-        visibility_hourly_times = hourly_data.get('time', [])
-        visibility_values = hourly_data.get('visibility', [])
-        for i, time_str in enumerate(visibility_hourly_times):
-            try:
-                if datetime.fromisoformat(time_str).astimezone(tz).hour == current_time.hour:
-                    visibility = visibility_values[i]
-                    if units == "imperial":
-                        current_visibility = int(round(visibility, 0))
-                        unit_label = "ft"
-                    else:
-                        current_visibility = round(visibility / 1000, 1)
-                        unit_label = "km"
-                    break
-            except ValueError:
-                logger.warning(f"Could not parse time string {time_str} for visibility.")
-                continue
+        unit_label = "ft" if units == "imperial" else "km"
+        visibility = current_value(hourly_data.get('visibility', []), hourly_row)
+        if visibility is not None:
+            if units == "imperial":
+                current_visibility = int(round(visibility, 0))
+            else:
+                current_visibility = round(visibility / 1000, 1)
 
         visibility_str = f">{current_visibility}" if isinstance(current_visibility, (int, float)) and (
             (units == "imperial" and current_visibility >= 32808) or 
@@ -635,17 +643,8 @@ class Weather(BasePlugin):
         })
 
         # Luftqualität
-        aqi_hourly_times = aqi_data.get('hourly', {}).get('time', [])
-        aqi_values = aqi_data.get('hourly', {}).get('european_aqi', [])
-        current_aqi = "k. A."
-        for i, time_str in enumerate(aqi_hourly_times):
-            try:
-                if datetime.fromisoformat(time_str).astimezone(tz).hour == current_time.hour:
-                    current_aqi = round(aqi_values[i], 1)
-                    break
-            except ValueError:
-                logger.warning(f"Could not parse time string {time_str} for AQI.")
-                continue
+        aqi = current_value(aqi_hourly_data.get('european_aqi', []), aqi_row)
+        current_aqi = round(aqi, 1) if aqi is not None else "k. A."
         scale = ""
         if current_aqi and isinstance(current_aqi, (int, float)):
             # Deutsche Skala
@@ -676,9 +675,115 @@ class Weather(BasePlugin):
         
         return "↑"
 
+    def prefetch(self, upcoming, device_config):
+        """Fetches the Open-Meteo data of all upcoming instances with batched forecast and air quality requests.
+
+        Open-Meteo accepts comma separated coordinate lists, so every location that is not cached yet is
+        requested at once and the results are stored in the weather cache, where the generate_image call
+        of each instance picks them up. The entries are kept for the cache time past the display of their
+        instance, so later instances of the cycle are served too. Instances displayed more than
+        OPEN_METEO_PREFETCH_MAX_SECONDS ahead are skipped, their current weather would be too old.
+        """
+        forecast_requests = {}
+        air_quality_requests = {}
+
+        def add_request(requests, key, lat, long, ttl, seconds_until_display):
+            # instances at the same location share the entry, which has to last until the last of them
+            if key not in requests or requests[key][2] < ttl:
+                requests[key] = (lat, long, ttl, seconds_until_display)
+
+        for settings, seconds_until_display in upcoming:
+            if settings.get('weatherProvider') != "OpenMeteo":
+                continue
+            try:
+                lat = float(settings.get('latitude'))
+                long = float(settings.get('longitude'))
+            except (TypeError, ValueError):
+                continue
+            units = settings.get('units')
+            cache_ttl = self.get_cache_ttl(settings)
+            if units not in OPEN_METEO_UNIT_PARAMS or cache_ttl <= 0 or seconds_until_display > OPEN_METEO_PREFETCH_MAX_SECONDS:
+                continue
+
+            ttl = seconds_until_display + cache_ttl
+            add_request(forecast_requests.setdefault(units, {}), self.open_meteo_forecast_key(lat, long, units),
+                        lat, long, ttl, seconds_until_display)
+            add_request(air_quality_requests, self.open_meteo_air_quality_key(lat, long), lat, long, ttl, seconds_until_display)
+
+        if not air_quality_requests:
+            return
+
+        # both endpoints are independent, so the batches are issued concurrently
+        with ThreadPoolExecutor(max_workers=len(forecast_requests) + 1) as executor:
+            futures = [
+                executor.submit(self.fetch_open_meteo_batch, locations,
+                                lambda lats, longs, units=units: self.get_open_meteo_data(lats, longs, units, OPEN_METEO_FORECAST_DAYS))
+                for units, locations in forecast_requests.items()
+            ]
+            futures.append(executor.submit(self.fetch_open_meteo_batch, air_quality_requests, self.get_open_meteo_air_quality))
+            for future in futures:
+                future.result()
+
+    def fetch_open_meteo_batch(self, locations, fetch):
+        """Fetches the entries of locations ({key parts: (lat, long, ttl, seconds until display)}) in batches and caches the results.
+
+        Entries that are cached until their display are left as they are.
+        """
+        cache = get_cache(WEATHER_CACHE_NAME, max_entries=WEATHER_CACHE_MAX_ENTRIES)
+        now = time.time()
+
+        def cached_until_display(key, seconds_until_display):
+            entry = cache.get_entry(key)
+            return entry is not None and (entry["expires"] is None or entry["expires"] > now + seconds_until_display)
+
+        pending = [(self.cache_key(key_parts), location) for key_parts, location in locations.items()]
+        pending = [(key, location) for key, location in pending if not cached_until_display(key, location[3])]
+
+        for start in range(0, len(pending), OPEN_METEO_BATCH_SIZE):
+            batch = pending[start:start + OPEN_METEO_BATCH_SIZE]
+            lats = ",".join(str(lat) for _, (lat, _, _, _) in batch)
+            longs = ",".join(str(long) for _, (_, long, _, _) in batch)
+            try:
+                results = fetch(lats, longs)
+            except Exception as e:
+                logger.warning(f"Batched Open-Meteo request failed, instances will be fetched individually: {e}")
+                continue
+            # a single location is returned as an object, several as a list in request order
+            if isinstance(results, dict):
+                results = [results]
+
+            by_ttl = {}
+            for (key, (_, _, ttl, _)), result in zip(batch, results):
+                by_ttl.setdefault(ttl, {})[key] = result
+            for ttl, items in by_ttl.items():
+                cache.set_many(items, ttl)
+            logger.info(f"Prefetched Open-Meteo data for {len(batch)} locations in one request.")
+
+    def get_cache_ttl(self, settings):
+        return int(settings.get('cacheMinutes') or DEFAULT_CACHE_MINUTES) * 60
+
+    def open_meteo_forecast_key(self, lat, long, units):
+        return ("OpenMeteo", "forecast", lat, long, units, OPEN_METEO_FORECAST_DAYS)
+
+    def open_meteo_air_quality_key(self, lat, long):
+        return ("OpenMeteo", "air_quality", lat, long)
+
+    def fetch_cached(self, key_parts, ttl, fetch):
+        """Returns the provider response for key_parts from the shared weather cache, calling fetch() on a miss.
+
+        Coordinates in key_parts are rounded to 4 decimals (~11m) so instances at the same location share entries.
+        """
+        if ttl <= 0:
+            return fetch()
+        cache = get_cache(WEATHER_CACHE_NAME, max_entries=WEATHER_CACHE_MAX_ENTRIES)
+        return cache.get_or_fetch(self.cache_key(key_parts), fetch, ttl)
+
+    def cache_key(self, key_parts):
+        return make_key(*(f"{part:.4f}" if isinstance(part, float) else part for part in key_parts))
+
     def get_weather_data(self, api_key, units, lat, long):
         url = WEATHER_URL.format(lat=lat, long=long, units=units, api_key=api_key)
-        response = requests.get(url)
+        response = self.session.get(url)
         if not 200 <= response.status_code < 300:
             logging.error(f"Failed to retrieve weather data: {response.content}")
             raise RuntimeError("Wetterdaten konnten nicht abgerufen werden.")
@@ -687,7 +792,7 @@ class Weather(BasePlugin):
 
     def get_air_quality(self, api_key, lat, long):
         url = AIR_QUALITY_URL.format(lat=lat, long=long, api_key=api_key)
-        response = requests.get(url)
+        response = self.session.get(url)
 
         if not 200 <= response.status_code < 300:
             logging.error(f"Failed to get air quality data: {response.content}")
@@ -696,22 +801,38 @@ class Weather(BasePlugin):
         return response.json()
 
     def get_location(self, api_key, lat, long):
-        url = GEOCODING_URL.format(lat=lat, long=long, api_key=api_key)
-        response = requests.get(url)
+        """Returns the location name for the coordinates, using the persistent geocoding cache when possible.
 
-        if not 200 <= response.status_code < 300:
-            logging.error(f"Failed to get location: {response.content}")
+        Entries are stored without expiry and checked against GEOCODING_CACHE_TTL here, so an outdated
+        name is still around as a fallback when the geocoding API cannot be reached.
+        """
+        cache = get_cache(GEOCODING_CACHE_NAME)
+        key = make_key(round(lat, GEOCODING_PRECISION), round(long, GEOCODING_PRECISION))
+        entry = cache.get_entry(key)
+        if entry and time.time() - entry["stored"] < GEOCODING_CACHE_TTL:
+            return entry["value"]
+
+        url = GEOCODING_URL.format(lat=lat, long=long, api_key=api_key)
+        try:
+            response = self.session.get(url)
+            response.raise_for_status()
+            location_data = response.json()[0]
+        except Exception as e:
+            logging.error(f"Failed to get location: {e}")
+            if entry:
+                logger.warning("Verwende zwischengespeicherten Standortnamen.")
+                return entry["value"]
             raise RuntimeError("Standort konnte nicht abgerufen werden.")
 
-        location_data = response.json()[0]
         location_str = f"{location_data.get('name')}, {location_data.get('state', location_data.get('country'))}"
+        cache.set(key, location_str)
 
         return location_str
 
     def get_open_meteo_data(self, lat, long, units, forecast_days):
         unit_params = OPEN_METEO_UNIT_PARAMS[units]
         url = OPEN_METEO_FORECAST_URL.format(lat=lat, long=long, forecast_days=forecast_days) + f"&{unit_params}"
-        response = requests.get(url)
+        response = self.session.get(url)
         
         if not 200 <= response.status_code < 300:
             logging.error(f"Failed to retrieve Open-Meteo weather data: {response.content}")
@@ -721,7 +842,7 @@ class Weather(BasePlugin):
 
     def get_open_meteo_air_quality(self, lat, long):
         url = OPEN_METEO_AIR_QUALITY_URL.format(lat=lat, long=long)
-        response = requests.get(url)
+        response = self.session.get(url)
         if not 200 <= response.status_code < 300:
             logging.error(f"Failed to retrieve Open-Meteo air quality data: {response.content}")
             raise RuntimeError("Open-Meteo-Luftqualitätsdaten konnten nicht abgerufen werden.")
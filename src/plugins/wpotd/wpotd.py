@@ -8,7 +8,7 @@ It supports optional manual date selection or random dates and can resize the im
 Wikipedia API Documentation: https://www.mediawiki.org/wiki/API:Main_page
 Picture of the Day example: https://www.mediawiki.org/wiki/API:Picture_of_the_day_viewer
 Github Repository: https://github.com/wikimedia/mediawiki-api-demos/tree/master/apps/picture-of-the-day-viewer
-Wikimedia requires a User Agent header for API requests, which is set in the SESSION headers:
+Wikimedia requires a User Agent header for API requests, which is set in the HEADERS passed with every request:
 https://foundation.wikimedia.org/wiki/Policy:Wikimedia_Foundation_User-Agent_Policy
 
 Flow:
@@ -19,22 +19,34 @@ Flow:
 4. Make another API request to get the image URL. (_fetch_image_src)
 5. Download the image from the URL. (_download_image)
 6. Optionally resize the image to fit the device dimensions. (_shrink_to_fit))
+
+POTD data and the downloaded images (downscaled to the display) are cached by date, as the picture of a past
+date never changes. In random mode, the POTDs of several random dates are looked up with one batched request.
 """
 
 from plugins.base_plugin.base_plugin import BasePlugin
+from utils.cache_utils import get_cache, make_key
+from utils.image_store import get_image_store
+from utils.image_utils import shrink_to_cover
+from utils.prefetch_queue import get_prefetch_queue
 from PIL import Image, UnidentifiedImageError
 from io import BytesIO
-import requests
 import logging
 from random import randint
 from datetime import datetime, timedelta, date
 from functools import lru_cache
-from typing import Dict, Any
+from typing import Dict, Any, List
 
 logger = logging.getLogger(__name__)
 
+# POTD metadata and downscaled images by date, a past picture of the day never changes
+WPOTD_CACHE_NAME = "wpotd"
+WPOTD_CACHE_MAX_ENTRIES = 1000
+# random mode looks up this many random dates with one batched request
+RANDOM_POOL_KEY = "random_pool"
+RANDOM_BATCH_SIZE = 10
+
 class Wpotd(BasePlugin):
-    SESSION = requests.Session()
     HEADERS = {'User-Agent': 'InkyPi/0.0 (https://github.com/fatihak/InkyPi/)'}
     API_URL = "https://en.wikipedia.org/w/api.php"
 
@@ -45,21 +57,45 @@ class Wpotd(BasePlugin):
 
     def generate_image(self, settings: Dict[str, Any], device_config: Dict[str, Any]) -> Image.Image:
         logger.info(f"WPOTD plugin settings: {settings}")
-        datetofetch = self._determine_date(settings)
-        logger.info(f"WPOTD plugin datetofetch: {datetofetch}")
+        dimensions = device_config.get_resolution()
+        if device_config.get_config("orientation") == "vertical":
+            dimensions = dimensions[::-1]
+        shrink_to_fit = settings.get("shrinkToFitWpotd") == "true"
+
+        if settings.get("randomizeWpotd") == "true":
+            def fetch_random_image():
+                return self._fetch_image(self._next_random_date(dimensions), dimensions, shrink_to_fit)
 
-        data = self._fetch_potd(datetofetch)
-        picurl = data["image_src"]
-        logger.info(f"WPOTD plugin Picture URL: {picurl}")
+            # serve the image prepared in the background after the previous refresh, if there is one
+            queue = get_prefetch_queue(self.get_plugin_id(), "random", shrink_to_fit, dimensions)
+            image = queue.pop()
+            if image is None:
+                image = fetch_random_image()
+            queue.refill(fetch_random_image)
+            return image
 
-        image = self._download_image(picurl)
+        return self._fetch_image(self._determine_date(settings), dimensions, shrink_to_fit)
+
+    def _fetch_image(self, datetofetch: date, dimensions, shrink_to_fit: bool) -> Image.Image:
+        logger.info(f"WPOTD plugin datetofetch: {datetofetch}")
+
+        # the picture of a date never changes, so it is downloaded once per date and display size
+        store = get_image_store(WPOTD_CACHE_NAME)
+        key = make_key(datetofetch.isoformat(), *dimensions)
+        image = store.get(key)
         if image is None:
-            logger.error("Failed to download WPOTD image.")
-            raise RuntimeError("Failed to download WPOTD image.")
-        if settings.get("shrinkToFitWpotd") == "true":
-            dimensions = device_config.get_resolution()
-            if device_config.get_config("orientation") == "vertical":
-                dimensions = dimensions[::-1]
+            data = self._fetch_potd(datetofetch, dimensions)
+            picurl = data["image_src"]
+            logger.info(f"WPOTD plugin Picture URL: {picurl}")
+
+            image = self._download_image(picurl)
+            if image is None:
+                logger.error("Failed to download WPOTD image.")
+                raise RuntimeError("Failed to download WPOTD image.")
+            image = shrink_to_cover(image, dimensions)
+            store.put(key, image)
+
+        if shrink_to_fit:
             max_width, max_height = dimensions
             image = self._shrink_to_fit(image, max_width, max_height)
             logger.info(f"Image resized to fit device dimensions: {max_width},{max_height}")
@@ -68,21 +104,39 @@ class Wpotd(BasePlugin):
 
     def _determine_date(self, settings: Dict[str, Any]) -> date:
         if settings.get("randomizeWpotd") == "true":
-            start = datetime(2015, 1, 1)
-            delta_days = (datetime.today() - start).days
-            return (start + timedelta(days=randint(0, delta_days))).date()
+            return self._random_date()
         elif settings.get("customDate"):
             return datetime.strptime(settings["customDate"], "%Y-%m-%d").date()
         else:
             return datetime.today().date()
 
+    def _random_date(self) -> date:
+        start = datetime(2015, 1, 1)
+        delta_days = (datetime.today() - start).days
+        return (start + timedelta(days=randint(0, delta_days))).date()
+
+    def _next_random_date(self, dimensions) -> date:
+        """Returns a random date from a pool whose POTDs were looked up together with two batched API requests."""
+        cache = get_cache(WPOTD_CACHE_NAME, max_entries=WPOTD_CACHE_MAX_ENTRIES)
+        pool_key = make_key(RANDOM_POOL_KEY, self._thumb_width(dimensions))
+        with cache.lock:
+            pool = cache.get(pool_key) or []
+            if not pool:
+                dates = sorted({self._random_date() for _ in range(RANDOM_BATCH_SIZE)})
+                pool = [cur_date.isoformat() for cur_date in self._fetch_potds(dates, dimensions)]
+                if not pool:
+                    raise RuntimeError("Failed to retrieve POTD filename.")
+            cur_date = pool.pop()
+            cache.set(pool_key, pool)
+        return date.fromisoformat(cur_date)
+
     def _download_image(self, url: str) -> Image.Image:
         try:
             if url.lower().endswith(".svg"):
                 logger.warning("SVG format is not supported by Pillow. Skipping image download.")
                 raise RuntimeError("Unsupported image format: SVG.")
 
-            response = self.SESSION.get(url, headers=self.HEADERS, timeout=10)
+            response = self.session.get(url, headers=self.HEADERS, timeout=10)
             response.raise_for_status()
             return Image.open(BytesIO(response.content))
         except UnidentifiedImageError as e:
@@ -92,51 +146,98 @@ class Wpotd(BasePlugin):
             logger.error(f"Failed to load WPOTD image from {url}: {str(e)}")
             raise RuntimeError("Failed to load WPOTD image.")
 
-    def _fetch_potd(self, cur_date: date) -> Dict[str, Any]:
-        title = f"Template:POTD/{cur_date.isoformat()}"
+    def _fetch_potd(self, cur_date: date, dimensions) -> Dict[str, Any]:
+        data = self._fetch_potds([cur_date], dimensions).get(cur_date)
+        if data is None:
+            logger.error(f"Failed to retrieve POTD for {cur_date}")
+            raise RuntimeError("Failed to retrieve POTD filename.")
+        return data
+
+    def _fetch_potds(self, dates: List[date], dimensions) -> Dict[date, Dict[str, Any]]:
+        """Returns the POTD data of the dates, cached by date and querying all uncached dates at once."""
+        cache = get_cache(WPOTD_CACHE_NAME, max_entries=WPOTD_CACHE_MAX_ENTRIES)
+        width = self._thumb_width(dimensions)
+        potds = {}
+        missing = {}
+        for cur_date in dates:
+            data = cache.get(make_key(cur_date.isoformat(), width))
+            if data:
+                potds[cur_date] = data
+            else:
+                missing[f"Template:POTD/{cur_date.isoformat()}"] = cur_date
+
+        if not missing:
+            return potds
+
         params = {
             "action": "query",
             "format": "json",
             "formatversion": "2",
             "prop": "images",
-            "titles": title
+            "imlimit": "max",
+            "titles": "|".join(missing)
         }
 
         data = self._make_request(params)
+        filenames = {}
         try:
-            filename = data["query"]["pages"][0]["images"][0]["title"]
-        except (KeyError, IndexError) as e:
-            logger.error(f"Failed to retrieve POTD filename for {cur_date}: {e}")
+            for page in data["query"]["pages"]:
+                cur_date = missing.get(page["title"])
+                if cur_date and page.get("images"):
+                    filenames[cur_date] = page["images"][0]["title"]
+        except (KeyError, TypeError) as e:
+            logger.error(f"Failed to retrieve POTD filenames for {list(missing.values())}: {e}")
             raise RuntimeError("Failed to retrieve POTD filename.")
 
-        image_src = self._fetch_image_src(filename)
+        image_srcs = self._fetch_image_src(sorted(set(filenames.values())), width) if filenames else {}
 
-        return {
-            "filename": filename,
-            "image_src": image_src,
-            "image_page_url": f"https://en.wikipedia.org/wiki/{title}",
-            "date": cur_date
-        }
+        fetched = {}
+        for cur_date, filename in filenames.items():
+            if filename not in image_srcs:
+                continue
+            title = f"Template:POTD/{cur_date.isoformat()}"
+            potds[cur_date] = {
+                "filename": filename,
+                "image_src": image_srcs[filename],
+                "image_page_url": f"https://en.wikipedia.org/wiki/{title}",
+                "date": cur_date.isoformat()
+            }
+            fetched[make_key(cur_date.isoformat(), width)] = potds[cur_date]
+        if fetched:
+            cache.set_many(fetched)
 
-    def _fetch_image_src(self, filename: str) -> str:
+        return potds
+
+    def _fetch_image_src(self, filenames: List[str], width: int) -> Dict[str, str]:
+        """Returns the URLs of thumbnails width pixels wide (or of the original if smaller) for the filenames."""
         params = {
             "action": "query",
             "format": "json",
             "prop": "imageinfo",
             "iiprop": "url",
-            "titles": filename
+            "iiurlwidth": width,
+            "titles": "|".join(filenames)
         }
         data = self._make_request(params)
         try:
-            page = next(iter(data["query"]["pages"].values()))
-            return page["imageinfo"][0]["url"]
-        except (KeyError, IndexError, StopIteration) as e:
-            logger.error(f"Failed to retrieve image URL for {filename}: {e}")
+            normalized = {n["to"]: n["from"] for n in data["query"].get("normalized", [])}
+            image_srcs = {}
+            for page in data["query"]["pages"].values():
+                if page.get("imageinfo"):
+                    info = page["imageinfo"][0]
+                    image_srcs[normalized.get(page["title"], page["title"])] = info.get("thumburl") or info["url"]
+            return image_srcs
+        except (KeyError, IndexError, AttributeError) as e:
+            logger.error(f"Failed to retrieve image URLs for {filenames}: {e}")
             raise RuntimeError("Failed to retrieve image URL.")
 
+    def _thumb_width(self, dimensions) -> int:
+        # twice the longer display edge still covers the display with images up to ~3:1 (e.g. panoramas)
+        return 2 * max(dimensions)
+
     def _make_request(self, params: Dict[str, Any]) -> Dict[str, Any]:
         try:
-            response = self.SESSION.get(self.API_URL, params=params, headers=self.HEADERS, timeout=10)
+            response = self.session.get(self.API_URL, params=params, headers=self.HEADERS, timeout=10)
             response.raise_for_status()
             return response.json()
         except Exception as e:
@@ -4,9 +4,10 @@ import os
 import logging
 import psutil
 import pytz
-from datetime import datetime, timezone
+from datetime import datetime, timezone, timedelta
 from plugins.plugin_registry import get_plugin_instance
 from utils.image_utils import compute_image_hash
+from utils.http_utils import get_http_stats
 from model import RefreshInfo, PlaylistManager
 from PIL import Image
 
@@ -111,6 +112,8 @@ class RefreshTask:
                             logger.error(f"Plugin config not found for '{refresh_action.get_plugin_id()}'.")
                             continue
                         plugin = get_plugin_instance(plugin_config)
+                        if isinstance(refresh_action, PlaylistRefresh):
+                            self._prefetch_upcoming(plugin, refresh_action.playlist, current_dt)
                         image = refresh_action.execute(plugin, self.device_config, current_dt)
                         image_hash = compute_image_hash(image)
 
@@ -187,6 +190,24 @@ class RefreshTask:
 
         return playlist, plugin
     
+    def _prefetch_upcoming(self, plugin, playlist, current_dt):
+        """Lets the plugin batch requests for its instances that are due within the current playlist cycle."""
+        plugin_cycle_interval = self.device_config.get_config("plugin_cycle_interval_seconds", default=3600)
+        upcoming = []
+        for turn, plugin_instance in enumerate(playlist.get_upcoming_plugins()):
+            if plugin_instance.plugin_id != plugin.get_plugin_id():
+                continue
+            seconds_until_display = turn * plugin_cycle_interval
+            if plugin_instance.should_refresh(current_dt + timedelta(seconds=seconds_until_display)):
+                upcoming.append((plugin_instance.settings, seconds_until_display))
+
+        if not upcoming:
+            return
+        try:
+            plugin.prefetch(upcoming, self.device_config)
+        except Exception:
+            logger.exception(f"Prefetch failed, continuing with the refresh. | plugin_id: {plugin.get_plugin_id()}")
+
     def log_system_stats(self):
         metrics = {
             'cpu_percent': psutil.cpu_percent(interval=1),
@@ -197,7 +218,8 @@ class RefreshTask:
             'net_io': {
                 'bytes_sent': psutil.net_io_counters().bytes_sent,
                 'bytes_recv': psutil.net_io_counters().bytes_recv
-            }
+            },
+            'http': get_http_stats()
         }
 
         logger.info(f"System Stats: {metrics}")
@@ -3,11 +3,18 @@ import os
 import socket
 import subprocess
 
+from functools import lru_cache
+from io import BytesIO
 from pathlib import Path
 from PIL import Image, ImageDraw, ImageFont, ImageOps
 
 logger = logging.getLogger(__name__)
 
+# loaded faces by file and size, plugins like clock and comic request the same fonts on every refresh
+FONT_CACHE_SIZE = 64
+# text measurements remembered per face
+FONT_METRICS_CACHE_SIZE = 4096
+
 FONT_FAMILIES = {
     "Dogica": [{
         "font-weight": "normal",
@@ -49,6 +56,12 @@ def resolve_path(file_path):
     src_path = Path(src_dir)
     return str(src_path / file_path)
 
+def get_cache_dir(name):
+    """Returns the persistent cache directory for the given name, creating it if needed."""
+    cache_dir = resolve_path(os.path.join("cache", name))
+    os.makedirs(cache_dir, exist_ok=True)
+    return cache_dir
+
 def get_ip_address():
     with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as s:
         s.connect(("8.8.8.8", 80))
@@ -72,6 +85,12 @@ def is_connected():
         return False
 
 def get_font(font_name, font_size=50, font_weight="normal"):
+    """Returns the font of the family in the given size and weight, or None if the family is unknown.
+
+    Fonts are cached, so every caller asking for the same family, weight and size gets the same
+    instance. They must not be mutated (e.g. with set_variation_by_name or set_variation_by_axes),
+    use font_variant for a private copy instead.
+    """
     if font_name in FONT_FAMILIES:
         font_variants = FONT_FAMILIES[font_name]
 
@@ -81,7 +100,7 @@ def get_font(font_name, font_size=50, font_weight="normal"):
 
         if font_entry:
             font_path = resolve_path(os.path.join("static", "fonts", font_entry["file"]))
-            return ImageFont.truetype(font_path, font_size)
+            return _load_font(font_path, font_size)
         else:
             logger.warn(f"Requested font weight not found: font_name={font_name}, font_weight={font_weight}")
     else:
@@ -89,6 +108,51 @@ def get_font(font_name, font_size=50, font_weight="normal"):
 
     return None
 
+class CachedFont(ImageFont.FreeTypeFont):
+    """A FreeType font that remembers the bounding boxes and lengths of the texts it measured.
+
+    Instances are shared by all callers of get_font, so repeated getbbox/getlength queries (also made
+    by ImageDraw.textbbox and multiline text) are answered without asking FreeType again. Changing
+    the font, e.g. its variation axes, would leave the remembered metrics and the other callers behind,
+    so instances are treated as read-only.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._metrics = {}
+
+    def getbbox(self, text, *args, **kwargs):
+        return self._measure(super().getbbox, "bbox", text, args, kwargs)
+
+    def getlength(self, text, *args, **kwargs):
+        return self._measure(super().getlength, "length", text, args, kwargs)
+
+    def _measure(self, measure, kind, text, args, kwargs):
+        try:
+            key = (kind, text, args, tuple(sorted(kwargs.items())))
+            return self._metrics[key]
+        except KeyError:
+            pass
+        except TypeError:
+            # unhashable arguments, e.g. a list of OpenType features
+            return measure(text, *args, **kwargs)
+
+        value = measure(text, *args, **kwargs)
+        if len(self._metrics) >= FONT_METRICS_CACHE_SIZE:
+            self._metrics.clear()
+        self._metrics[key] = value
+        return value
+
+@lru_cache(maxsize=None)
+def _read_font_file(font_path):
+    # all sizes of a font share one in-memory copy of the file
+    with open(font_path, "rb") as f:
+        return f.read()
+
+@lru_cache(maxsize=FONT_CACHE_SIZE)
+def _load_font(font_path, font_size):
+    return CachedFont(BytesIO(_read_font_file(font_path)), font_size)
+
 def get_fonts():
     fonts_list = []
     for font_family, variants in FONT_FAMILIES.items():
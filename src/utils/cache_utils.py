@@ -0,0 +1,141 @@
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+
+from utils.app_utils import get_cache_dir
+
+logger = logging.getLogger(__name__)
+
+DATA_CACHE_DIR = "data"
+
+_caches = {}
+_caches_lock = threading.Lock()
+
+
+class PersistentCache:
+    """A small key/value store with per-entry expiry, persisted as a single JSON file.
+
+    Instances are shared process-wide through `get_cache`, so every plugin instance using the same
+    cache name sees the same entries. Values must be JSON serializable.
+
+    Attributes:
+        name (str): Name of the cache, used as the file name under src/cache/data.
+        default_ttl (int): Default time to live in seconds, None to keep entries until replaced.
+        max_entries (int): Maximum number of entries kept, the oldest are dropped first.
+    """
+
+    def __init__(self, name, default_ttl=None, max_entries=500):
+        self.name = name
+        self.default_ttl = default_ttl
+        self.max_entries = max_entries
+        self.path = os.path.join(get_cache_dir(DATA_CACHE_DIR), f"{name}.json")
+        self.lock = threading.RLock()
+        self.entries = self._read()
+
+    def get(self, key, default=None):
+        """Returns the value stored for key, or default if missing or expired."""
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None or self._is_expired(entry):
+                return default
+            return entry["value"]
+
+    def get_entry(self, key):
+        """Returns the raw entry dict (value, stored, expires) for key, including expired entries."""
+        with self.lock:
+            return self.entries.get(key)
+
+    def set(self, key, value, ttl=None):
+        """Stores value for key, expiring after ttl seconds (falls back to default_ttl)."""
+        self.set_many({key: value}, ttl)
+
+    def set_many(self, items, ttl=None):
+        """Stores every key/value pair of the items dict with a single write of the cache file."""
+        ttl = self.default_ttl if ttl is None else ttl
+        now = time.time()
+        with self.lock:
+            for key, value in items.items():
+                self.entries.pop(key, None)
+                self.entries[key] = {
+                    "value": value,
+                    "stored": now,
+                    "expires": now + ttl if ttl is not None else None
+                }
+            self._evict()
+            self._write()
+
+    def get_or_fetch(self, key, fetch, ttl=None):
+        """Returns the cached value for key, calling fetch() and storing its result on a miss."""
+        value = self.get(key)
+        if value is None:
+            value = fetch()
+            if value is not None:
+                self.set(key, value, ttl)
+        else:
+            logger.debug(f"Cache hit | cache: {self.name} | key: {key}")
+        return value
+
+    def delete(self, key):
+        with self.lock:
+            if self.entries.pop(key, None) is not None:
+                self._write()
+
+    def clear(self):
+        with self.lock:
+            self.entries = {}
+            self._write()
+
+    def _is_expired(self, entry):
+        return entry.get("expires") is not None and time.time() >= entry["expires"]
+
+    def _evict(self):
+        # drop expired entries first, then the oldest ones (dicts keep insertion order)
+        for key in [k for k, e in self.entries.items() if self._is_expired(e)]:
+            del self.entries[key]
+        while self.max_entries and len(self.entries) > self.max_entries:
+            del self.entries[next(iter(self.entries))]
+
+    def _read(self):
+        if not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path) as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Discarding unreadable cache file {self.path}: {e}")
+            return {}
+
+    def _write(self):
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(self.path), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(self.entries, f)
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            logger.error(f"Failed to write cache file {self.path}: {e}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+
+def get_cache(name, default_ttl=None, max_entries=500):
+    """Returns the process-wide PersistentCache with the given name, creating it on first use.
+
+    The limits are set by the first call for a name, so every caller should pass the same ones.
+    """
+    with _caches_lock:
+        cache = _caches.get(name)
+        if cache is None:
+            cache = PersistentCache(name, default_ttl=default_ttl, max_entries=max_entries)
+            _caches[name] = cache
+        elif (cache.default_ttl, cache.max_entries) != (default_ttl, max_entries):
+            logger.warning(f"Cache {name} already exists with default_ttl={cache.default_ttl}, "
+                           f"max_entries={cache.max_entries}, ignoring default_ttl={default_ttl}, max_entries={max_entries}")
+        return cache
+
+
+def make_key(*parts):
+    """Builds a cache key from the given parts."""
+    return "|".join(str(part) for part in parts)
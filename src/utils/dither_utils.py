@@ -0,0 +1,255 @@
+import logging
+import time
+from functools import lru_cache
+
+import numpy as np
+from PIL import Image
+
+logger = logging.getLogger(__name__)
+
+COLORS = {
+    "black": (0, 0, 0),
+    "white": (255, 255, 255),
+    "red": (255, 0, 0),
+    "yellow": (255, 255, 0),
+    "green": (0, 255, 0),
+    "blue": (0, 0, 255),
+    "orange": (255, 128, 0),
+}
+
+# ink colors of the supported panels, in the order of the color indices used by their drivers
+PANEL_PALETTES = {
+    "bw": ("black", "white"),
+    "bwr": ("black", "white", "red"),
+    "bwy": ("black", "white", "yellow"),
+    "spectra6": ("black", "white", "yellow", "red", "blue", "green"),
+    "acep7": ("black", "white", "green", "blue", "red", "yellow", "orange"),
+}
+
+DITHER_METHODS = ["floyd-steinberg", "atkinson", "bayer", "blue-noise", "none"]
+DEFAULT_DITHER_METHOD = "floyd-steinberg"
+
+# the palette lookup table maps every color, reduced to LUT_BITS per channel, to the nearest ink
+LUT_BITS = 6
+PALETTE_LUT_CACHE_SIZE = 8
+
+# Atkinson spreads 6/8 of the error as (dy, dx, weight), the rest is dropped for more contrast
+ATKINSON_KERNEL = ((0, 1, 1 / 8), (0, 2, 1 / 8), (1, -1, 1 / 8), (1, 0, 1 / 8), (1, 1, 1 / 8), (2, 0, 1 / 8))
+
+BAYER_SIZE = 8
+BLUE_NOISE_SIZE = 64
+BLUE_NOISE_SIGMA = 1.5
+# ordered dithering shifts each pixel by up to half of this before picking the nearest ink
+ORDERED_SPREAD = 255
+
+
+def palette_colors(names):
+    """Returns the RGB colors of the named inks as a tuple, usable as a palette for dither."""
+    return tuple(COLORS[name] for name in names)
+
+
+@lru_cache(maxsize=PALETTE_LUT_CACHE_SIZE)
+def palette_lut(palette):
+    """Returns the index of the nearest palette color for every color, reduced to LUT_BITS per channel.
+
+    The table is built once per palette, i.e. once per panel, and makes matching an image against
+    the palette a single gather.
+    """
+    levels = 1 << LUT_BITS
+    step = 256 // levels
+    centers = np.arange(levels, dtype=np.int32) * step + step // 2
+    grid = np.stack(np.meshgrid(centers, centers, centers, indexing="ij"), axis=-1).reshape(-1, 1, 3)
+    distances = ((grid - np.asarray(palette, dtype=np.int32)[None]) ** 2).sum(axis=2)
+    return distances.argmin(axis=1).astype(np.uint8)
+
+
+def nearest_indices(pixels, palette):
+    """Returns the palette index nearest to every pixel of an (h, w, 3) array, through palette_lut."""
+    shift = 8 - LUT_BITS
+    reduced = np.clip(pixels, 0, 255).astype(np.uint32) >> shift
+    keys = (reduced[..., 0] << (2 * LUT_BITS)) | (reduced[..., 1] << LUT_BITS) | reduced[..., 2]
+    return palette_lut(palette)[keys]
+
+
+@lru_cache(maxsize=1)
+def bayer_map(size=BAYER_SIZE):
+    """Returns the size×size Bayer threshold map with values in (0, 1)."""
+    matrix = np.zeros((1, 1), dtype=np.int32)
+    while matrix.shape[0] < size:
+        matrix = np.block([[4 * matrix, 4 * matrix + 2], [4 * matrix + 3, 4 * matrix + 1]])
+    return (matrix + 0.5) / matrix.size
+
+
+@lru_cache(maxsize=1)
+def blue_noise_map(size=BLUE_NOISE_SIZE, sigma=BLUE_NOISE_SIGMA):
+    """Returns a size×size blue noise threshold map with values in (0, 1), made with void-and-cluster.
+
+    A sparse random pattern is relaxed by moving the point of the tightest cluster into the largest
+    void, measured with a Gaussian energy on a torus so the map tiles seamlessly. Its points are
+    ranked by removing the tightest clusters, and the remaining ranks go to the largest voids one
+    after the other. The map is built once, in well under a second.
+    """
+    distances = np.minimum(np.arange(size), size - np.arange(size))
+    kernel = np.exp(-(distances[:, None] ** 2 + distances[None, :] ** 2) / (2 * sigma ** 2))
+
+    def splat(energy, position, sign):
+        energy += sign * np.roll(kernel, position, axis=(0, 1))
+
+    def tightest_cluster(energy, pattern):
+        return np.unravel_index(np.argmax(np.where(pattern, energy, -np.inf)), pattern.shape)
+
+    def largest_void(energy, pattern):
+        return np.unravel_index(np.argmin(np.where(pattern, np.inf, energy)), pattern.shape)
+
+    pattern = np.zeros((size, size), dtype=bool)
+    pattern.flat[np.random.default_rng(0).choice(size * size, size * size // 10, replace=False)] = True
+    energy = np.zeros((size, size))
+    for position in zip(*np.nonzero(pattern)):
+        splat(energy, position, 1)
+    while True:
+        cluster = tightest_cluster(energy, pattern)
+        pattern[cluster] = False
+        splat(energy, cluster, -1)
+        void = largest_void(energy, pattern)
+        pattern[void] = True
+        splat(energy, void, 1)
+        if void == cluster:
+            break
+
+    ranks = np.zeros((size, size))
+    initial_pattern, initial_energy = pattern.copy(), energy.copy()
+    for rank in range(np.count_nonzero(pattern) - 1, -1, -1):
+        cluster = tightest_cluster(energy, pattern)
+        ranks[cluster] = rank
+        pattern[cluster] = False
+        splat(energy, cluster, -1)
+
+    pattern, energy = initial_pattern, initial_energy
+    for rank in range(np.count_nonzero(pattern), size * size):
+        void = largest_void(energy, pattern)
+        ranks[void] = rank
+        pattern[void] = True
+        splat(energy, void, 1)
+    return (ranks + 0.5) / ranks.size
+
+
+def ordered_dither(pixels, palette, threshold_map):
+    h, w, _ = pixels.shape
+    size = threshold_map.shape[0]
+    thresholds = np.tile(threshold_map, (-(-h // size), -(-w // size)))[:h, :w]
+    offsets = ((thresholds - 0.5) * ORDERED_SPREAD).astype(np.float32)
+    return nearest_indices(pixels + offsets[..., None], palette)
+
+
+def error_diffusion_dither(pixels, palette, kernel):
+    """Diffuses the quantization error with the kernel, a wavefront of pixels at a time.
+
+    A pixel only depends on the pixels left of it and on the rows above up to one column to the
+    right, so all pixels with the same 2·y + x can be quantized together. That turns the loop over
+    every pixel into 2·h + w vectorized steps. Each pixel pulls the error of its already quantized
+    neighbors, so the steps need no scattered (and possibly colliding) writes.
+    """
+    h, w, _ = pixels.shape
+    pad_y = max(dy for dy, _, _ in kernel)
+    pad_x = max(abs(dx) for _, dx, _ in kernel)
+    stride = w + 2 * pad_x
+    # errors of the quantized pixels, with a zero border for the neighbors outside of the image
+    errors = np.zeros(((h + pad_y) * stride, 3), dtype=np.float32)
+    sources = np.array([dy * stride + dx for dy, dx, _ in kernel])
+    weights = np.array([weight for _, _, weight in kernel], dtype=np.float32)
+    pixels = pixels.reshape(-1, 3)
+    colors = np.asarray(palette, dtype=np.float32)
+    # |p - c|² = |p|² - 2·p·c + |c|², where |p|² is the same for all colors
+    color_norms = (colors ** 2).sum(axis=1)
+    indices = np.empty(h * w, dtype=np.uint8)
+
+    for wave in range(2 * (h - 1) + w):
+        y = np.arange(max(0, (wave - w + 2) // 2), min(h - 1, wave // 2) + 1)
+        x = wave - 2 * y
+        positions = (y + pad_y) * stride + x + pad_x
+        pixel = y * w + x
+        diffused = np.einsum("k,nkc->nc", weights, errors[positions[:, None] - sources])
+        values = np.clip(pixels[pixel] + diffused, 0, 255)
+        nearest = (color_norms - 2 * values @ colors.T).argmin(axis=1)
+        indices[pixel] = nearest
+        errors[positions] = values - colors[nearest]
+    return indices.reshape(h, w)
+
+
+def floyd_steinberg_dither(image, palette):
+    # Pillow's quantizer diffuses the error with Floyd-Steinberg in C
+    palette_image = Image.new("P", (1, 1))
+    palette_image.putpalette([channel for color in palette for channel in color])
+    return np.asarray(image.quantize(palette=palette_image, dither=Image.Dither.FLOYDSTEINBERG), dtype=np.uint8)
+
+
+def dither(image, palette, method=DEFAULT_DITHER_METHOD):
+    """Reduces the image to the colors of the palette.
+
+    Args:
+        image: The image to reduce, converted to RGB if needed.
+        palette: A tuple of RGB colors, see palette_colors.
+        method: One of DITHER_METHODS, anything else falls back to the default method.
+
+    Returns:
+        An (h, w) uint8 array with the palette index of every pixel.
+    """
+    if method not in DITHER_METHODS:
+        logger.warning(f"Unknown dithering method: {method}, using {DEFAULT_DITHER_METHOD}")
+        method = DEFAULT_DITHER_METHOD
+
+    started = time.perf_counter()
+    image = image.convert("RGB")
+    if method == "floyd-steinberg":
+        indices = floyd_steinberg_dither(image, palette)
+    else:
+        pixels = np.asarray(image, dtype=np.float32)
+        if method == "atkinson":
+            indices = error_diffusion_dither(pixels, palette, ATKINSON_KERNEL)
+        elif method == "bayer":
+            indices = ordered_dither(pixels, palette, bayer_map())
+        elif method == "blue-noise":
+            indices = ordered_dither(pixels, palette, blue_noise_map())
+        else:
+            indices = nearest_indices(pixels, palette)
+
+    logger.debug(f"Dithered {image.size[0]}x{image.size[1]} image | method: {method} | colors: {len(palette)} | "
+                 f"{(time.perf_counter() - started) * 1000:.1f} ms")
+    return indices
+
+
+def pack_plane(indices, index):
+    """Packs the pixels of one ink into a 1 bit plane, 0 where the pixel has the ink and 1 elsewhere.
+
+    Rows are padded to whole bytes with the most significant bit first, the raw layout of a
+    mode "1" image and of the e-paper display buffers.
+    """
+    return np.packbits(indices != index, axis=1).tobytes()
+
+
+def plane_image(indices, index):
+    """Returns the plane of one ink (see pack_plane) as a mode "1" image."""
+    h, w = indices.shape
+    return Image.frombytes("1", (w, h), pack_plane(indices, index))
+
+
+def indexed_image(indices, palette, index_map=None):
+    """Returns the dithered pixels as a mode "P" image.
+
+    Args:
+        indices: Palette indices as returned by dither.
+        palette: The palette the indices refer to.
+        index_map: Optional target index per palette index, for drivers with their own color numbering.
+    """
+    if index_map is not None:
+        indices = np.asarray(index_map, dtype=np.uint8)[indices]
+        slots = max(index_map) + 1
+        colors = [(0, 0, 0)] * slots
+        for target, color in zip(index_map, palette):
+            colors[target] = color
+    else:
+        colors = palette
+    h, w = indices.shape
+    image = Image.frombytes("P", (w, h), np.ascontiguousarray(indices).tobytes())
+    image.putpalette([channel for color in colors for channel in color])
+    return image
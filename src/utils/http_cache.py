@@ -0,0 +1,235 @@
+import hashlib
+import json
+import logging
+import os
+import re
+import tempfile
+import threading
+import time
+from email.utils import parsedate_to_datetime
+
+import requests
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+from utils.app_utils import get_cache_dir
+from utils.http_utils import get_http_session
+
+logger = logging.getLogger(__name__)
+
+HTTP_CACHE_DIR = "http"
+
+# upper bound for the on-disk cache, least recently used entries are evicted first
+MAX_CACHE_BYTES = 200 * 1024 * 1024
+
+MAX_AGE_PATTERN = re.compile(r"max-age\s*=\s*(\d+)")
+
+_lock = threading.Lock()
+
+
+def cached_get(url, params=None, headers=None, min_ttl=0, cache_key=None, **kwargs):
+    """GET a url through the on-disk conditional-GET cache.
+
+    Fresh entries (within Cache-Control max-age, Expires or the caller supplied min_ttl) are served
+    without touching the network. Stale entries are revalidated with If-None-Match/If-Modified-Since,
+    so an unchanged resource only costs a 304 round trip. Non-2xx responses are returned uncached.
+
+    Args:
+        url: The url to fetch.
+        params: Optional query parameters, part of the cache key.
+        headers: Optional request headers.
+        min_ttl: Minimum number of seconds a response is considered fresh, regardless of server headers.
+        cache_key: Optional key overriding the default derived from the url and params.
+        **kwargs: Passed through to the shared HTTP session.
+
+    Returns:
+        A requests.Response, with `from_cache` set to True when the body was served from disk.
+    """
+    if cache_key is None:
+        cache_key = requests.Request("GET", url, params=params).prepare().url
+    meta_path, body_path = _entry_paths(cache_key)
+    meta = _load_meta(meta_path, body_path)
+    # read the body right away, _prune in another thread may remove it at any time
+    body = _read_body(body_path) if meta else None
+    if body is None:
+        meta = None
+
+    now = time.time()
+    if meta and now < meta["expires"]:
+        logger.debug(f"HTTP cache hit | url: {url}")
+        _touch(body_path)
+        return _build_response(meta, body)
+
+    request_headers = dict(headers or {})
+    if meta:
+        if meta.get("etag"):
+            request_headers["If-None-Match"] = meta["etag"]
+        if meta.get("last_modified"):
+            request_headers["If-Modified-Since"] = meta["last_modified"]
+
+    kwargs.pop("stream", None)
+    response = get_http_session().get(url, params=params, headers=request_headers, **kwargs)
+
+    if response.status_code == 304 and meta:
+        logger.debug(f"HTTP cache revalidated | url: {url}")
+        meta["headers"].update(_cacheable_headers(response.headers))
+        # a 304 may carry new validators, which the next conditional request has to send
+        meta["etag"] = response.headers.get("ETag", meta.get("etag"))
+        meta["last_modified"] = response.headers.get("Last-Modified", meta.get("last_modified"))
+        meta["expires"] = now + _freshness_lifetime(response.headers, min_ttl)
+        _write_meta(meta_path, meta)
+        _touch(body_path)
+        return _build_response(meta, body)
+
+    if 200 <= response.status_code < 300 and _is_storable(response.headers):
+        meta = {
+            "url": response.url,
+            "status_code": response.status_code,
+            "headers": _cacheable_headers(response.headers),
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+            "expires": now + _freshness_lifetime(response.headers, min_ttl),
+        }
+        # an entry that is neither fresh nor revalidatable can never be reused, writing it only wears the SD card
+        if meta["etag"] or meta["last_modified"] or meta["expires"] > now:
+            _store(meta_path, body_path, meta, response.content)
+
+    response.from_cache = False
+    return response
+
+
+def clear_http_cache():
+    """Removes every entry from the on-disk HTTP cache."""
+    cache_dir = get_cache_dir(HTTP_CACHE_DIR)
+    with _lock:
+        for file_name in os.listdir(cache_dir):
+            os.remove(os.path.join(cache_dir, file_name))
+
+
+def _entry_paths(cache_key):
+    cache_dir = get_cache_dir(HTTP_CACHE_DIR)
+    digest = hashlib.sha256(cache_key.encode("utf-8")).hexdigest()
+    return os.path.join(cache_dir, f"{digest}.json"), os.path.join(cache_dir, f"{digest}.body")
+
+
+def _load_meta(meta_path, body_path):
+    if not os.path.exists(meta_path) or not os.path.exists(body_path):
+        return None
+    try:
+        with open(meta_path) as f:
+            return json.load(f)
+    except (OSError, ValueError) as e:
+        logger.warning(f"Discarding unreadable HTTP cache entry {meta_path}: {e}")
+        return None
+
+
+def _read_body(body_path):
+    try:
+        with open(body_path, "rb") as f:
+            return f.read()
+    except FileNotFoundError:
+        logger.debug(f"HTTP cache body was removed | path: {body_path}")
+        return None
+
+
+def _build_response(meta, content):
+    response = requests.Response()
+    response._content = content
+    response._content_consumed = True
+    response.status_code = meta.get("status_code", 200)
+    response.headers = CaseInsensitiveDict(meta.get("headers", {}))
+    response.encoding = get_encoding_from_headers(response.headers)
+    response.url = meta.get("url")
+    response.reason = "OK"
+    response.from_cache = True
+    return response
+
+
+def _cacheable_headers(headers):
+    excluded = {"content-encoding", "content-length", "transfer-encoding", "connection", "set-cookie"}
+    return {k: v for k, v in headers.items() if k.lower() not in excluded}
+
+
+def _is_storable(headers):
+    return "no-store" not in headers.get("Cache-Control", "").lower()
+
+
+def _freshness_lifetime(headers, min_ttl=0):
+    """Returns the number of seconds a response may be served without revalidation."""
+    lifetime = 0
+    cache_control = headers.get("Cache-Control", "").lower()
+    match = MAX_AGE_PATTERN.search(cache_control)
+    if "no-cache" in cache_control:
+        lifetime = 0
+    elif match:
+        lifetime = int(match.group(1)) - _age(headers)
+    elif headers.get("Expires") and headers.get("Date"):
+        try:
+            expires = parsedate_to_datetime(headers["Expires"])
+            date = parsedate_to_datetime(headers["Date"])
+            lifetime = (expires - date).total_seconds()
+        except (TypeError, ValueError):
+            lifetime = 0
+    return max(lifetime, min_ttl or 0, 0)
+
+
+def _age(headers):
+    """Returns the Age header in seconds, 0 if missing or malformed."""
+    try:
+        return max(int(headers.get("Age", 0) or 0), 0)
+    except (TypeError, ValueError):
+        return 0
+
+
+def _store(meta_path, body_path, meta, content):
+    with _lock:
+        _atomic_write(body_path, content)
+        _atomic_write(meta_path, json.dumps(meta).encode("utf-8"))
+        _prune(os.path.dirname(body_path))
+
+
+def _write_meta(meta_path, meta):
+    with _lock:
+        _atomic_write(meta_path, json.dumps(meta).encode("utf-8"))
+
+
+def _atomic_write(path, data):
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def _touch(path):
+    try:
+        os.utime(path)
+    except OSError:
+        pass
+
+
+def _prune(cache_dir):
+    """Evicts the least recently used entries once the cache grows beyond MAX_CACHE_BYTES."""
+    bodies = []
+    total = 0
+    for entry in os.scandir(cache_dir):
+        if entry.name.endswith(".body"):
+            stat = entry.stat()
+            bodies.append((stat.st_mtime, stat.st_size, entry.path))
+            total += stat.st_size
+
+    if total <= MAX_CACHE_BYTES:
+        return
+
+    for _, size, path in sorted(bodies):
+        os.remove(path)
+        meta_path = path[:-len(".body")] + ".json"
+        if os.path.exists(meta_path):
+            os.remove(meta_path)
+        total -= size
+        if total <= MAX_CACHE_BYTES:
+            break
@@ -0,0 +1,127 @@
+import logging
+import threading
+import time
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+logger = logging.getLogger(__name__)
+
+# (connect, read) timeout in seconds applied when a caller does not pass one
+DEFAULT_TIMEOUT = (5, 30)
+
+# number of per-host keep-alive pools and connections kept open per pool
+POOL_CONNECTIONS = 10
+POOL_MAXSIZE = 10
+
+RETRY_TOTAL = 3
+RETRY_BACKOFF_FACTOR = 0.5
+RETRY_BACKOFF_JITTER = 0.5
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+# longest Retry-After wait honoured before retrying, so a rate limit cannot stall a refresh for long
+MAX_RETRY_AFTER = 10
+
+DEFAULT_HEADERS = {
+    "User-Agent": "InkyPi/1.0 (https://github.com/fatihak/InkyPi/)",
+    "Accept-Encoding": "gzip, deflate",
+}
+
+_session = None
+_session_lock = threading.Lock()
+
+_stats = {}
+_stats_lock = threading.Lock()
+
+
+class CappedRetry(Retry):
+    """Retry that honours Retry-After headers, but waits at most MAX_RETRY_AFTER seconds."""
+
+    def get_retry_after(self, response):
+        retry_after = super().get_retry_after(response)
+        if retry_after is None:
+            return None
+        return min(retry_after, MAX_RETRY_AFTER)
+
+
+class HTTPSession(requests.Session):
+    """requests.Session with a default timeout, bounded retries and per-host statistics."""
+
+    def __init__(self, timeout=DEFAULT_TIMEOUT):
+        super().__init__()
+        self.timeout = timeout
+        self.headers.update(DEFAULT_HEADERS)
+
+        retry = CappedRetry(
+            total=RETRY_TOTAL,
+            connect=RETRY_TOTAL,
+            read=RETRY_TOTAL,
+            status=RETRY_TOTAL,
+            backoff_factor=RETRY_BACKOFF_FACTOR,
+            backoff_jitter=RETRY_BACKOFF_JITTER,
+            status_forcelist=RETRY_STATUS_CODES,
+            respect_retry_after_header=True,
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(pool_connections=POOL_CONNECTIONS, pool_maxsize=POOL_MAXSIZE, max_retries=retry)
+        self.mount("https://", adapter)
+        self.mount("http://", adapter)
+
+        self.hooks["response"].append(_record_response)
+
+    def request(self, method, url, **kwargs):
+        if kwargs.get("timeout") is None:
+            kwargs["timeout"] = self.timeout
+        return super().request(method, url, **kwargs)
+
+
+def get_http_session():
+    """Returns the process-wide HTTP session shared by all plugins."""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = HTTPSession()
+    return _session
+
+
+def http_get(url, **kwargs):
+    return get_http_session().get(url, **kwargs)
+
+
+def http_post(url, **kwargs):
+    return get_http_session().post(url, **kwargs)
+
+
+def get_http_stats():
+    """Returns a snapshot of the per-host request count, latency and byte totals."""
+    with _stats_lock:
+        return {host: dict(stats) for host, stats in _stats.items()}
+
+
+def _record_response(response, *args, **kwargs):
+    """Response hook recording latency and payload size per host."""
+    host = urlsplit(response.url).netloc
+    elapsed = response.elapsed.total_seconds()
+
+    size = response.headers.get("Content-Length")
+    if size is not None and size.isdigit():
+        size = int(size)
+    elif not kwargs.get("stream"):
+        # the body is read right after the hook runs for non-streamed requests
+        size = len(response.content)
+    else:
+        size = 0
+
+    with _stats_lock:
+        stats = _stats.setdefault(host, {"requests": 0, "errors": 0, "seconds": 0.0, "bytes": 0, "last_request": None})
+        stats["requests"] += 1
+        stats["seconds"] += elapsed
+        stats["bytes"] += size
+        stats["last_request"] = time.time()
+        if response.status_code >= 400:
+            stats["errors"] += 1
+
+    logger.debug(f"HTTP {response.request.method} {host} | status: {response.status_code} | elapsed: {elapsed:.3f}s | bytes: {size}")
+    return response
@@ -0,0 +1,89 @@
+import hashlib
+import logging
+import os
+import tempfile
+import threading
+
+from PIL import Image
+
+from utils.app_utils import get_cache_dir
+
+logger = logging.getLogger(__name__)
+
+IMAGE_STORE_CACHE_DIR = "images"
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+class ImageStore:
+    """Persistent store of prepared images for resources that never change, e.g. a picture of the day by date.
+
+    Images are stored as PNG files named after a hash of their key. Once more than max_images are stored,
+    the least recently used ones are removed.
+
+    Attributes:
+        name (str): Name of the store, used as the directory name under src/cache/images.
+        max_images (int): Maximum number of images kept.
+    """
+
+    def __init__(self, name, max_images=200):
+        self.name = name
+        self.max_images = max_images
+        self.path = get_cache_dir(os.path.join(IMAGE_STORE_CACHE_DIR, name))
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        """Returns a copy of the image stored for key, or None."""
+        file_path = self._file_path(key)
+        with self.lock:
+            if not os.path.exists(file_path):
+                return None
+            try:
+                with Image.open(file_path) as img:
+                    image = img.copy()
+                os.utime(file_path)
+                logger.debug(f"Image store hit | store: {self.name} | key: {key}")
+                return image
+            except Exception as e:
+                logger.warning(f"Discarding unreadable stored image {file_path}: {e}")
+                os.remove(file_path)
+                return None
+
+    def put(self, key, image):
+        """Stores the image for key, replacing any previous one."""
+        if image.mode not in ("RGB", "RGBA", "L", "P"):
+            image = image.convert("RGB")
+        fd, tmp_path = tempfile.mkstemp(dir=self.path, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                image.save(f, format="PNG")
+            with self.lock:
+                os.replace(tmp_path, self._file_path(key))
+                self._prune()
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def _file_path(self, key):
+        digest = hashlib.sha256(str(key).encode("utf-8")).hexdigest()
+        return os.path.join(self.path, f"{digest}.png")
+
+    def _prune(self):
+        files = [entry for entry in os.scandir(self.path) if entry.name.endswith(".png")]
+        if len(files) <= self.max_images:
+            return
+        files.sort(key=lambda entry: entry.stat().st_mtime)
+        for entry in files[:len(files) - self.max_images]:
+            os.remove(entry.path)
+
+
+def get_image_store(name, max_images=200):
+    """Returns the process-wide ImageStore with the given name, creating it on first use."""
+    with _stores_lock:
+        store = _stores.get(name)
+        if store is None:
+            store = ImageStore(name, max_images=max_images)
+            _stores[name] = store
+        return store
@@ -1,4 +1,3 @@
-import requests
 from PIL import Image, ImageEnhance, ImageOps, ImageFilter
 from io import BytesIO
 import os
@@ -6,11 +5,12 @@ import logging
 import hashlib
 import tempfile
 import subprocess
+from utils.http_cache import cached_get
 
 logger = logging.getLogger(__name__)
 
-def get_image(image_url):
-    response = requests.get(image_url)
+def get_image(image_url, min_ttl=0):
+    response = cached_get(image_url, min_ttl=min_ttl)
     img = None
     if 200 <= response.status_code < 300 or response.status_code == 304:
         img = Image.open(BytesIO(response.content))
@@ -60,6 +60,14 @@ def resize_image(image, desired_size, image_settings=[]):
     # Step 3: Resize to the exact desired dimensions (if necessary)
     return image.resize((desired_width, desired_height), Image.LANCZOS)
 
+def shrink_to_cover(image, dimensions):
+    """Downscales the image, keeping its aspect ratio, to the smallest size that still covers the dimensions."""
+    scale = max(dimensions[0] / image.width, dimensions[1] / image.height)
+    if scale >= 1:
+        return image
+    new_size = (max(1, round(image.width * scale)), max(1, round(image.height * scale)))
+    return image.resize(new_size, Image.LANCZOS)
+
 def apply_image_enhancement(img, image_settings={}):
     # Convert image to RGB mode if necessary for enhancement operations
     # ImageEnhance requires RGB mode for operations like blend
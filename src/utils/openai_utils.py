@@ -0,0 +1,42 @@
+import logging
+from datetime import date
+
+from openai import OpenAI
+
+from utils.cache_utils import get_cache, make_key
+
+logger = logging.getLogger(__name__)
+
+OPEN_AI_CACHE_NAME = "openai"
+# daily counters are kept slightly longer than a day, so the counter of today never expires early
+BUDGET_TTL = 2 * 24 * 60 * 60
+
+
+def get_openai_client(device_config):
+    """Returns an OpenAI client for the configured API key.
+
+    Set OPEN_AI_BASE_URL in the .env file to send requests to another OpenAI compatible server instead,
+    e.g. scripts/openai_stub_server.py for testing without API costs.
+    """
+    api_key = device_config.load_env_key("OPEN_AI_SECRET")
+    if not api_key:
+        raise RuntimeError("OPEN AI API Key not configured.")
+    base_url = device_config.load_env_key("OPEN_AI_BASE_URL")
+    return OpenAI(api_key=api_key, base_url=base_url or None)
+
+
+def take_generation_budget(name, daily_limit):
+    """Counts one background generation against today's limit for name.
+
+    Content generated ahead of time costs money even if it is never displayed, so background
+    generations are capped per day. Returns False once the limit is used up.
+    """
+    cache = get_cache(OPEN_AI_CACHE_NAME)
+    key = make_key("budget", name, date.today().isoformat())
+    with cache.lock:
+        used = cache.get(key, 0)
+        if used >= daily_limit:
+            logger.info(f"Daily background generation budget used up | name: {name} | limit: {daily_limit}")
+            return False
+        cache.set(key, used + 1, BUDGET_TTL)
+        return True
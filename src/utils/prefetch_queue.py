@@ -0,0 +1,152 @@
+import hashlib
+import logging
+import os
+import shutil
+import tempfile
+import threading
+import time
+
+from PIL import Image
+
+from utils.app_utils import get_cache_dir
+
+logger = logging.getLogger(__name__)
+
+PREFETCH_CACHE_DIR = "prefetch"
+
+# queues are named after the plugin settings, so every settings change leaves an unused queue behind;
+# queues unused for this long are removed, and only the most recently used ones are kept
+UNUSED_QUEUE_MAX_AGE = 7 * 24 * 60 * 60
+MAX_QUEUES = 32
+
+_queues = {}
+_queues_lock = threading.Lock()
+
+
+class PrefetchQueue:
+    """A small on-disk queue of images prepared ahead of time for a plugin instance.
+
+    Remote photo plugins pop the next image from the queue instead of calling their API and downloading
+    on the critical path of a refresh, and refill the queue in a background thread afterwards. Images
+    are stored as PNG files, so the queue survives restarts.
+
+    Attributes:
+        name (str): Name of the queue, used as the directory name under src/cache/prefetch.
+        size (int): Number of images kept ready.
+        max_age (int): Seconds after which a queued image is discarded, None to keep images indefinitely.
+    """
+
+    def __init__(self, name, size=2, max_age=None):
+        self.name = name
+        self.size = size
+        self.max_age = max_age
+        self.path = get_cache_dir(os.path.join(PREFETCH_CACHE_DIR, name))
+        self.lock = threading.Lock()
+        self.refill_thread = None
+
+    def __len__(self):
+        with self.lock:
+            return len(self._files())
+
+    def pop(self):
+        """Returns the oldest queued image and removes it from the queue, or None if the queue is empty."""
+        with self.lock:
+            # the directory time marks the queue as in use, see prune_queues
+            _touch(self.path)
+            for file_path in self._files():
+                try:
+                    expired = self.max_age is not None and time.time() - os.path.getmtime(file_path) > self.max_age
+                    if not expired:
+                        with Image.open(file_path) as img:
+                            image = img.copy()
+                        logger.info(f"Using prefetched image | queue: {self.name}")
+                        return image
+                except Exception as e:
+                    logger.warning(f"Discarding unreadable prefetched image {file_path}: {e}")
+                finally:
+                    os.remove(file_path)
+        return None
+
+    def push(self, image):
+        """Adds an image to the end of the queue."""
+        if image.mode not in ("RGB", "RGBA", "L", "P"):
+            image = image.convert("RGB")
+        fd, tmp_path = tempfile.mkstemp(dir=self.path, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                image.save(f, format="PNG")
+            with self.lock:
+                os.replace(tmp_path, os.path.join(self.path, f"{time.time_ns()}.png"))
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def refill(self, produce):
+        """Fills the queue up to its size in a background thread, calling produce() for every missing image.
+
+        produce should return an image, or None if no image could be prepared. Only one refill runs per queue.
+        """
+        with self.lock:
+            if self.refill_thread and self.refill_thread.is_alive():
+                return
+            self.refill_thread = threading.Thread(target=self._refill, args=(produce,), daemon=True)
+            self.refill_thread.start()
+
+    def _refill(self, produce):
+        while len(self) < self.size:
+            try:
+                image = produce()
+            except Exception as e:
+                logger.warning(f"Failed to prefetch image | queue: {self.name} | error: {e}")
+                return
+            if image is None:
+                return
+            self.push(image)
+            logger.info(f"Prefetched image | queue: {self.name} | queued: {len(self)}")
+
+    def _files(self):
+        return sorted(
+            os.path.join(self.path, file_name) for file_name in os.listdir(self.path) if file_name.endswith(".png")
+        )
+
+
+def get_prefetch_queue(*key_parts, size=2, max_age=None):
+    """Returns the process-wide PrefetchQueue for the given key parts (e.g. plugin id and settings)."""
+    name = hashlib.sha256("|".join(str(part) for part in key_parts).encode("utf-8")).hexdigest()[:16]
+    with _queues_lock:
+        queue = _queues.get(name)
+        if queue is None:
+            queue = PrefetchQueue(name, size=size, max_age=max_age)
+            _queues[name] = queue
+            prune_queues(keep=_queues.keys())
+        return queue
+
+
+def prune_queues(keep=()):
+    """Removes the queue directories unused for UNUSED_QUEUE_MAX_AGE and all but the MAX_QUEUES most recent.
+
+    Queues named in keep are never removed.
+    """
+    cache_dir = get_cache_dir(PREFETCH_CACHE_DIR)
+    try:
+        queue_dirs = sorted((entry for entry in os.scandir(cache_dir) if entry.is_dir()),
+                            key=lambda entry: entry.stat().st_mtime, reverse=True)
+    except OSError as e:
+        logger.warning(f"Failed to list prefetch queues: {e}")
+        return
+
+    now = time.time()
+    for index, entry in enumerate(queue_dirs):
+        if entry.name in keep:
+            continue
+        if index >= MAX_QUEUES or now - entry.stat().st_mtime > UNUSED_QUEUE_MAX_AGE:
+            logger.info(f"Removing unused prefetch queue {entry.name}")
+            shutil.rmtree(entry.path, ignore_errors=True)
+
+
+def _touch(path):
+    try:
+        os.utime(path)
+    except OSError:
+        pass
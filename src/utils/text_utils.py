@@ -0,0 +1,81 @@
+import logging
+
+from utils.app_utils import get_font
+
+logger = logging.getLogger(__name__)
+
+
+def wrap_text(text, font, max_width):
+    """Breaks text into lines no wider than max_width using greedy line breaking.
+
+    Every word is measured once with font.getlength (cached per face by get_font) and lines are
+    built by adding up the advance widths, so wrapping is linear in the length of the text.
+    Explicit newlines are kept, and a word wider than max_width gets a line of its own.
+
+    Returns:
+        A list of lines.
+    """
+    space_width = font.getlength(" ")
+    lines = []
+    for paragraph in text.split("\n"):
+        line, line_width = [], 0
+        for word in paragraph.split():
+            word_width = font.getlength(word)
+            if line and line_width + space_width + word_width > max_width:
+                lines.append(" ".join(line))
+                line, line_width = [], 0
+            line_width += (space_width if line else 0) + word_width
+            line.append(word)
+        lines.append(" ".join(line))
+    return lines
+
+
+def text_block_size(lines, font, line_height=1.2):
+    """Returns the (width, height) of lines set in font, with line_height as a multiple of the font size like CSS."""
+    width = max((font.getlength(line) for line in lines), default=0)
+    return width, len(lines) * font.size * line_height
+
+
+def fit_text(text, font_name, box, max_size, min_size=1, font_weight="normal", line_height=1.2):
+    """Finds the largest font size at which the wrapped text fits into box.
+
+    The text block only grows with the font size, so the size is found with a binary search over
+    [min_size, max_size], wrapping the text once per probed size. If the text does not even fit at
+    min_size, it is laid out at min_size anyway.
+
+    Args:
+        text: The text to lay out, may contain newlines.
+        font_name: A font family known to get_font.
+        box: (width, height) available for the text.
+        max_size: Largest font size to consider.
+        min_size: Smallest font size to consider.
+        font_weight: Font weight passed to get_font.
+        line_height: Line height as a multiple of the font size.
+
+    Returns:
+        A tuple of the font and the wrapped lines.
+    """
+    max_width, max_height = box
+
+    def layout(size):
+        font = get_font(font_name, size, font_weight)
+        lines = wrap_text(text, font, max_width)
+        width, height = text_block_size(lines, font, line_height)
+        return font, lines, width <= max_width and height <= max_height
+
+    low, high = int(min_size), int(max_size)
+    best = None
+    while low <= high:
+        size = (low + high) // 2
+        font, lines, fits = layout(size)
+        if fits:
+            best = (font, lines)
+            low = size + 1
+        else:
+            high = size - 1
+
+    if best is None:
+        logger.debug(f"Text does not fit into {box} at font size {min_size}")
+        font, lines, _ = layout(int(min_size))
+        best = (font, lines)
+    return best
@@ -0,0 +1,31 @@
+import pytest
+from PIL import Image, ImageDraw, ImageFont
+
+from utils.app_utils import get_font, resolve_path
+
+TEXTS = ["inkypi", "Wetter 21°C", "Ä\nMultiline"]
+
+
+class TestGetFont:
+
+    def test_returns_shared_instances(self):
+        font = get_font("Jost", 24)
+
+        assert get_font("Jost", 24) is font
+        assert get_font("Jost", 24, "bold") is not font
+        assert get_font("Jost", 25) is not font
+
+    @pytest.mark.parametrize("font_weight,file_name", [("normal", "Jost.ttf"), ("bold", "Jost-SemiBold.ttf")])
+    def test_cached_metrics_match_freetype(self, font_weight, file_name):
+        font = get_font("Jost", 31, font_weight)
+        fresh = ImageFont.truetype(resolve_path(f"static/fonts/{file_name}"), 31)
+        draw = ImageDraw.Draw(Image.new("RGB", (10, 10)))
+
+        # ask twice, the second answer comes from the cache
+        for _ in range(2):
+            for text in TEXTS:
+                line = text.splitlines()[0]
+                assert font.getbbox(line) == fresh.getbbox(line)
+                assert font.getbbox(line, anchor="mm") == fresh.getbbox(line, anchor="mm")
+                assert font.getlength(line) == fresh.getlength(line)
+                assert draw.textbbox((3, 4), text, font=font) == draw.textbbox((3, 4), text, font=fresh)
@@ -0,0 +1,52 @@
+import time
+
+import pytest
+
+from utils import cache_utils
+from utils.cache_utils import PersistentCache, get_cache, make_key
+
+
+@pytest.fixture
+def src_dir(tmp_path, monkeypatch):
+    monkeypatch.setenv("SRC_DIR", str(tmp_path))
+    # caches are shared process-wide and keep the path of the SRC_DIR they were created in
+    monkeypatch.setattr(cache_utils, "_caches", {})
+    return tmp_path
+
+
+class TestPersistentCache:
+
+    def test_entries_survive_reload(self, src_dir):
+        PersistentCache("test").set("key", {"a": 1}, ttl=60)
+        assert PersistentCache("test").get("key") == {"a": 1}
+
+    def test_expired_entries_are_missed(self, src_dir, monkeypatch):
+        cache = PersistentCache("test")
+        cache.set("key", "value", ttl=10)
+        monkeypatch.setattr(time, "time", lambda: cache.get_entry("key")["stored"] + 11)
+        assert cache.get("key") is None
+        assert cache.get_entry("key")["value"] == "value"
+
+    def test_get_or_fetch_only_fetches_on_miss(self, src_dir):
+        cache = PersistentCache("test", default_ttl=60)
+        calls = []
+        fetch = lambda: calls.append(1) or "value"
+
+        assert cache.get_or_fetch("key", fetch) == "value"
+        assert cache.get_or_fetch("key", fetch) == "value"
+        assert len(calls) == 1
+
+    def test_oldest_entries_are_evicted(self, src_dir):
+        cache = PersistentCache("test", max_entries=2)
+        for i in range(3):
+            cache.set(make_key("key", i), i)
+        assert cache.get("key|0") is None
+        assert cache.get("key|2") == 2
+
+
+def test_get_cache_warns_about_conflicting_limits(src_dir, caplog):
+    cache = get_cache("test", max_entries=10)
+
+    assert get_cache("test", max_entries=20) is cache
+    assert cache.max_entries == 10
+    assert "already exists" in caplog.text
@@ -0,0 +1,95 @@
+from datetime import date, datetime
+
+import pytest
+import pytz
+
+from plugins.calendar.calendar_renderer import CalendarRenderer, supports_native_rendering
+
+TZ = pytz.timezone("Europe/Berlin")
+NOW = TZ.localize(datetime(2026, 10, 19, 9, 30))
+SETTINGS = {"weekStartDay": "1", "displayWeekends": "true", "displayEventTime": "true", "displayTitle": "true"}
+
+
+def event(title, start, end=None, all_day=False):
+    parsed = {"title": title, "start": start, "allDay": all_day, "backgroundColor": "#3366cc", "textColor": "#ffffff"}
+    if end:
+        parsed["end"] = end
+    return parsed
+
+
+def renderer(**settings):
+    return CalendarRenderer((800, 480), {**SETTINGS, **settings}, NOW, "24h", 1)
+
+
+class TestDayGrid:
+
+    def test_multi_day_events_span_their_days(self):
+        calendar = renderer()
+        events = list(calendar.parse_events([
+            event("Holiday", "2026-10-17", "2026-10-21", all_day=True),
+            event("Trip", "2026-10-20T18:00:00+02:00", "2026-10-22T00:00:00+02:00"),
+        ]))
+        week = [date(2026, 10, day) for day in range(19, 26)]
+
+        segments = [(first, last, level, event.title) for first, last, level, event in calendar.place_segments(week, events)]
+
+        # the trip ends at midnight, so it does not reach into the 22nd
+        assert segments == [(0, 1, 0, "Holiday"), (1, 2, 1, "Trip")]
+
+    def test_crowded_days_show_more_link(self):
+        calendar = renderer()
+        events = list(calendar.parse_events(
+            [event(f"Event {hour}", f"2026-10-19T{hour:02d}:00:00+02:00", f"2026-10-19T{hour:02d}:30:00+02:00") for hour in range(8, 13)]))
+        week = [date(2026, 10, day) for day in range(19, 26)]
+        segments = calendar.place_segments(week, events)
+
+        drawn, hidden, visible = calendar.visible_segments(segments, len(week), capacity=3)
+
+        assert [event.title for _, _, _, event in drawn] == ["Event 8", "Event 9"]
+        assert hidden == [3, 0, 0, 0, 0, 0, 0]
+        assert visible[0] == 2
+
+    @pytest.mark.parametrize("dimensions,font_scale", [((212, 104), 1), ((250, 122), 1.3)])
+    def test_renders_rows_thinner_than_a_pixel(self, dimensions, font_scale):
+        calendar = CalendarRenderer(dimensions, {**SETTINGS, "displayWeeks": "52"}, NOW, "24h", font_scale)
+
+        image = calendar.render("dayGrid", [event("Meeting", "2026-10-19T10:00:00+02:00")])
+
+        assert image.size == dimensions
+
+    def test_grid_has_an_outer_border(self):
+        calendar = renderer()
+        left, top, right, bottom = calendar.content_box()
+
+        image = calendar.render("dayGridMonth", [])
+
+        middle = (top + bottom) // 2
+        black = (0, 0, 0)
+        assert image.getpixel((left, middle)) == black
+        assert image.getpixel((right, middle)) == black
+        assert image.getpixel(((left + right) // 2 + 3, bottom)) == black
+
+    def test_hidden_weekends(self):
+        weeks = renderer(displayWeekends="false").grid_days("dayGridMonth")
+
+        assert weeks[0][0] == date(2026, 9, 28)
+        assert all(day.weekday() < 5 for week in weeks for day in week)
+
+
+class TestListView:
+
+    def test_renders_with_overflow(self):
+        calendar = renderer()
+        events = [event(f"Event {day}", f"2026-10-{day:02d}", all_day=True) for day in range(19, 32)]
+
+        image = calendar.render("listMonth", events)
+
+        assert image.size == (800, 480)
+        assert len(calendar.list_rows(list(calendar.parse_events(events)))) == 26
+
+
+def test_supports_native_rendering():
+    assert supports_native_rendering("listMonth", {"language": "de-at"})
+    assert not supports_native_rendering("timeGridWeek", {"language": "en"})
+    assert not supports_native_rendering("dayGridMonth", {"language": "ja"})
+    assert not supports_native_rendering("dayGridMonth", {"language": "en", "backgroundOption": "image"})
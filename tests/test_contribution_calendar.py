@@ -0,0 +1,42 @@
+from datetime import date, timedelta
+
+import pytest
+
+from plugins.github.contribution_calendar import ContributionCalendar
+
+TODAY = date(2025, 3, 12)
+
+
+def calendar(counts, end=TODAY):
+    """Builds a GitHub contribution calendar ending at end, with weeks starting on Sunday."""
+    start = end - timedelta(days=len(counts) - 1)
+    weeks = []
+    for offset, count in enumerate(counts):
+        day = start + timedelta(days=offset)
+        if not weeks or day.weekday() == 6:
+            weeks.append({"contributionDays": []})
+        weeks[-1]["contributionDays"].append({"contributionCount": count, "date": day.isoformat()})
+    return ContributionCalendar({"weeks": weeks})
+
+
+class TestContributionCalendar:
+
+    @pytest.mark.parametrize("counts, expected", [
+        ([1, 1, 0, 1, 1, 1, 0, 2], (1, 3)),
+        ([1, 1, 0, 1, 1, 1, 2, 0], (4, 4)),
+        ([1, 1, 0, 1, 1, 1, 0, 0], (0, 3)),
+        ([0, 0, 0], (0, 0)),
+    ])
+    def test_streaks(self, counts, expected):
+        assert calendar(counts).streaks(TODAY) == expected
+
+    def test_color_levels_scale_by_busiest_day(self):
+        levels = calendar([0, 1, 5, 10, 20]).color_levels(5)
+
+        assert levels.tolist() == [0, 1, 1, 2, 4]
+
+    def test_month_starts(self):
+        cal = calendar([1] * 70)
+
+        assert cal.week_lengths.sum() == 70
+        assert [str(cal.dates[cal.week_starts[i]].astype("datetime64[M]")) for i in cal.month_starts()] == ["2025-02", "2025-03"]
@@ -0,0 +1,88 @@
+import numpy as np
+import pytest
+from PIL import Image
+
+from utils.dither_utils import (
+    DITHER_METHODS, PANEL_PALETTES, blue_noise_map, dither, indexed_image, pack_plane, palette_colors, palette_lut,
+)
+
+
+def gradient(width=64, height=32):
+    """A horizontal gray ramp from black to white."""
+    ramp = np.linspace(0, 255, width, dtype=np.float32)
+    return Image.fromarray(np.repeat(ramp[None, :], height, axis=0).astype(np.uint8)).convert("RGB")
+
+
+class TestDither:
+
+    @pytest.mark.parametrize("method", DITHER_METHODS)
+    def test_indices_refer_to_palette(self, method):
+        for inks in PANEL_PALETTES.values():
+            palette = palette_colors(inks)
+
+            indices = dither(gradient(), palette, method)
+
+            assert indices.shape == (32, 64)
+            assert indices.max() < len(palette)
+
+    @pytest.mark.parametrize("method", ["floyd-steinberg", "bayer", "blue-noise"])
+    def test_preserves_mean_gray(self, method):
+        palette = palette_colors(PANEL_PALETTES["bw"])
+        image = Image.new("RGB", (64, 64), (64, 64, 64))
+
+        indices = dither(image, palette, method)
+
+        assert abs(np.mean(indices == 1) - 0.25) < 0.02
+
+    def test_atkinson_trades_tones_for_contrast(self):
+        palette = palette_colors(PANEL_PALETTES["bw"])
+
+        def white_share(gray):
+            return np.mean(dither(Image.new("RGB", (64, 64), (gray, gray, gray)), palette, "atkinson") == 1)
+
+        # only 6/8 of the error is diffused, so dark grays get darker and light grays lighter
+        assert white_share(128) == pytest.approx(0.5, abs=0.02)
+        assert white_share(64) < 0.25 < 0.75 < white_share(192)
+
+    def test_palette_colors_are_kept(self):
+        palette = palette_colors(PANEL_PALETTES["acep7"])
+        image = Image.new("RGB", (len(palette), 1))
+        image.putdata(list(palette))
+
+        for method in DITHER_METHODS:
+            if method in ("bayer", "blue-noise"):
+                continue
+            assert dither(image, palette, method).tolist() == [list(range(len(palette)))]
+
+
+def test_palette_lut_is_cached_per_palette():
+    palette = palette_colors(PANEL_PALETTES["bwr"])
+
+    assert palette_lut(palette) is palette_lut(palette_colors(PANEL_PALETTES["bwr"]))
+    assert palette_lut(palette) is not palette_lut(palette_colors(PANEL_PALETTES["bwy"]))
+
+
+def test_blue_noise_map_is_a_permutation():
+    thresholds = blue_noise_map()
+
+    ranks = np.sort((thresholds * thresholds.size - 0.5).round().ravel())
+    assert np.array_equal(ranks, np.arange(thresholds.size))
+
+
+def test_pack_plane_matches_mode_1_images():
+    indices = np.random.default_rng(1).integers(0, 3, size=(5, 13), dtype=np.uint8)
+
+    packed = pack_plane(indices, 2)
+
+    expected = Image.fromarray(np.where(indices == 2, 0, 255).astype(np.uint8)).convert("1", dither=Image.Dither.NONE)
+    assert packed == expected.tobytes()
+
+
+def test_indexed_image_maps_driver_color_numbers():
+    palette = palette_colors(("black", "white", "red"))
+    indices = np.array([[0, 1, 2]], dtype=np.uint8)
+
+    image = indexed_image(indices, palette, index_map=[1, 0, 2])
+
+    assert np.asarray(image).tolist() == [[1, 0, 2]]
+    assert image.convert("RGB").getpixel((0, 0)) == (0, 0, 0)
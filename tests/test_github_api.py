@@ -0,0 +1,64 @@
+import time
+from unittest.mock import MagicMock
+
+import pytest
+
+from plugins.github import github_api, github_stars
+from utils import cache_utils
+
+
+@pytest.fixture
+def src_dir(tmp_path, monkeypatch):
+    monkeypatch.setenv("SRC_DIR", str(tmp_path))
+    # caches are shared process-wide and keep the path of the SRC_DIR they were created in
+    monkeypatch.setattr(cache_utils, "_caches", {})
+    return tmp_path
+
+
+def graphql_response(data, remaining=4000, errors=None):
+    response = MagicMock()
+    response.headers = {"X-RateLimit-Remaining": str(remaining), "X-RateLimit-Reset": str(int(time.time()) + 3600)}
+    response.json.return_value = {"data": data, "errors": errors} if errors else {"data": data}
+    return response
+
+
+class TestGitHubApi:
+
+    def test_batches_queries_into_one_request(self, src_dir, monkeypatch):
+        post = MagicMock(return_value=graphql_response({
+            "q0": {"stargazerCount": 5},
+            "q1": {"sponsorshipsAsMaintainer": {"nodes": []}},
+            "q2": None,
+        }, errors=[{"path": ["q2"], "message": "Could not resolve to a User"}]))
+        monkeypatch.setattr(github_api, "http_post", post)
+
+        results, errors = github_api.fetch_github_data(
+            [("stars", "octo/repo"), ("sponsors", "octo"), ("contributions", "ghost"), ("stars", "octo/repo")], "key")
+
+        assert post.call_count == 1
+        variables = post.call_args.kwargs["json"]["variables"]
+        assert variables == {"owner0": "octo", "name0": "repo", "login1": "octo", "login2": "ghost"}
+        assert results[("stars", "octo/repo")] == {"stargazerCount": 5}
+        assert errors == {("contributions", "ghost"): ["Could not resolve to a User"]}
+
+        assert github_api.get_github_data("stars", "Octo/Repo", "key") == {"stargazerCount": 5}
+        assert post.call_count == 1
+
+    def test_serves_outdated_data_when_rate_limited(self, src_dir, monkeypatch):
+        post = MagicMock(return_value=graphql_response({"q0": {"stargazerCount": 5}}, remaining=10))
+        monkeypatch.setattr(github_api, "http_post", post)
+        github_api.fetch_github_data([("stars", "octo/repo")], "key")
+        monkeypatch.setattr(time, "time", lambda real=time.time: real() + github_api.QUERY_TTLS["stars"] + 1)
+
+        assert github_api.get_github_data("stars", "octo/repo", "key") == {"stargazerCount": 5}
+        assert post.call_count == 1
+
+
+def test_stars_without_key_use_the_rest_api(monkeypatch):
+    response = MagicMock(status_code=200)
+    response.json.return_value = {"stargazers_count": 42}
+    get = MagicMock(return_value=response)
+    monkeypatch.setattr(github_stars, "cached_get", get)
+
+    assert github_stars.fetch_stars("octo/repo") == 42
+    assert get.call_args.args == ("https://api.github.com/repos/octo/repo",)
@@ -0,0 +1,109 @@
+import os
+import threading
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from utils import http_cache
+from utils.http_cache import cached_get, _freshness_lifetime
+
+
+class RecordingHandler(SimpleHTTPRequestHandler):
+    requests_seen = []
+
+    def log_message(self, format, *args):
+        pass
+
+    def send_response(self, code, message=None):
+        RecordingHandler.requests_seen.append((self.path, code))
+        super().send_response(code, message)
+
+    def do_GET(self):
+        if self.path != "/plain":
+            return super().do_GET()
+        # a response without validators or freshness lifetime
+        self.send_response(200)
+        self.send_header("Content-Length", "5")
+        self.end_headers()
+        self.wfile.write(b"plain")
+
+
+@pytest.fixture
+def server(tmp_path, monkeypatch):
+    monkeypatch.setenv("SRC_DIR", str(tmp_path / "src"))
+    www = tmp_path / "www"
+    www.mkdir()
+    (www / "feed.xml").write_text("<rss></rss>")
+
+    RecordingHandler.requests_seen = []
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), partial(RecordingHandler, directory=str(www)))
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+
+
+class TestCachedGet:
+
+    def test_revalidates_with_conditional_get(self, server):
+        first = cached_get(f"{server}/feed.xml")
+        second = cached_get(f"{server}/feed.xml")
+
+        assert first.from_cache is False
+        assert second.from_cache is True
+        assert second.text == "<rss></rss>"
+        assert [code for _, code in RecordingHandler.requests_seen] == [200, 304]
+
+    def test_min_ttl_skips_network(self, server):
+        cached_get(f"{server}/feed.xml", min_ttl=60)
+        response = cached_get(f"{server}/feed.xml", min_ttl=60)
+
+        assert response.from_cache is True
+        assert len(RecordingHandler.requests_seen) == 1
+
+    def test_refetches_when_body_is_pruned(self, server, monkeypatch):
+        cached_get(f"{server}/feed.xml", min_ttl=60)
+        load_meta = http_cache._load_meta
+
+        def load_meta_then_prune(meta_path, body_path):
+            meta = load_meta(meta_path, body_path)
+            os.remove(body_path)
+            return meta
+
+        monkeypatch.setattr(http_cache, "_load_meta", load_meta_then_prune)
+        response = cached_get(f"{server}/feed.xml", min_ttl=60)
+
+        assert response.from_cache is False
+        assert response.text == "<rss></rss>"
+        assert [code for _, code in RecordingHandler.requests_seen] == [200, 200]
+
+    def test_unreusable_responses_are_not_stored(self, server, tmp_path):
+        assert cached_get(f"{server}/plain").text == "plain"
+        assert cached_get(f"{server}/plain").from_cache is False
+
+        assert os.listdir(tmp_path / "src" / "cache" / http_cache.HTTP_CACHE_DIR) == []
+
+    def test_errors_are_not_cached(self, server):
+        assert cached_get(f"{server}/missing.xml").status_code == 404
+        assert cached_get(f"{server}/missing.xml").status_code == 404
+        assert len(RecordingHandler.requests_seen) == 2
+
+
+class TestFreshnessLifetime:
+
+    @pytest.mark.parametrize(
+        "headers,min_ttl,expected",
+        [
+            ({}, 0, 0),
+            ({}, 300, 300),
+            ({"Cache-Control": "public, max-age=600"}, 0, 600),
+            ({"Cache-Control": "max-age=600", "Age": "100"}, 0, 500),
+            ({"Cache-Control": "max-age=600", "Age": "soon"}, 0, 600),
+            ({"Cache-Control": "max-age=60"}, 300, 300),
+            ({"Cache-Control": "no-cache, max-age=600"}, 0, 0),
+            ({"Date": "Mon, 01 Jan 2024 00:00:00 GMT", "Expires": "Mon, 01 Jan 2024 01:00:00 GMT"}, 0, 3600),
+        ]
+    )
+    def test_lifetime(self, headers, min_ttl, expected):
+        assert _freshness_lifetime(headers, min_ttl) == expected
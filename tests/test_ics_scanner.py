@@ -0,0 +1,90 @@
+from datetime import datetime
+
+import icalendar
+import pytest
+import recurring_ical_events
+
+from plugins.calendar.ics_scanner import filter_ics
+
+ICS = "\r\n".join([
+    "BEGIN:VCALENDAR",
+    "VERSION:2.0",
+    "PRODID:-//InkyPi//Test//EN",
+    "BEGIN:VEVENT",
+    "UID:old",
+    "DTSTART:19990101T100000Z",
+    "DTEND:19990101T110000Z",
+    "SUMMARY:Old",
+    "END:VEVENT",
+    "BEGIN:VEVENT",
+    "UID:inside",
+    "DTSTART;TZID=\"Europe/Berlin\":20261020T100000",
+    "DURATION:PT1H",
+    "SUMMARY:Inside with a summary that is folded",
+    "  onto the next line",
+    "BEGIN:VALARM",
+    "TRIGGER:-PT15M",
+    "DURATION:P9999D",
+    "REPEAT:1",
+    "ACTION:DISPLAY",
+    "END:VALARM",
+    "END:VEVENT",
+    "BEGIN:VEVENT",
+    "UID:spanning",
+    "DTSTART;VALUE=DATE:20260901",
+    "DTEND;VALUE=DATE:20261201",
+    "SUMMARY:Spanning",
+    "END:VEVENT",
+    "BEGIN:VEVENT",
+    "UID:weekly",
+    "DTSTART:20100104T090000",
+    "RRULE:FREQ=WEEKLY",
+    "SUMMARY:Weekly",
+    "END:VEVENT",
+    "BEGIN:VEVENT",
+    "UID:weekly",
+    "RECURRENCE-ID:20261019T090000",
+    "DTSTART:20300101T090000",
+    "SUMMARY:Moved out",
+    "END:VEVENT",
+    "BEGIN:VEVENT",
+    "UID:weekly",
+    "RECURRENCE-ID:20150105T090000",
+    "DTSTART:20150106T090000",
+    "SUMMARY:Moved long ago",
+    "END:VEVENT",
+    "END:VCALENDAR",
+    "",
+])
+
+
+def occurrences(ics_text, start, end):
+    calendar = icalendar.Calendar.from_ical(ics_text)
+    return sorted(
+        (str(event.get("uid")), str(event.get("summary")), str(event.decoded("dtstart")))
+        for event in recurring_ical_events.of(calendar).between(start, end)
+    )
+
+
+class TestFilterIcs:
+
+    def test_skips_events_outside_the_window(self):
+        filtered = filter_ics(ICS, datetime(2026, 10, 19), datetime(2026, 10, 26))
+
+        assert "UID:old" not in filtered
+        assert "Moved long ago" not in filtered
+        for uid in ["inside", "spanning", "weekly"]:
+            assert f"UID:{uid}" in filtered
+        assert "Moved out" in filtered
+
+    @pytest.mark.parametrize(
+        "start,end",
+        [
+            (datetime(2026, 10, 19), datetime(2026, 10, 26)),
+            (datetime(2026, 10, 20), datetime(2026, 10, 21)),
+            (datetime(2015, 1, 1), datetime(2015, 1, 31)),
+            (datetime(1999, 1, 1), datetime(1999, 1, 2)),
+        ]
+    )
+    def test_matches_full_parse(self, start, end):
+        assert occurrences(filter_ics(ICS, start, end), start, end) == occurrences(ICS, start, end)
@@ -49,4 +49,16 @@ class TestPlaylist:
         playlist = Playlist("Test Playlist", start, end)
         assert playlist.is_active(current) == expected
         assert playlist.get_priority() == priority
-        
\ No newline at end of file
+        
+    @pytest.mark.parametrize(
+        "current_index,expected",
+        [
+            (None, ["a", "b", "c"]),
+            (0, ["a", "b", "c"]),
+            (2, ["c", "a", "b"]),
+        ]
+    )
+    def test_get_upcoming_plugins(self, current_index, expected):
+        plugins = [{"plugin_id": "weather", "name": name, "plugin_settings": {}, "refresh": {}} for name in "abc"]
+        playlist = Playlist("Test Playlist", "00:00", "24:00", plugins=plugins, current_plugin_index=current_index)
+        assert [p.name for p in playlist.get_upcoming_plugins()] == expected
@@ -0,0 +1,65 @@
+import os
+import time
+
+import pytest
+from PIL import Image
+
+from utils import prefetch_queue
+from utils.prefetch_queue import PrefetchQueue
+
+
+@pytest.fixture
+def src_dir(tmp_path, monkeypatch):
+    monkeypatch.setenv("SRC_DIR", str(tmp_path))
+    return tmp_path
+
+
+def solid(color):
+    return Image.new("RGB", (4, 4), color)
+
+
+class TestPrefetchQueue:
+
+    def test_pop_returns_images_in_order(self, src_dir):
+        queue = PrefetchQueue("test")
+        queue.push(solid("red"))
+        queue.push(solid("blue"))
+
+        assert PrefetchQueue("test").pop().getpixel((0, 0)) == (255, 0, 0)
+        assert queue.pop().getpixel((0, 0)) == (0, 0, 255)
+        assert queue.pop() is None
+
+    def test_refill_fills_up_to_size(self, src_dir):
+        queue = PrefetchQueue("test", size=3)
+        queue.push(solid("red"))
+        calls = []
+
+        queue.refill(lambda: calls.append(1) or solid("green"))
+        queue.refill_thread.join(timeout=5)
+
+        assert len(calls) == 2
+        assert len(queue) == 3
+
+    def test_expired_images_are_discarded(self, src_dir):
+        queue = PrefetchQueue("test", max_age=60)
+        queue.push(solid("red"))
+        for file_name in os.listdir(queue.path):
+            old = time.time() - 120
+            os.utime(os.path.join(queue.path, file_name), (old, old))
+
+        assert queue.pop() is None
+        assert len(queue) == 0
+
+
+def test_unused_queues_are_pruned(src_dir, monkeypatch):
+    monkeypatch.setattr(prefetch_queue, "MAX_QUEUES", 1)
+    for name in ["old", "older", "recent", "newest"]:
+        PrefetchQueue(name).push(solid("red"))
+    stale = time.time() - prefetch_queue.UNUSED_QUEUE_MAX_AGE - 60
+    os.utime(PrefetchQueue("old").path, (stale, stale))
+    os.utime(PrefetchQueue("older").path, (stale - 60, stale - 60))
+    os.utime(PrefetchQueue("recent").path, (stale + 120, stale + 120))
+
+    prefetch_queue.prune_queues(keep={"old"})
+
+    assert sorted(os.listdir(src_dir / "cache" / "prefetch")) == ["newest", "old"]
@@ -0,0 +1,47 @@
+import pytest
+
+from utils.app_utils import get_font
+from utils.text_utils import fit_text, text_block_size, wrap_text
+
+TEXT = "The quick brown fox jumps over the lazy dog and keeps running through the field"
+
+
+class TestWrapText:
+
+    @pytest.mark.parametrize("max_width", [80, 200, 400])
+    def test_lines_fit_and_keep_all_words(self, max_width):
+        font = get_font("Jost", 24)
+
+        lines = wrap_text(TEXT, font, max_width)
+
+        assert " ".join(lines).split() == TEXT.split()
+        assert all(font.getlength(line) <= max_width for line in lines if " " in line)
+        # greedy: the first word of every line would not have fit on the previous one
+        for previous, line in zip(lines, lines[1:]):
+            assert font.getlength(f"{previous} {line.split()[0]}") > max_width
+
+    def test_keeps_newlines_and_long_words(self):
+        font = get_font("Jost", 24)
+
+        assert wrap_text("a\n\nb", font, 100) == ["a", "", "b"]
+        assert wrap_text("x Supercalifragilistic y", font, 50) == ["x", "Supercalifragilistic", "y"]
+
+
+class TestFitText:
+
+    def test_finds_largest_fitting_size(self):
+        box = (300, 200)
+
+        font, lines = fit_text(TEXT, "Jost", box, max_size=120, min_size=8)
+
+        width, height = text_block_size(lines, font)
+        assert width <= box[0] and height <= box[1]
+        larger = get_font("Jost", font.size + 1)
+        width, height = text_block_size(wrap_text(TEXT, larger, box[0]), larger)
+        assert width > box[0] or height > box[1]
+
+    def test_falls_back_to_min_size(self):
+        font, lines = fit_text(TEXT, "Jost", (40, 20), max_size=60, min_size=12)
+
+        assert font.size == 12
+        assert len(lines) > 1
@@ -0,0 +1,90 @@
+import time
+from datetime import datetime, timedelta
+
+import pytest
+import pytz
+
+from plugins.weather.time_index import HourlyTimeIndex
+
+
+@pytest.fixture(params=["UTC", "Europe/Berlin", "America/St_Johns"])
+def system_tz(request, monkeypatch):
+    """Open-Meteo's naive timestamps are read in the system timezone, so run against several of them."""
+    monkeypatch.setenv("TZ", request.param)
+    time.tzset()
+    yield request.param
+    monkeypatch.undo()
+    time.tzset()
+
+
+def hourly_times(start, hours):
+    start = datetime.fromisoformat(start)
+    return [(start + timedelta(hours=i)).strftime("%Y-%m-%dT%H:%M") for i in range(hours)]
+
+
+def parse_each(times, tz):
+    """The previous per-item parsing."""
+    return [datetime.fromisoformat(time_str).astimezone(tz).replace(tzinfo=None) for time_str in times]
+
+
+class TestHourlyTimeIndex:
+
+    @pytest.mark.parametrize("tz_name,start", [
+        ("Europe/Berlin", "2026-03-24T00:00"),
+        ("Europe/Berlin", "2026-10-20T00:00"),
+        ("Asia/Kathmandu", "2026-03-24T00:00"),
+        ("Australia/Lord_Howe", "2026-03-30T00:00"),
+        ("America/St_Johns", "2026-10-28T00:00"),
+    ])
+    def test_matches_per_item_parsing(self, system_tz, tz_name, start):
+        tz = pytz.timezone(tz_name)
+        # ten days, so the offset changes between two samples and is found by bisecting
+        times = hourly_times(start, 240)
+
+        index = HourlyTimeIndex(times, tz)
+
+        expected = parse_each(times, tz)
+        assert index.datetimes(0, len(index)) == expected
+        assert [index.datetime_at(row) for row in (0, 71, 72, 239)] == [expected[row] for row in (0, 71, 72, 239)]
+        for hour in range(24):
+            assert index.row_for_hour(hour) == next(row for row, dt in enumerate(expected) if dt.hour == hour)
+
+    def test_offset_change_next_to_a_sample(self, system_tz):
+        tz = pytz.timezone("Europe/Berlin")
+        # the autumn change is at 01:00 UTC on the 25th, right before and after the sampled rows
+        for shift in range(-2, 3):
+            start = datetime(2026, 10, 25, 1) - timedelta(hours=72 + shift)
+            times = hourly_times(start.isoformat(), 150)
+
+            assert HourlyTimeIndex(times, tz).datetimes(0, 150) == parse_each(times, tz)
+
+    def test_start_row(self, system_tz):
+        tz = pytz.timezone("Europe/Berlin")
+        times = hourly_times("2026-10-19T00:00", 48)
+        index = HourlyTimeIndex(times, tz)
+        expected = parse_each(times, tz)
+        now = tz.localize(datetime(2026, 10, 20, 9, 30))
+
+        row = index.start_row(now)
+
+        assert expected[row].date() == now.date() and expected[row].hour == now.hour
+
+    def test_lookups_outside_the_range(self):
+        tz = pytz.timezone("UTC")
+        index = HourlyTimeIndex(hourly_times("2026-10-19T06:00", 3), tz)
+
+        assert index.row_for_hour(5) is None
+        assert index.row_for_hour(9) is None
+        assert index.start_row(tz.localize(datetime(2026, 10, 25, 7))) == 0
+        assert index.start_row(tz.localize(datetime(2026, 10, 19, 12))) == 0
+
+    def test_unparsable_entries(self):
+        tz = pytz.timezone("Europe/Berlin")
+        times = hourly_times("2026-10-24T00:00", 100)
+        times[50] = "not a time"
+
+        index = HourlyTimeIndex(times, tz)
+
+        assert index.hours[50] == -1
+        valid = [row for row in range(100) if row != 50]
+        assert [index.datetime_at(row) for row in valid] == parse_each([times[row] for row in valid], tz)
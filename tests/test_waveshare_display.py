@@ -0,0 +1,43 @@
+import numpy as np
+import pytest
+from PIL import Image
+
+from display.waveshare_display import dither_single_buffer_image, get_epd_palette
+from utils.dither_utils import PANEL_PALETTES, palette_colors
+
+
+def white_share(image):
+    return np.mean(np.asarray(image.convert("L")) == 255)
+
+
+class TestDitherSingleBufferImage:
+
+    @pytest.mark.parametrize("color", [(0, 200, 0), (220, 30, 30), (40, 40, 200), (128, 128, 128)])
+    def test_black_and_white_keeps_the_tone_of_colors(self, color):
+        image = Image.new("RGB", (64, 64), color)
+
+        dithered = dither_single_buffer_image(image, palette_colors(PANEL_PALETTES["bw"]))
+
+        # the drivers used to dither with image.convert('1')
+        assert white_share(dithered) == pytest.approx(white_share(image.convert("1")), abs=0.02)
+
+    def test_color_inks_are_kept(self):
+        palette = palette_colors(PANEL_PALETTES["spectra6"])
+        image = Image.new("RGB", (len(palette), 1))
+        image.putdata(list(palette))
+
+        dithered = dither_single_buffer_image(image, palette)
+
+        assert np.asarray(dithered).tolist() == [list(map(list, palette))]
+
+
+def test_bi_color_palette_follows_the_driver():
+    class RedDriver:
+        pass
+
+    class YellowDriver:
+        YELLOW = 0xFFFF00
+
+    assert get_epd_palette(RedDriver(), bi_color=True) == PANEL_PALETTES["bwr"]
+    assert get_epd_palette(YellowDriver(), bi_color=True) == PANEL_PALETTES["bwy"]
+    assert get_epd_palette(RedDriver()) == PANEL_PALETTES["bw"]